@@ -0,0 +1,318 @@
+"""Headless-бенчмарк страниц приложения на разных масштабах данных.
+
+Запуск из корня репозитория::
+
+    python benchmarks/run.py                       # demo и national
+    python benchmarks/run.py --scales demo national_daily --repeat 5
+    python benchmarks/run.py --compare benchmarks/results/<прошлый>.json
+
+Каждый масштаб измеряется в отдельном процессе со своим временным
+хранилищем. Для каждой страницы, режима анализа и отчета записывается
+холодный прогон (кэши Streamlit очищены, дисковые кэши артефактов и фигур
+пустые) и теплый (повторный rerun), а для
+слоя данных -- время загрузки, фильтрации, агрегации и построения фигур.
+Холодный старт страницы по умолчанию («Обзор данных») меряется в новом
+процессе и сверяется с бюджетом ``COLD_START_BUDGET``.
+Результат сохраняется в JSON с хэшем коммита для сравнения между версиями.
+"""
+
+import argparse
+import copy
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / 'app.py'
+RESULTS_DIR = ROOT / 'benchmarks' / 'results'
+
+PAGES = ["Обзор данных", "Региональная статистика", "Муниципальная статистика",
+         "СберИндекс", "Сравнительный анализ", "Готовые отчеты", "ИИ-Агент"]
+
+# Бюджет холодного старта, с: новый процесс -> первая отрисовка страницы по умолчанию
+# (хранилище уже записано). Сюда входит импорт Streamlit и модулей приложения.
+COLD_START_BUDGET = 2.5
+
+# Библиотеки, которые не должны загружаться при открытии страницы по умолчанию
+HEAVY_MODULES = ('matplotlib', 'seaborn', 'plotly.express', 'scipy', 'statsmodels')
+
+# Вложенные варианты страниц: (страница, индекс радио/селекта на странице, значения)
+VARIANTS = {
+    "Сравнительный анализ": ('radio', ["Сравнение регионов", "Сравнение муниципалитетов",
+                                       "Корреляционный анализ"]),
+    "Готовые отчеты": ('selectbox', ["Топ-10 муниципалитетов по средней зарплате",
+                                     "Анализ потребительской активности по регионам",
+                                     "Инвестиционная привлекательность регионов",
+                                     "Малые города с высоким потенциалом развития"]),
+}
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def _summary(samples):
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'max': max(samples),
+    }
+
+
+def bench_components(scale, repeat):
+    """Слой данных без Streamlit: генерация, хранилище, фильтры, агрегаты, фигуры."""
+    import pandas as pd
+    import plotly.express as px
+
+    from rosstat import store
+    from rosstat.cube import MonthlyCube
+    from rosstat.figcache import FigureCache, figure_key
+    from rosstat.index import SortedFrameIndex
+    from rosstat.stats import MomentStats
+    from rosstat.synthetic import SCALES, generate, next_month
+    from rosstat.topk import TopKIndex
+
+    results = {}
+    root = Path(os.environ['ROSSTAT_STORE'])
+
+    elapsed, frames = _timed(lambda: generate(**SCALES[scale]))
+    results['generate'] = elapsed
+    results['store_write'], _ = _timed(lambda: store.ensure(root, lambda: frames))
+    results['load_data'] = _summary([_timed(lambda: [store.read_table(root, name) for name in store.TABLES])[0]
+                                     for _ in range(repeat)])
+
+    _, municipal, _, series = frames
+    regions = list(pd.unique(series['Регион']))[:5]
+    start, end = series['Дата'].quantile(0.25), series['Дата'].quantile(0.75)
+
+    results['filter_mask'] = _summary([_timed(lambda: series[
+        series['Регион'].isin(regions) & (series['Дата'] >= start) & (series['Дата'] <= end)])[0]
+        for _ in range(repeat)])
+    results['index_build'], index = _timed(lambda: SortedFrameIndex(series, 'Регион', 'Дата'))
+    results['filter_index'] = _summary([_timed(lambda: index.select(regions, start, end))[0]
+                                        for _ in range(repeat)])
+
+    numeric = ['Население', 'Средняя_зарплата', 'Количество_предприятий',
+               'Оборот_розничной_торговли_млн', 'Индекс_потребления']
+    results['corr_scan'] = _summary([_timed(lambda: municipal[municipal['Регион'].isin(regions)][numeric].corr())[0]
+                                     for _ in range(repeat)])
+    results['stats_build'], stats = _timed(lambda: MomentStats.from_frame(municipal, 'Регион', numeric))
+    results['corr_stats'] = _summary([_timed(lambda: stats.corr(regions))[0] for _ in range(repeat)])
+
+    caps = range(10_000, 1_000_001, 10_000)
+    results['top10_sort'] = _summary([_timed(lambda: [municipal[municipal['Население'] <= cap]
+                                                      .sort_values('Средняя_зарплата', ascending=False).head(10)
+                                                      for cap in caps])[0] for _ in range(repeat)])
+    municipal_index = SortedFrameIndex(municipal, 'Регион', 'Население')
+    results['topk_build'], topk = _timed(lambda: TopKIndex(municipal_index, ['Средняя_зарплата']))
+    results['top10_index'] = _summary([_timed(lambda: [topk.top('Средняя_зарплата', 10, high=cap)
+                                                       for cap in caps])[0] for _ in range(repeat)])
+
+    metric = 'Индекс_потребительской_активности'
+    results['seasonality_groupby'] = _summary([_timed(lambda: series[series['Регион'].isin(regions)]
+                                                      .groupby(['Регион', series['Дата'].dt.month])[metric]
+                                                      .mean())[0] for _ in range(repeat)])
+    results['cube_build'], cube = _timed(lambda: MonthlyCube(series))
+    results['seasonality_cube'] = _summary([_timed(lambda: cube.seasonality(regions, metric))[0]
+                                            for _ in range(repeat)])
+    # Новый месяц: дочитывание в копию куба против полной перестройки
+    month = next_month(series, seed=0)
+    extended = pd.concat([series, month], ignore_index=True)
+    results['cube_append_month'] = _summary([_timed(lambda: copy.deepcopy(cube).update(month))[0]
+                                             for _ in range(repeat)])
+    results['cube_rebuild_month'] = _summary([_timed(lambda: MonthlyCube(extended))[0] for _ in range(repeat)])
+
+    sliced = index.select(regions, start, end)
+    results['figure_build'] = _summary([_timed(lambda: px.line(sliced, x='Дата', y=metric, color='Регион'))[0]
+                                        for _ in range(repeat)])
+    cache = FigureCache()
+    key = figure_key('bench_line', regions, metric)
+    results['figure_cached'] = _summary([_timed(lambda: cache.get_or_build(
+        key, lambda: px.line(sliced, x='Дата', y=metric, color='Регион')))[0] for _ in range(repeat + 1)][1:])
+
+    results['rows'] = {name: len(frame) for name, frame in zip(store.TABLES, frames)}
+    results['memory'] = store.memory_report(root).to_dict('records')
+    return results
+
+
+def bench_pages(repeat):
+    """Страницы через streamlit.testing: холодный и теплый прогон."""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    cold_caches = Path(os.environ['ROSSTAT_STORE']).parent / 'cold-cache'
+    cold_caches.mkdir(exist_ok=True)
+
+    def clear_caches():
+        # Дисковые кэши (артефакты и фигуры) живут вне Streamlit: каждый холодный
+        # замер получает пустой каталог, иначе со второй страницы он читает готовое
+        os.environ['ROSSTAT_CACHE'] = tempfile.mkdtemp(dir=cold_caches)
+        st.cache_data.clear()
+        st.cache_resource.clear()
+
+    def measure(select):
+        at = AppTest.from_file(str(APP), default_timeout=600)
+        at.run()
+        select(at)
+        clear_caches()
+        cold, _ = _timed(at.run)
+        warm = [_timed(at.run)[0] for _ in range(repeat)]
+        errors = [str(exception.value) for exception in at.exception]
+        return {'cold': cold, 'warm': _summary(warm), 'errors': errors}
+
+    results = {}
+    for page in PAGES:
+        def open_page(at, page=page):
+            at.sidebar.radio[0].set_value(page)
+        results[page] = measure(open_page)
+
+        if page in VARIANTS:
+            kind, values = VARIANTS[page]
+            for value in values:
+                def open_variant(at, page=page, kind=kind, value=value):
+                    at.sidebar.radio[0].set_value(page).run()
+                    getattr(at, kind)[0].set_value(value)
+                results[f'{page} / {value}'] = measure(open_variant)
+    return results
+
+
+def cold_start():
+    """Один холодный старт в текущем (новом) процессе: импорт и первый прогон."""
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    imported = time.perf_counter()
+    at = AppTest.from_file(str(APP), default_timeout=600)
+    at.run()
+    finished = time.perf_counter()
+    return {
+        'import': imported - started,
+        'first_run': finished - imported,
+        'total': finished - started,
+        'heavy_modules': [name for name in HEAVY_MODULES if name in sys.modules],
+        'errors': [str(exception.value) for exception in at.exception],
+    }
+
+
+def bench_cold_start(env, repeat):
+    runs = []
+    for _ in range(repeat):
+        # Новый процесс с пустым дисковым кэшем: ничего не берется из прошлых замеров
+        with tempfile.TemporaryDirectory() as cache:
+            completed = subprocess.run([sys.executable, __file__, '--cold-start'], cwd=ROOT,
+                                       env=dict(env, ROSSTAT_CACHE=cache), capture_output=True, text=True)
+        if completed.returncode != 0:
+            sys.stderr.write(completed.stderr)
+            raise SystemExit('Замер холодного старта завершился с ошибкой')
+        runs.append(json.loads(completed.stdout))
+    total = _summary([run['total'] for run in runs])
+    return {
+        'import': _summary([run['import'] for run in runs]),
+        'first_run': _summary([run['first_run'] for run in runs]),
+        'total': total,
+        'budget': COLD_START_BUDGET,
+        'within_budget': total['median'] <= COLD_START_BUDGET,
+        'heavy_modules': sorted({name for run in runs for name in run['heavy_modules']}),
+        'errors': [error for run in runs for error in run['errors']],
+    }
+
+
+def worker(scale, repeat):
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    sys.path.insert(0, str(ROOT))
+    result = {'components': bench_components(scale, repeat), 'pages': bench_pages(repeat)}
+    json.dump(result, sys.stdout, ensure_ascii=False)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run(scales, repeat):
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'repeat': repeat,
+        'scales': {},
+    }
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, ROSSTAT_SCALE=scale, ROSSTAT_STORE=str(Path(tmp) / 'store'))
+            print(f'[{scale}] ...', file=sys.stderr)
+            completed = subprocess.run([sys.executable, __file__, '--worker', scale, '--repeat', str(repeat)],
+                                       cwd=ROOT, env=env, capture_output=True, text=True)
+            if completed.returncode != 0:
+                sys.stderr.write(completed.stderr)
+                raise SystemExit(f'Бенчмарк масштаба {scale} завершился с ошибкой')
+            report['scales'][scale] = json.loads(completed.stdout)
+            # Хранилище уже записано воркером: меряется только старт приложения
+            cold = bench_cold_start(env, repeat)
+            report['scales'][scale]['cold_start'] = cold
+            if not cold['within_budget'] or cold['heavy_modules']:
+                print(f"[{scale}] холодный старт {cold['total']['median']:.2f}s "
+                      f"(бюджет {COLD_START_BUDGET}s), лишние модули: {cold['heavy_modules']}", file=sys.stderr)
+    return report
+
+
+def compare(current, baseline):
+    """Печатает отношение медиан теплых прогонов страниц к базовому отчету."""
+    for scale, data in current['scales'].items():
+        base = baseline.get('scales', {}).get(scale)
+        if base is None:
+            continue
+        print(f"\n{scale}: {baseline.get('commit')} -> {current.get('commit')}")
+        for page, timing in data['pages'].items():
+            old = base['pages'].get(page)
+            if old is None:
+                continue
+            ratio = timing['warm']['median'] / old['warm']['median'] if old['warm']['median'] else float('nan')
+            print(f"  {page:<70} warm x{ratio:5.2f}  cold {old['cold']:.3f}s -> {timing['cold']:.3f}s")
+        if 'cold_start' in data and 'cold_start' in base:
+            print(f"  {'Холодный старт':<70} {base['cold_start']['total']['median']:.3f}s -> "
+                  f"{data['cold_start']['total']['median']:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', nargs='+', default=['demo', 'national'])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--compare', type=Path, help='предыдущий JSON-отчет для сравнения')
+    parser.add_argument('--worker', metavar='SCALE', help=argparse.SUPPRESS)
+    parser.add_argument('--cold-start', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cold_start:
+        logging.getLogger('streamlit').setLevel(logging.ERROR)
+        json.dump(cold_start(), sys.stdout, ensure_ascii=False)
+        return
+    if args.worker:
+        worker(args.worker, args.repeat)
+        return
+
+    report = run(args.scales, args.repeat)
+    output = args.output or RESULTS_DIR / f"{report['commit']}-{'-'.join(args.scales)}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f'Результаты: {output}', file=sys.stderr)
+
+    if args.compare:
+        compare(report, json.loads(args.compare.read_text(encoding='utf-8')))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""РосСтат Аналитик: слой данных и вспомогательные модули приложения."""
@@ -0,0 +1,212 @@
+"""Общий для процессов дисковый кэш производных данных.
+
+Значение лежит в файле ``<каталог>/<хэш[:2]>/<хэш>.pkl``. Ключ -- хэш
+имени артефакта и версий данных (хэшей содержимого, ``store.version``),
+поэтому несколько процессов Streamlit на одном хосте используют работу
+друг друга. К ключу подмешивается ``code_version()`` -- хэш исходников
+пакета и версий numpy/pandas: после обновления кода старые файлы не
+читаются и со временем вытесняются. Хэш считается при первом обращении к
+кэшу, а не при импорте, чтобы не замедлять холодный старт.
+
+Запись -- во временный файл с атомарным переименованием: читатель видит
+либо целый файл, либо никакого. Пока один процесс строит значение,
+остальные ждут его на блокировке, а не строят параллельно то же самое.
+Каталог ограничен по размеру ``max_bytes``: при превышении удаляются
+файлы, к которым дольше всего не обращались (mtime обновляется при
+чтении).
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: только блокировка внутри процесса
+    fcntl = None
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# После очистки каталог занимает не больше этой доли лимита
+CLEANUP_TARGET = 0.8
+# Блокировки ключей распределяются по фиксированному числу полос
+LOCK_STRIPES = 64
+# Временные файлы упавших записей старше этого возраста (с) удаляются при очистке
+STALE_TMP_SECONDS = 3600
+
+_MISSING = object()
+
+
+@functools.cache
+def code_version():
+    """Хэш исходников пакета и версий numpy/pandas (один раз на процесс)."""
+    hasher = hashlib.blake2b(digest_size=8)
+    package = Path(__file__).resolve().parent
+    for path in sorted(package.rglob('*.py')):
+        hasher.update(path.relative_to(package).as_posix().encode('utf-8'))
+        hasher.update(path.read_bytes())
+    hasher.update(f'numpy={np.__version__};pandas={pd.__version__}'.encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def artifact_key(*parts):
+    """Стабильный хэш частей ключа (строки, числа, кортежи, даты) и версии кода."""
+    return hashlib.sha1(repr((code_version(), parts)).encode('utf-8')).hexdigest()
+
+
+class ArtifactCache:
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = None
+        self._size_lock = threading.Lock()
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self._held = threading.local()
+
+    def _path(self, key):
+        # Версия кода подмешивается и к ключам, посчитанным вне artifact_key (фигуры)
+        name = hashlib.sha1(f'{code_version()}:{key}'.encode('utf-8')).hexdigest()
+        return self.directory / name[:2] / f'{name}.pkl'
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as handle:
+                value = pickle.load(handle)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError):
+            # Нет файла, он поврежден или записан несовместимым кодом -- промах
+            return default
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'.{path.name}.tmp-{os.getpid()}-{threading.get_ident()}')
+        with open(tmp, 'wb') as handle:
+            pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        size = tmp.stat().st_size
+        os.replace(tmp, path)
+        self._grow(size)
+        return value
+
+    def get_or_build(self, key, build):
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._lock(key):
+            # Пока ждали блокировку, значение мог построить другой поток или процесс
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            self.misses += 1
+            return self.put(key, build())
+
+    def _lock(self, key):
+        stripe = int(hashlib.sha1(key.encode('utf-8')).hexdigest()[:8], 16) % LOCK_STRIPES
+        path = self.directory / 'locks' / f'{stripe:02d}.lock' if fcntl else None
+        held = self._held.__dict__.setdefault('stripes', set())
+        return _KeyLock(self._locks[stripe], path, stripe, held)
+
+    def _files(self):
+        return list(self.directory.glob('*/*.pkl')) if self.directory.is_dir() else []
+
+    def _grow(self, size):
+        with self._size_lock:
+            if self._bytes is None:
+                self._bytes = sum(_size(path) for path in self._files())
+            else:
+                self._bytes += size
+            if self._bytes > self.max_bytes:
+                self._bytes = self._cleanup()
+
+    def _cleanup(self):
+        """Удаляет давно не читанные файлы до CLEANUP_TARGET лимита; возвращает новый размер."""
+        entries = []
+        for path in self._files():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes * CLEANUP_TARGET:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+        now = time.time()
+        for tmp in self.directory.glob('*/.*.tmp-*'):
+            try:
+                if now - tmp.stat().st_mtime > STALE_TMP_SECONDS:
+                    tmp.unlink()
+            except OSError:
+                pass
+        return total
+
+    def stats(self):
+        files = self._files()
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(files),
+                'bytes': sum(_size(path) for path in files)}
+
+
+def _size(path):
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+class _KeyLock:
+    """Блокировка полосы ключей: между потоками -- Lock, между процессами -- flock.
+
+    Повторный захват той же полосы в потоке, который ее уже держит
+    (построение одного артефакта вызывает другой), ничего не делает.
+    """
+
+    def __init__(self, lock, path, stripe, held):
+        self.lock = lock
+        self.path = path
+        self.stripe = stripe
+        self.held = held
+        self.owner = False
+        self.handle = None
+
+    def __enter__(self):
+        if self.stripe in self.held:
+            return self
+        self.lock.acquire()
+        self.owner = True
+        self.held.add(self.stripe)
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.handle = open(self.path, 'a')
+            fcntl.flock(self.handle, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if not self.owner:
+            return
+        if self.handle is not None:
+            fcntl.flock(self.handle, fcntl.LOCK_UN)
+            self.handle.close()
+            self.handle = None
+        self.held.discard(self.stripe)
+        self.owner = False
+        self.lock.release()
@@ -0,0 +1,63 @@
+"""Ящики с усами по заранее посчитанным статистикам.
+
+Для каждой группы считаются квартили, усы (крайние значения в пределах
+1,5 межквартильного размаха, как в Plotly) и выбросы. В браузер уходит
+только эта сводка -- по пять чисел и выбросы на ящик -- а не все исходные
+значения, поэтому размер графика не зависит от числа строк.
+"""
+
+import numpy as np
+
+
+def box_summary(frame, value, by):
+    """Сводка по группам ``by``: n, q1, median, q3, mean, усы и список выбросов."""
+    by = [by] if isinstance(by, str) else list(by)
+    data = frame[by + [value]].dropna(subset=[value])
+    grouped = data.groupby(by, observed=True, sort=True)[value]
+    codes = grouped.ngroup().to_numpy()
+    values = data[value].to_numpy(dtype=float)
+
+    # Квартили -- линейная интерполяция, как у Plotly по умолчанию
+    quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    q1, median, q3 = (quartiles[q].to_numpy() for q in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+    inside = (values >= (q1 - 1.5 * iqr)[codes]) & (values <= (q3 + 1.5 * iqr)[codes])
+
+    n_groups = len(quartiles)
+    lowerfence = np.full(n_groups, np.inf)
+    upperfence = np.full(n_groups, -np.inf)
+    np.minimum.at(lowerfence, codes[inside], values[inside])
+    np.maximum.at(upperfence, codes[inside], values[inside])
+
+    order = np.argsort(codes[~inside], kind='stable')
+    outlier_codes, outlier_values = codes[~inside][order], values[~inside][order]
+    bounds = np.searchsorted(outlier_codes, np.arange(n_groups + 1))
+
+    summary = quartiles.index.to_frame(index=False)
+    summary['n'] = grouped.size().to_numpy()
+    summary['q1'], summary['median'], summary['q3'] = q1, median, q3
+    summary['mean'] = grouped.mean().to_numpy()
+    summary['lowerfence'], summary['upperfence'] = lowerfence, upperfence
+    summary['outliers'] = [outlier_values[bounds[i]:bounds[i + 1]].tolist() for i in range(n_groups)]
+    return summary
+
+
+def box_figure(summary, x, title=None):
+    """Фигура Plotly по сводке ``box_summary``: по ящику на значение ``x``."""
+    # Plotly нужен только при построении фигуры, сводку считает слой данных
+    import plotly.graph_objects as go
+
+    labels = summary[x].astype(str).tolist()
+    fig = go.Figure(go.Box(
+        x=labels, q1=summary['q1'], median=summary['median'], q3=summary['q3'],
+        lowerfence=summary['lowerfence'], upperfence=summary['upperfence'], mean=summary['mean'],
+        name='', showlegend=False, boxpoints=False,
+    ))
+    outliers = summary['outliers'].map(len).to_numpy()
+    if outliers.sum():
+        fig.add_trace(go.Scatter(
+            x=np.repeat(labels, outliers), y=np.concatenate(summary['outliers'].map(np.asarray).tolist()),
+            mode='markers', name='Выбросы', showlegend=False,
+        ))
+    fig.update_layout(title=title, xaxis={'categoryorder': 'array', 'categoryarray': labels})
+    return fig
@@ -0,0 +1,51 @@
+"""Сравнение объектов сразу по нескольким показателям.
+
+Все выбранные показатели нормируются одним векторным проходом, а вместо
+отдельной фигуры на показатель строится одна фигура с панелями (facet) и
+одна радарная диаграмма со следом на объект: в браузер уходит один
+payload на блок сравнения.
+"""
+
+import math
+
+import numpy as np
+
+# Высота одной строки панелей, px
+FACET_HEIGHT = 320
+
+
+def normalized(frame, metrics):
+    """Значения ``metrics`` в процентах от максимума каждого столбца (n × k)."""
+    values = frame[list(metrics)].to_numpy(dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return values / np.nanmax(values, axis=0) * 100
+
+
+def radar_figure(frame, label, metrics, title):
+    """Радарная диаграмма: след на каждую строку ``frame``, нормированные оси."""
+    # Plotly нужен только при построении фигуры
+    import plotly.graph_objects as go
+
+    values = normalized(frame, metrics)
+    traces = [go.Scatterpolar(r=row, theta=list(metrics), fill='toself', name=name)
+              for name, row in zip(frame[label].astype(str), values)]
+    return go.Figure(data=traces, layout={
+        'polar': {'radialaxis': {'visible': True, 'range': [0, 100]}},
+        'showlegend': True,
+        'title': title,
+    })
+
+
+def metric_bars(frame, label, metrics, title, columns=2):
+    """Столбцы по каждому показателю на своей панели с собственной осью Y."""
+    import plotly.express as px
+
+    metrics = list(metrics)
+    long = frame[[label, *metrics]].melt(id_vars=label, var_name='Показатель', value_name='Значение')
+    wrap = min(columns, len(metrics))
+    fig = px.bar(long, x=label, y='Значение', color=label, facet_col='Показатель', facet_col_wrap=wrap,
+                 facet_row_spacing=0.12, category_orders={'Показатель': metrics}, title=title)
+    fig.update_yaxes(matches=None, showticklabels=True, title_text=None)
+    fig.for_each_annotation(lambda annotation: annotation.update(text=annotation.text.split('=', 1)[-1]))
+    fig.update_layout(height=FACET_HEIGHT * math.ceil(len(metrics) / wrap) + 80, showlegend=False)
+    return fig
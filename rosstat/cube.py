@@ -0,0 +1,202 @@
+"""Предагрегированный куб СберИндекса: регион × год × месяц × показатель.
+
+В каждой ячейке хранятся count/sum/min/max. Сезонность, помесячная
+динамика, свертки по всем регионам и федеральным округам и сравнение год к
+году считаются по ячейкам куба, без обращения к исходным строкам. Новые
+строки (например, очередной месяц) добавляются через ``update``.
+"""
+
+import numpy as np
+import pandas as pd
+
+from rosstat import instrument
+from rosstat.regions import FEDERAL_DISTRICTS
+
+MONTH_NAMES = ['Январь', 'Февраль', 'Март', 'Апрель', 'Май', 'Июнь',
+               'Июль', 'Август', 'Сентябрь', 'Октябрь', 'Ноябрь', 'Декабрь']
+
+
+class MonthlyCube:
+    def __init__(self, frame, key='Регион', date='Дата', metrics=None):
+        self.key = key
+        self.date = date
+        self.metrics = list(metrics) if metrics is not None else \
+            [column for column in frame.columns if column not in (key, date)]
+        self.regions = []
+        self._pos = {}
+        self.years = np.arange(0)
+        shape = (0, 0, 12, len(self.metrics))
+        self.count = np.zeros(shape)
+        self.sum = np.zeros(shape)
+        self.min = np.full(shape, np.nan)
+        self.max = np.full(shape, np.nan)
+        self.update(frame)
+
+    def _resize(self, years):
+        # Расширяет массивы под новые регионы и годы, сохраняя накопленные ячейки
+        offset = int(self.years[0] - years[0]) if len(self.years) else 0
+        shape = (len(self.regions), len(years), 12, len(self.metrics))
+        for name, fill in (('count', 0), ('sum', 0), ('min', np.nan), ('max', np.nan)):
+            old = getattr(self, name)
+            new = np.full(shape, fill, dtype=float)
+            new[:old.shape[0], offset:offset + old.shape[1]] = old
+            setattr(self, name, new)
+        self.years = years
+
+    def update(self, frame):
+        """Добавляет строки ``frame`` в ячейки куба (новые регионы и годы -- тоже)."""
+        if not len(frame):
+            return self
+        for region in pd.unique(frame[self.key]):
+            if region not in self._pos:
+                self._pos[region] = len(self.regions)
+                self.regions.append(region)
+
+        dates = pd.DatetimeIndex(frame[self.date])
+        first_year, last_year = int(dates.year.min()), int(dates.year.max())
+        if len(self.years):
+            first_year, last_year = min(first_year, self.years[0]), max(last_year, self.years[-1])
+        self._resize(np.arange(first_year, last_year + 1))
+
+        region_idx = pd.Index(self.regions).get_indexer(frame[self.key])
+        flat = (region_idx * len(self.years) + (dates.year.to_numpy() - first_year)) * 12 \
+            + dates.month.to_numpy() - 1
+        agg = frame[self.metrics].groupby(flat).agg(['count', 'sum', 'min', 'max'])
+
+        cells = agg.index.to_numpy()
+        count, total = self.count.reshape(-1, len(self.metrics)), self.sum.reshape(-1, len(self.metrics))
+        low, high = self.min.reshape(-1, len(self.metrics)), self.max.reshape(-1, len(self.metrics))
+        for k, metric in enumerate(self.metrics):
+            count[cells, k] += agg[(metric, 'count')].to_numpy()
+            total[cells, k] += agg[(metric, 'sum')].to_numpy()
+            low[cells, k] = np.fmin(low[cells, k], agg[(metric, 'min')].to_numpy())
+            high[cells, k] = np.fmax(high[cells, k], agg[(metric, 'max')].to_numpy())
+        return self
+
+    def _regions(self, regions):
+        if regions is None:
+            return list(range(len(self.regions)))
+        return [self._pos[region] for region in regions if region in self._pos]
+
+    def _months(self, start, end):
+        # Маска (год, месяц) для ячеек, пересекающих период [start, end]
+        months = (self.years[:, None] * 12 + np.arange(12)).astype(np.int64)
+        mask = np.ones(months.shape, dtype=bool)
+        if start is not None:
+            start = pd.Timestamp(start)
+            mask &= months >= start.year * 12 + start.month - 1
+        if end is not None:
+            end = pd.Timestamp(end)
+            mask &= months <= end.year * 12 + end.month - 1
+        return mask
+
+    def _cells(self, regions, metric, start, end):
+        rows = self._regions(regions)
+        k = self.metrics.index(metric)
+        mask = self._months(start, end)
+        count = self.count[rows, :, :, k] * mask
+        total = self.sum[rows, :, :, k] * mask
+        return rows, count, total
+
+    def _month_ends(self):
+        starts = pd.to_datetime({'year': np.repeat(self.years, 12),
+                                 'month': np.tile(np.arange(1, 13), len(self.years)),
+                                 'day': 1})
+        return (starts + pd.offsets.MonthEnd(0)).to_numpy()
+
+    def series(self):
+        """Средние всех рядов массивом регион × показатель × месяц и концы месяцев.
+
+        Ряды начинаются с января первого года куба; месяцы после последнего
+        с данными отбрасываются, пустые ячейки -- NaN.
+        """
+        count = self.count.reshape(len(self.regions), -1, len(self.metrics))
+        total = self.sum.reshape(len(self.regions), -1, len(self.metrics))
+        filled = np.flatnonzero(count.any(axis=(0, 2)))
+        length = int(filled[-1]) + 1 if len(filled) else 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, total / count, np.nan)[:, :length]
+        return mean.transpose(0, 2, 1), self._month_ends()[:length]
+
+    @instrument.timed('aggregate')
+    def monthly(self, regions, metric, start=None, end=None):
+        """Среднее ``metric`` по месяцам для каждого региона (Регион, Дата, metric)."""
+        rows, count, total = self._cells(regions, metric, start, end)
+        count = count.reshape(len(rows), -1)
+        total = total.reshape(len(rows), -1)
+        region_idx, cell_idx = np.nonzero(count)
+        return pd.DataFrame({
+            self.key: np.array(self.regions, dtype=object)[np.array(rows, dtype=int)[region_idx]],
+            'Дата': self._month_ends()[cell_idx],
+            metric: total[region_idx, cell_idx] / count[region_idx, cell_idx],
+        })
+
+    @instrument.timed('aggregate')
+    def seasonality(self, regions, metric, start=None, end=None):
+        """Среднее ``metric`` по календарным месяцам за все годы (Регион, Месяц, metric)."""
+        rows, count, total = self._cells(regions, metric, start, end)
+        count, total = count.sum(axis=1), total.sum(axis=1)
+        region_idx, month_idx = np.nonzero(count)
+        result = pd.DataFrame({
+            self.key: np.array(self.regions, dtype=object)[np.array(rows, dtype=int)[region_idx]],
+            'Месяц': pd.Categorical.from_codes(month_idx, categories=MONTH_NAMES, ordered=True),
+            metric: total[region_idx, month_idx] / count[region_idx, month_idx],
+        })
+        return result.sort_values(['Месяц', self.key], kind='stable').reset_index(drop=True)
+
+    @instrument.timed('aggregate')
+    def rollup(self, metric, by=None, regions=None, start=None, end=None):
+        """Помесячная свертка по всем регионам (``by=None``) или по федеральным округам."""
+        rows, count, total = self._cells(regions, metric, start, end)
+        if by is None:
+            labels = np.zeros(len(rows), dtype=int)
+            names = ['Все регионы']
+        else:
+            districts = [FEDERAL_DISTRICTS.get(self.regions[row], 'Прочие') for row in rows]
+            labels, names = pd.factorize(pd.Series(districts))
+        group_count = np.zeros((len(names),) + count.shape[1:])
+        group_total = np.zeros_like(group_count)
+        np.add.at(group_count, labels, count)
+        np.add.at(group_total, labels, total)
+        group_count = group_count.reshape(len(names), -1)
+        group_total = group_total.reshape(len(names), -1)
+        group_idx, cell_idx = np.nonzero(group_count)
+        return pd.DataFrame({
+            'Федеральный округ' if by else 'Группа': np.asarray(names, dtype=object)[group_idx],
+            'Дата': self._month_ends()[cell_idx],
+            metric: group_total[group_idx, cell_idx] / group_count[group_idx, cell_idx],
+        })
+
+    @instrument.timed('aggregate')
+    def year_over_year(self, regions, metric):
+        """Среднегодовое значение и изменение к предыдущему году, %."""
+        rows, count, total = self._cells(regions, metric, None, None)
+        count, total = count.sum(axis=2), total.sum(axis=2)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, total / np.where(count > 0, count, 1), np.nan)
+            change = np.full(mean.shape, np.nan)
+            change[:, 1:] = (mean[:, 1:] / mean[:, :-1] - 1) * 100
+        region_idx, year_idx = np.nonzero(count)
+        return pd.DataFrame({
+            self.key: np.array(self.regions, dtype=object)[np.array(rows, dtype=int)[region_idx]],
+            'Год': self.years[year_idx],
+            metric: mean[region_idx, year_idx],
+            'Изменение_%': change[region_idx, year_idx],
+        })
+
+    @instrument.timed('aggregate')
+    def extremes(self, regions, metric, start=None, end=None):
+        """Минимум, максимум и среднее ``metric`` за период по каждому региону."""
+        rows, count, total = self._cells(regions, metric, start, end)
+        k = self.metrics.index(metric)
+        mask = self._months(start, end) & (self.count[rows, :, :, k] > 0)
+        low = np.where(mask, self.min[rows, :, :, k], np.inf).min(axis=(1, 2))
+        high = np.where(mask, self.max[rows, :, :, k], -np.inf).max(axis=(1, 2))
+        n = count.sum(axis=(1, 2))
+        keep = n > 0
+        return pd.DataFrame({
+            self.key: np.array(self.regions, dtype=object)[np.array(rows, dtype=int)[keep]],
+            'Минимум': low[keep],
+            'Максимум': high[keep],
+            'Среднее': total.sum(axis=(1, 2))[keep] / n[keep],
+        })
@@ -0,0 +1,341 @@
+"""Доступ страниц приложения к данным через кэши Streamlit.
+
+Таблицы читаются из колоночного хранилища (``rosstat.store``) с проекцией
+по столбцам и партициям. Ключ кэша включает версию таблицы (хэш
+содержимого файлов), поэтому обновленные на диске выгрузки подхватываются
+без перезапуска. Для выборки по регионам версия берется только по их
+партициям.
+
+Производные результаты, помеченные ``shared``, дополнительно хранятся в
+общем дисковом кэше (``rosstat.artifacts``) по тем же версиям: процессы
+Streamlit на одном хосте не пересчитывают то, что уже посчитал соседний.
+
+Куб СберИндекса и статистики корреляций не перестраиваются при дописывании
+строк (``rosstat.ingest``): они дочитывают только новые файлы.
+
+Таблицы лежат в ``st.cache_resource`` в одном экземпляре на процесс и
+отдаются всем сессиям без копирования. Включен режим copy-on-write pandas:
+срезы и ``assign`` на общих таблицах не копируют данные, а запись в них
+никогда не меняет общий экземпляр. Производные столбцы страницы добавляют
+только через ``assign`` к своим выборкам.
+"""
+
+import functools
+import inspect
+import os
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from rosstat import geo, instrument, schema, store
+from rosstat.artifacts import ArtifactCache, artifact_key
+from rosstat.boxplot import box_summary
+from rosstat.cube import MonthlyCube
+from rosstat.forecast import SeasonalForecast
+from rosstat.incremental import IncrementalAggregate
+from rosstat.index import SortedFrameIndex
+from rosstat.similar import SimilarityIndex
+from rosstat.stats import MomentStats
+from rosstat.synthetic import SCALES, generate
+from rosstat.table import TableView
+from rosstat.topk import TopKIndex
+from rosstat.trend import fit_trend
+
+# Общие таблицы нельзя менять на месте: любая запись копирует только затронутое
+pd.set_option('mode.copy_on_write', True)
+
+# Масштаб синтетических данных: demo (по умолчанию), national, national_daily
+DATA_SCALE = os.environ.get('ROSSTAT_SCALE', 'demo')
+
+
+@st.cache_resource
+def open_store(scale=DATA_SCALE):
+    # Если хранилища нет, заполняем его синтетическими данными
+    return str(store.ensure(store.default_root(scale), lambda: generate(**SCALES[scale])))
+
+
+@st.cache_resource
+def artifact_cache(scale=DATA_SCALE):
+    # Общий для процессов каталог: ROSSTAT_CACHE или store/cache/<масштаб>
+    root = Path(open_store(scale))
+    return ArtifactCache(os.environ.get('ROSSTAT_CACHE') or root.parent / 'cache' / root.name)
+
+
+def shared(func):
+    """Результат ``func`` берется из общего дискового кэша и кладется в него.
+
+    Ключ -- имя функции и аргументы, кроме ``root`` (версии в них --
+    хэши содержимого). Ставится под ``st.cache_*``: память процесса
+    проверяется первой, диск -- при ее промахе.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        arguments = signature.bind(*args, **kwargs).arguments
+        key = artifact_key(func.__qualname__, *((name, value) for name, value in arguments.items() if name != 'root'))
+        return artifact_cache().get_or_build(key, lambda: func(*args, **kwargs))
+    return wrapper
+
+
+def snapshot_id():
+    """Хэш содержимого всех таблиц: одинаковый у всех процессов с одними данными."""
+    return store.snapshot(open_store())
+
+
+@st.cache_resource(max_entries=64)
+def _read_table(root, name, columns, regions, version):
+    instrument.cache_miss('load_table')
+    return store.read_table(root, name, columns, regions)
+
+
+@instrument.timed('load', cache='load_table')
+def load_table(name, columns=None, regions=None):
+    """Таблица ``name`` только с нужными столбцами и регионами (общая, только для чтения)."""
+    root = open_store()
+    return _read_table(root, name,
+                       tuple(columns) if columns is not None else None,
+                       tuple(regions) if regions is not None else None,
+                       store.version(root, name, regions))
+
+
+def data_version(*names):
+    """Версии таблиц ``names`` для ключей производных кэшей."""
+    root = open_store()
+    return tuple(store.version(root, name) for name in names)
+
+
+def load_data():
+    """Все четыре таблицы целиком (regional, municipal, sber_index, sber_time_series)."""
+    return tuple(load_table(name) for name in store.TABLES)
+
+
+# Столбец, по которому внутри региона сортируется индекс таблицы
+INDEX_ORDER = {
+    'municipal_data': 'Население',
+    'sber_time_series': 'Дата',
+}
+
+
+@st.cache_resource(max_entries=8)
+def _table_index(root, name, version):
+    instrument.cache_miss('table_index')
+    frame = schema.with_derived(name, store.read_table(root, name))
+    return SortedFrameIndex(frame, 'Регион', INDEX_ORDER[name])
+
+
+@instrument.timed('load', cache='table_index')
+def table_index(name):
+    """Индекс (Регион, INDEX_ORDER[name]), строится один раз на версию таблицы."""
+    root = open_store()
+    return _table_index(root, name, store.version(root, name))
+
+
+@st.cache_resource(max_entries=256)
+def _partition_index(root, name, region, columns, version):
+    instrument.cache_miss('partition_index')
+    frame = schema.with_derived(name, store.read_table(root, name, columns, [region]))
+    return SortedFrameIndex(frame, 'Регион', INDEX_ORDER[name])
+
+
+@instrument.timed('load', cache='partition_index')
+def select_partitions(name, regions, low=None, high=None, columns=None):
+    """Строки ``regions`` с ``low <= INDEX_ORDER[name] <= high`` по индексам отдельных партиций.
+
+    Читаются только партиции ``regions`` и столбцы ``columns`` (ключ и
+    столбец порядка добавляются сами); индекс партиции кэшируется на ее
+    версию, поэтому новый регион в выборке дочитывает только свою партицию.
+    """
+    root = open_store()
+    order = INDEX_ORDER[name]
+    columns = tuple(dict.fromkeys(['Регион', order, *columns])) if columns is not None else None
+    parts = [_partition_index(root, name, region, columns, store.version(root, name, [region]))
+             .select([region], low, high, columns) for region in regions]
+    if not parts:
+        return schema.with_derived(name, store.read_table(root, name, columns, regions=[]))
+    return pd.concat(parts, ignore_index=True)
+
+
+@st.cache_resource(max_entries=8)
+@shared
+def _box_stats(root, name, value, by, version):
+    instrument.cache_miss('box_stats')
+    return box_summary(_table_index(root, name, version).frame, value, list(by))
+
+
+@instrument.timed('aggregate', cache='box_stats')
+def box_stats(name, value, by):
+    """Квартили, усы и выбросы ``value`` по группам ``by`` для всей таблицы."""
+    root = open_store()
+    return _box_stats(root, name, value, tuple(by), store.version(root, name))
+
+
+@st.cache_resource(max_entries=8)
+def _table_topk(root, name, metrics, version):
+    instrument.cache_miss('table_topk')
+    return TopKIndex(_table_index(root, name, version), metrics)
+
+
+@instrument.timed('load', cache='table_topk')
+def table_topk(name, metrics):
+    """Top-k индекс по ``metrics`` поверх индекса (Регион, INDEX_ORDER[name])."""
+    root = open_store()
+    return _table_topk(root, name, tuple(metrics), store.version(root, name))
+
+
+@st.cache_resource(max_entries=2)
+def _similarity_index(root, version):
+    instrument.cache_miss('similarity_index')
+    return SimilarityIndex(_table_index(root, 'municipal_data', version))
+
+
+@instrument.timed('load', cache='similarity_index')
+def similarity_index():
+    """Стандартизованная матрица признаков муниципалитетов для поиска похожих."""
+    root = open_store()
+    return _similarity_index(root, store.version(root, 'municipal_data'))
+
+
+@st.cache_resource(max_entries=8)
+def _table_view(root, name, version):
+    instrument.cache_miss('table_view')
+    # Индексированные таблицы уже загружены в индекс -- используем ту же копию
+    if name in INDEX_ORDER:
+        return TableView(_table_index(root, name, version).frame)
+    return TableView(store.read_table(root, name))
+
+
+@instrument.timed('load', cache='table_view')
+def table_view(name):
+    """Постраничное представление всей таблицы, общее для сессий."""
+    root = open_store()
+    return _table_view(root, name, store.version(root, name))
+
+
+@st.cache_resource(max_entries=16)
+def _table_stats(root, name, columns):
+    instrument.cache_miss('table_stats')
+    return IncrementalAggregate(root, name, lambda frame: MomentStats.from_frame(frame, 'Регион', columns),
+                                columns=['Регион', *columns])
+
+
+@instrument.timed('load', cache='table_stats')
+def table_stats(name, columns):
+    """Достаточные статистики по регионам для числовых столбцов ``columns``."""
+    return _table_stats(open_store(), name, tuple(columns)).get()
+
+
+@st.cache_resource(max_entries=4)
+def _series_cube(root):
+    instrument.cache_miss('series_cube')
+    return IncrementalAggregate(root, 'sber_time_series', MonthlyCube)
+
+
+@instrument.timed('load', cache='series_cube')
+def series_cube():
+    """Куб регион × год × месяц для временных рядов СберИндекса."""
+    return _series_cube(open_store()).get()
+
+
+@st.cache_resource(max_entries=2)
+@shared
+def _series_forecast(root, version):
+    instrument.cache_miss('series_forecast')
+    cube = _series_cube(root).get()
+    values, dates = cube.series()
+    return SeasonalForecast(values, dates, cube.regions, cube.metrics)
+
+
+@instrument.timed('aggregate', cache='series_forecast')
+def series_forecast():
+    """Декомпозиция и прогноз всех рядов СберИндекса (один расчет на версию данных)."""
+    root = open_store()
+    return _series_forecast(root, store.version(root, 'sber_time_series'))
+
+
+@instrument.timed('load')
+def table_regions(name):
+    return store.partitions(open_store(), name)
+
+
+@st.cache_data(max_entries=64)
+@shared
+def _trend_fit(root, name, x, y, regions, method, version):
+    instrument.cache_miss('trend_fit')
+    frame = store.read_table(root, name, [x, y], regions)
+    return fit_trend(frame[x], frame[y], method)
+
+
+@instrument.timed('aggregate', cache='trend_fit')
+def trend_fit(name, x, y, regions=None, method='ols'):
+    """Линия тренда ``y`` от ``x`` по регионам ``regions`` (кэш на версию их партиций)."""
+    root = open_store()
+    regions = tuple(sorted(regions)) if regions is not None else None
+    return _trend_fit(root, name, x, y, regions, method, store.version(root, name, regions))
+
+
+@st.cache_resource(max_entries=2)
+def _region_shapes(path, version):
+    instrument.cache_miss('region_shapes')
+    return geo.read_regions(path)
+
+
+@st.cache_resource(max_entries=8)
+def _region_geometry(path, level, version):
+    instrument.cache_miss('region_geometry')
+    return geo.simplify(_region_shapes(path, version), level)
+
+
+@instrument.timed('load', cache='region_geometry')
+def region_geometry(names):
+    """Границы регионов ``names`` на уровне детализации по их охвату.
+
+    Возвращает (FeatureCollection, номер уровня geo.LEVELS, число точек);
+    упрощенная геометрия каждого уровня строится один раз на версию файла.
+    """
+    path = str(geo.GEOJSON)
+    version = geo.version(path)
+    shapes = _region_shapes(path, version)
+    names = [name for name in names if name in shapes]
+    if not names:
+        return geo.subset({'features': []}, ()), 0, 0
+    level = geo.level_for(shapes, set(names))
+    collection, points = _region_geometry(path, level, version)
+    return geo.subset(collection, names), level, points
+
+
+@st.cache_data(max_entries=16)
+def _count_rows(root, name, version):
+    instrument.cache_miss('count_rows')
+    return store.count_rows(root, name)
+
+
+@instrument.timed('load', cache='count_rows')
+def count_rows(name):
+    root = open_store()
+    return _count_rows(root, name, store.version(root, name))
+
+
+@st.cache_data(max_entries=16)
+def _column_bounds(root, name, column, version):
+    instrument.cache_miss('column_bounds')
+    return store.column_bounds(root, name, column)
+
+
+@instrument.timed('load', cache='column_bounds')
+def column_bounds(name, column):
+    root = open_store()
+    return _column_bounds(root, name, column, store.version(root, name))
+
+
+@st.cache_data(max_entries=4)
+@shared
+def _memory_report(root, versions):
+    return store.memory_report(root)
+
+
+def memory_report():
+    """Память таблиц до и после компактной схемы (для панели отладки)."""
+    root = open_store()
+    return _memory_report(root, data_version(*store.TABLES))
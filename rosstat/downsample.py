@@ -0,0 +1,116 @@
+"""Прореживание временных рядов перед отправкой графика в браузер.
+
+Каждый ряд (регион) сокращается до бюджета точек, зависящего от ширины
+графика: больше одной точки на пиксель линия все равно не покажет.
+Алгоритмы сохраняют форму ряда:
+
+- ``lttb`` -- Largest-Triangle-Three-Buckets; ряды одинаковой длины
+  обрабатываются одной матрицей, цикл идет только по корзинам;
+- ``minmax`` -- минимум и максимум в каждой корзине, полностью векторно.
+
+Ряд, в котором точек меньше бюджета, возвращается без изменений, поэтому
+при сужении периода график автоматически получает полное разрешение.
+"""
+
+import numpy as np
+
+from rosstat import instrument
+
+# Ширина графика по умолчанию (px) при width='stretch' в широком макете
+CHART_WIDTH = 1200
+
+
+def point_budget(width=CHART_WIDTH, points_per_pixel=1):
+    return max(3, int(width * points_per_pixel))
+
+
+def lttb_indices(x, y, n_out):
+    """Индексы точек LTTB для матриц ``x``, ``y`` формы (рядов, точек)."""
+    x = np.atleast_2d(np.asarray(x, dtype=float))
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    n_series, n = y.shape
+    if n <= n_out or n_out < 3:
+        return np.tile(np.arange(n), (n_series, 1))
+
+    every = (n - 2) / (n_out - 2)
+    # Границы корзин: корзина i занимает [edges[i], edges[i + 1])
+    edges = (np.floor(np.arange(n_out - 1) * every) + 1).astype(np.int64)
+    edges[-1] = n - 1
+
+    # Средние следующей корзины считаются заранее через кумулятивные суммы
+    cum_x = np.concatenate([np.zeros((n_series, 1)), np.cumsum(x, axis=1)], axis=1)
+    cum_y = np.concatenate([np.zeros((n_series, 1)), np.cumsum(y, axis=1)], axis=1)
+    next_start = edges[1:]
+    next_stop = np.append(edges[2:], n)
+    size = next_stop - next_start
+    avg_x = (cum_x[:, next_stop] - cum_x[:, next_start]) / size
+    avg_y = (cum_y[:, next_stop] - cum_y[:, next_start]) / size
+
+    rows = np.arange(n_series)
+    selected = np.empty((n_series, n_out), dtype=np.int64)
+    selected[:, 0] = 0
+    selected[:, -1] = n - 1
+    a = np.zeros(n_series, dtype=np.int64)
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        ax, ay = x[rows, a][:, None], y[rows, a][:, None]
+        area = np.abs((ax - avg_x[:, i:i + 1]) * (y[:, start:stop] - ay)
+                      - (ax - x[:, start:stop]) * (avg_y[:, i:i + 1] - ay))
+        a = start + np.argmax(area, axis=1)
+        selected[:, i + 1] = a
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """Индексы концов ряда и минимума и максимума в каждой из ``(n_out - 2) // 2`` корзин."""
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    n_series, n = y.shape
+    # Концы ряда входят в бюджет точек наравне с экстремумами корзин
+    n_buckets = max(1, (n_out - 2) // 2)
+    if n <= n_out:
+        return np.tile(np.arange(n), (n_series, 1))
+
+    size = -(-n // n_buckets)
+    padded = np.full((n_series, n_buckets * size), np.nan)
+    padded[:, :n] = y
+    buckets = padded.reshape(n_series, n_buckets, size)
+    # Хвост последней корзины заполнен NaN и не должен выбираться
+    filled = np.where(np.isnan(buckets), np.inf, buckets)
+    low = np.argmin(filled, axis=2)
+    high = np.argmax(np.where(np.isnan(buckets), -np.inf, buckets), axis=2)
+    offsets = np.arange(n_buckets) * size
+    ends = np.tile([0, n - 1], (n_series, 1))
+    return np.sort(np.concatenate([ends, low + offsets, high + offsets], axis=1), axis=1)
+
+
+@instrument.timed('filter')
+def downsample(frame, x, y, by, n_out=None, method='lttb'):
+    """Прореживает каждый ряд ``frame`` (группы ``by``, порядок по ``x``) до ``n_out`` точек."""
+    n_out = n_out or point_budget()
+    if len(frame) == 0:
+        return frame
+
+    keys = frame[by].to_numpy()
+    starts = np.concatenate([[0], np.flatnonzero(keys[1:] != keys[:-1]) + 1])
+    stops = np.append(starts[1:], len(keys))
+    if (stops - starts).max() <= n_out:
+        return frame
+
+    x_values = frame[x].to_numpy()
+    if np.issubdtype(x_values.dtype, np.datetime64):
+        x_values = x_values.astype('datetime64[ns]').astype(np.int64)
+    x_values = x_values.astype(float)
+    y_values = frame[y].to_numpy(dtype=float)
+
+    # Ряды одинаковой длины прореживаются одной матрицей
+    lengths = stops - starts
+    keep = []
+    for length in np.unique(lengths):
+        group = starts[lengths == length]
+        rows = group[:, None] + np.arange(length)
+        if method == 'minmax':
+            chosen = minmax_indices(y_values[rows], n_out)
+        else:
+            chosen = lttb_indices(x_values[rows], y_values[rows], n_out)
+        keep.append((group[:, None] + chosen).ravel())
+    return frame.iloc[np.unique(np.concatenate(keep))]
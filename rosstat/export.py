@@ -0,0 +1,179 @@
+"""Фоновая выгрузка отчетов в Excel, Parquet и HTML.
+
+Выгрузка выполняется в пуле потоков ``ExportQueue``, а не в потоке скрипта
+Streamlit: страница только ставит задание и показывает его прогресс.
+Одинаковые задания (отчет, формат, версии данных) разных сессий
+объединяются в одно. Таблицы пишутся порциями по ``CHUNK_ROWS`` строк
+во временный файл, который затем атомарно переименовывается; готовый файл
+отдается с диска при скачивании и не держится в памяти сессии.
+
+Excel пишется через ``openpyxl`` (зависимость из requirements.txt) или
+``xlsxwriter``; если ни один не установлен, формат не предлагается.
+"""
+
+import hashlib
+import html
+import importlib.util
+import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+CHUNK_ROWS = 50_000
+
+EXCEL_ENGINE = next((engine for engine in ('openpyxl', 'xlsxwriter') if importlib.util.find_spec(engine)), None)
+
+# Формат -> (название, расширение, MIME)
+FORMATS = {
+    'xlsx': ("Excel", 'xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'parquet': ("Parquet (zip)", 'zip', 'application/zip'),
+    'html': ("HTML", 'html', 'text/html'),
+}
+
+
+def available_formats():
+    return {name: spec for name, spec in FORMATS.items() if name != 'xlsx' or EXCEL_ENGINE}
+
+
+def _chunks(frame):
+    for start in range(0, max(len(frame), 1), CHUNK_ROWS):
+        yield start, frame.iloc[start:start + CHUNK_ROWS]
+
+
+def _steps(report, figures=False):
+    steps = sum(max(1, -(-len(part['frame']) // CHUNK_ROWS)) for part in report['sections'])
+    if figures:
+        steps += sum(part['chart'] is not None for part in report['sections'])
+    return steps
+
+
+def write_parquet(report, path, progress):
+    """Zip-архив с Parquet-файлом на каждый раздел; строки пишутся группами."""
+    total, done = _steps(report), 0
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for part in report['sections']:
+            with archive.open(f"{part['sheet']}.parquet", 'w') as handle:
+                schema = pa.Schema.from_pandas(part['frame'], preserve_index=False)
+                with pq.ParquetWriter(handle, schema) as writer:
+                    for _, chunk in _chunks(part['frame']):
+                        writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                        done += 1
+                        progress(done / total, part['sheet'])
+
+
+def write_excel(report, path, progress):
+    """Книга Excel: лист на раздел, строки дописываются порциями."""
+    import pandas as pd
+
+    total, done = _steps(report), 0
+    with pd.ExcelWriter(path, engine=EXCEL_ENGINE) as writer:
+        for part in report['sections']:
+            for start, chunk in _chunks(part['frame']):
+                chunk.to_excel(writer, sheet_name=part['sheet'][:31], index=False,
+                               header=start == 0, startrow=start + 1 if start else 0)
+                done += 1
+                progress(done / total, part['sheet'])
+
+
+def write_html(report, path, progress):
+    """Самодостаточная HTML-страница: plotly.js встроен один раз, таблицы -- порциями."""
+    from rosstat.reports import chart_figure
+
+    total, done = _steps(report, figures=True), 0
+    plotlyjs = True
+    with open(path, 'w', encoding='utf-8') as handle:
+        handle.write(f'<!DOCTYPE html>\n<html lang="ru"><head><meta charset="utf-8">'
+                     f'<title>{html.escape(report["title"])}</title>'
+                     '<style>body{font-family:sans-serif;margin:2rem}table{border-collapse:collapse}'
+                     'td,th{border:1px solid #ddd;padding:4px 8px;text-align:right}</style></head><body>\n'
+                     f'<h1>{html.escape(report["title"])}</h1>\n')
+        for part in report['sections']:
+            handle.write(f'<h2>{html.escape(part["title"])}</h2>\n')
+            if part['chart'] is not None:
+                handle.write(chart_figure(part).to_html(full_html=False, include_plotlyjs=plotlyjs))
+                plotlyjs = False
+                done += 1
+                progress(done / total, part['sheet'])
+            frame = part['frame']
+            handle.write('<table><thead><tr>'
+                         + ''.join(f'<th>{html.escape(str(column))}</th>' for column in frame.columns)
+                         + '</tr></thead><tbody>\n')
+            for _, chunk in _chunks(frame):
+                cells = chunk.astype(str).map(html.escape).to_numpy()
+                handle.write(''.join('<tr><td>' + '</td><td>'.join(row) + '</td></tr>\n' for row in cells))
+                done += 1
+                progress(done / total, part['sheet'])
+            handle.write('</tbody></table>\n')
+        handle.write('</body></html>\n')
+
+
+WRITERS = {'xlsx': write_excel, 'parquet': write_parquet, 'html': write_html}
+
+
+class ExportJob:
+    def __init__(self, title, fmt, path):
+        self.title = title
+        self.format = fmt
+        self.path = Path(path)
+        self.progress = 0.0
+        self.message = "В очереди"
+        self.error = None
+        self.future = None
+
+    @property
+    def done(self):
+        return self.path.exists() or self.error is not None
+
+    @property
+    def file_name(self):
+        return f"{self.title}.{FORMATS[self.format][1]}"
+
+    @property
+    def mime(self):
+        return FORMATS[self.format][2]
+
+    def open(self):
+        """Файл выгрузки для ``st.download_button`` (читается при скачивании)."""
+        return open(self.path, 'rb')
+
+    def _report(self, fraction, message):
+        self.progress = min(1.0, fraction)
+        self.message = message
+
+    def run(self, report):
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        try:
+            WRITERS[self.format](report, tmp, self._report)
+            os.replace(tmp, self.path)
+            self._report(1.0, "Готово")
+        except Exception as error:
+            tmp.unlink(missing_ok=True)
+            self.error = error
+            self.message = f"Ошибка: {error}"
+
+
+class ExportQueue:
+    def __init__(self, directory, workers=2):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='export')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, report, fmt):
+        """Задание на выгрузку ``report``; повторный запрос возвращает то же задание."""
+        key = hashlib.sha1(repr((report['title'], fmt, report['versions'])).encode('utf-8')).hexdigest()[:16]
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.error is None:
+                return job
+            job = ExportJob(report['title'], fmt, self.directory / f"{key}.{FORMATS[fmt][1]}")
+            self._jobs[key] = job
+            # Файл мог остаться от прошлого запуска -- он уже актуален для этих версий
+            if not job.path.exists():
+                job.future = self._pool.submit(job.run, report)
+            return job
@@ -0,0 +1,98 @@
+"""Общий LRU-кэш Plotly-фигур.
+
+Ключ -- хэш (тип графика, версия данных, фильтры, показатель), значение --
+сериализованный JSON фигуры. Кэш ограничен по памяти: при превышении лимита
+вытесняются давно не использованные фигуры. Повторный просмотр того же
+графика в любой сессии не строит фигуру заново.
+
+С ``disk`` (``rosstat.artifacts.ArtifactCache``) JSON фигуры еще и
+сохраняется на диск: версии в ключе -- хэши содержимого данных, поэтому
+фигуру, построенную одним процессом, берут из файла остальные.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def figure_key(*parts):
+    """Стабильный хэш частей ключа (списки, даты, строки, числа)."""
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+class FigureCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, disk=None):
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Фигура как dict (готова для st.plotly_chart) или None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(entry[0])
+        payload = self.disk.get(key) if self.disk is not None else None
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, payload)
+        return json.loads(payload)
+
+    def __contains__(self, key):
+        # Проверка без учета в статистике попаданий и без сдвига в LRU
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key, figure):
+        payload = figure.to_json()
+        if self.disk is not None:
+            self.disk.put(key, payload)
+        with self._lock:
+            self._store(key, payload)
+        return json.loads(payload)
+
+    def _store(self, key, payload):
+        # Вызывается под self._lock
+        size = len(payload.encode('utf-8'))
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        if size <= self.max_bytes:
+            self._entries[key] = (payload, size)
+            self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    def get_or_build(self, key, build):
+        figure = self.get(key)
+        if figure is None:
+            figure = self.put(key, build())
+        return figure
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -0,0 +1,162 @@
+"""Сезонная декомпозиция и краткосрочный прогноз всех рядов СберИндекса.
+
+Все ряды обрабатываются одним массивом регион × показатель × месяц:
+
+- тренд -- центрированное скользящее среднее 2×12 (окна через
+  ``sliding_window_view``, свертка с весами по последней оси);
+- сезонность -- средний отклоненный от тренда уровень по календарному
+  месяцу, центрированный к нулевой сумме за год;
+- остаток -- ряд без тренда и сезонности;
+- прогноз на ``HORIZON`` месяцев -- прямая МНК по последним ``FIT_WINDOW``
+  месяцам ряда без сезонности плюс сезонность, с интервалом по остаткам
+  прямой. Коэффициенты всех прямых считаются закрытой формулой по суммам.
+
+Отдельные ряды нигде не подгоняются в цикле.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from rosstat import instrument
+
+PERIOD = 12
+HORIZON = 6
+FIT_WINDOW = 24
+# Квантиль нормального распределения для 95% интервала
+Z95 = 1.96
+
+COMPONENTS = {'observed': "Ряд", 'trend': "Тренд", 'seasonal': "Сезонность", 'resid': "Остаток"}
+
+
+def moving_trend(values):
+    """Центрированное скользящее среднее 2×PERIOD по последней оси (края -- NaN)."""
+    weights = np.r_[0.5, np.ones(PERIOD - 1), 0.5] / PERIOD
+    trend = np.full(values.shape, np.nan)
+    if values.shape[-1] > PERIOD:
+        windows = np.lib.stride_tricks.sliding_window_view(values, PERIOD + 1, axis=-1)
+        trend[..., PERIOD // 2:-(PERIOD // 2)] = windows @ weights
+    return trend
+
+
+def seasonal_profile(detrended):
+    """Сезонная поправка по календарному месяцу с нулевой суммой за год (…, PERIOD)."""
+    length = detrended.shape[-1]
+    padded = np.full(detrended.shape[:-1] + (-(-length // PERIOD) * PERIOD,), np.nan)
+    padded[..., :length] = detrended
+    # Месяцы без данных дают NaN, а не предупреждение о пустом срезе
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        profile = np.nanmean(padded.reshape(detrended.shape[:-1] + (-1, PERIOD)), axis=-2)
+        return profile - np.nanmean(profile, axis=-1, keepdims=True)
+
+
+def _line_fit(values, times):
+    """МНК-прямые по последней оси с пропусками: (наклон, сдвиг, σ остатков, n, t̄, Sxx)."""
+    mask = ~np.isnan(values)
+    n = mask.sum(axis=-1)
+    y = np.where(mask, values, 0)
+    t = np.where(mask, times, 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t_mean = t.sum(axis=-1) / n
+        y_mean = y.sum(axis=-1) / n
+        dt = np.where(mask, times - t_mean[..., None], 0)
+        sxx = (dt * dt).sum(axis=-1)
+        slope = (dt * (y - y_mean[..., None] * mask)).sum(axis=-1) / sxx
+        intercept = y_mean - slope * t_mean
+        resid = np.where(mask, values - intercept[..., None] - slope[..., None] * times, 0)
+        sigma = np.sqrt((resid * resid).sum(axis=-1) / (n - 2))
+    return slope, intercept, sigma, n, t_mean, sxx
+
+
+class SeasonalForecast:
+    def __init__(self, values, dates, regions, metrics, horizon=HORIZON):
+        """``values`` -- массив регион × показатель × месяц, ``dates`` -- концы месяцев.
+
+        Первый месяц ``dates`` -- январь: номер календарного месяца равен ``t % PERIOD``.
+        """
+        self.regions = list(regions)
+        self.metrics = list(metrics)
+        self._pos = {region: i for i, region in enumerate(self.regions)}
+        self.dates = pd.DatetimeIndex(dates)
+        self.observed = np.asarray(values, dtype=float)
+
+        length = self.observed.shape[-1]
+        self.trend = moving_trend(self.observed)
+        profile = seasonal_profile(self.observed - self.trend)
+        self.seasonal = np.take(profile, np.arange(length) % PERIOD, axis=-1)
+        self.resid = self.observed - self.trend - self.seasonal
+
+        # Прогноз: прямая по последним FIT_WINDOW месяцам ряда без сезонности
+        times = np.arange(length, dtype=float)
+        start = max(0, length - FIT_WINDOW)
+        adjusted = (self.observed - np.nan_to_num(self.seasonal))[..., start:]
+        slope, intercept, sigma, n, t_mean, sxx = _line_fit(adjusted, times[start:])
+        future = np.arange(length, length + horizon, dtype=float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            spread = Z95 * sigma[..., None] * np.sqrt(
+                1 + 1 / n[..., None] + (future - t_mean[..., None]) ** 2 / sxx[..., None])
+        self.forecast = intercept[..., None] + slope[..., None] * future \
+            + np.nan_to_num(np.take(profile, future.astype(int) % PERIOD, axis=-1))
+        self.lower = self.forecast - spread
+        self.upper = self.forecast + spread
+        # Концы месяцев как в rosstat.synthetic: 'MS' + MonthEnd работает в любой версии pandas
+        self.future_dates = pd.date_range(self.dates[-1] + pd.offsets.MonthBegin(1), periods=horizon, freq='MS') \
+            + pd.offsets.MonthEnd(0) if len(self.dates) else pd.DatetimeIndex([])
+
+    def _rows(self, regions):
+        return [self._pos[region] for region in regions if region in self._pos]
+
+    @instrument.timed('aggregate')
+    def components(self, regions, metric):
+        """Компоненты ряда ``metric`` по регионам (Регион, Дата, Компонента, Значение)."""
+        rows, k = self._rows(regions), self.metrics.index(metric)
+        parts = [getattr(self, name)[rows, k] for name in COMPONENTS]
+        values = np.stack(parts, axis=1)
+        region_idx, part_idx, time_idx = np.nonzero(~np.isnan(values))
+        return pd.DataFrame({
+            'Регион': np.array(self.regions, dtype=object)[np.array(rows, dtype=int)[region_idx]],
+            'Дата': self.dates[time_idx],
+            'Компонента': pd.Categorical.from_codes(part_idx, categories=list(COMPONENTS.values())),
+            'Значение': values[region_idx, part_idx, time_idx],
+        })
+
+    @instrument.timed('aggregate')
+    def prediction(self, regions, metric):
+        """Прогноз ``metric`` с 95% интервалом (Регион, Дата, Прогноз, Нижняя_граница, Верхняя_граница)."""
+        rows, k = self._rows(regions), self.metrics.index(metric)
+        forecast = self.forecast[rows, k]
+        region_idx, time_idx = np.nonzero(~np.isnan(forecast))
+        return pd.DataFrame({
+            'Регион': np.array(self.regions, dtype=object)[np.array(rows, dtype=int)[region_idx]],
+            'Дата': self.future_dates[time_idx],
+            'Прогноз': forecast[region_idx, time_idx],
+            'Нижняя_граница': self.lower[rows, k][region_idx, time_idx],
+            'Верхняя_граница': self.upper[rows, k][region_idx, time_idx],
+        })
+
+
+def forecast_figure(history, prediction, metric, title):
+    """Последние месяцы ряда, прогноз пунктиром и 95% интервал для каждого региона."""
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    figure = go.Figure()
+    colors = px.colors.qualitative.Plotly
+    for i, (region, past) in enumerate(history.groupby('Регион', sort=False)):
+        color = colors[i % len(colors)]
+        future = prediction[prediction['Регион'] == region]
+        figure.add_scatter(x=past['Дата'], y=past['Значение'], name=region, legendgroup=region,
+                           line_color=color)
+        if len(future):
+            figure.add_scatter(x=np.r_[future['Дата'], future['Дата'][::-1]],
+                               y=np.r_[future['Верхняя_граница'], future['Нижняя_граница'][::-1]],
+                               fill='toself', fillcolor=color, opacity=0.2, line_width=0,
+                               legendgroup=region, showlegend=False, hoverinfo='skip')
+            # Прогноз продолжает последнюю точку ряда
+            figure.add_scatter(x=np.r_[past['Дата'].iloc[-1:], future['Дата']],
+                               y=np.r_[past['Значение'].iloc[-1:], future['Прогноз']],
+                               line=dict(color=color, dash='dash'), legendgroup=region,
+                               name=f"{region} (прогноз)", showlegend=False)
+    return figure.update_layout(title=title, yaxis_title=metric, height=500)
@@ -0,0 +1,166 @@
+"""Геометрия регионов для картограмм.
+
+Границы читаются из GeoJSON (``ROSSTAT_GEOJSON`` или поставляемая с
+приложением схематическая сетка ``geodata/regions.geojson``) и заранее
+упрощаются до нескольких уровней детализации: Дуглас -- Пекер с допуском
+от размера карты, затем квантование координат на сетку ``2**bits`` и
+удаление совпавших точек. Уровень выбирается по охвату показываемых
+регионов: обзор всей страны не тянет полные границы, которые для РФ
+занимают десятки мегабайт.
+
+Кольца ориентируются по часовой стрелке, как ожидает d3-geo в Plotly
+(в RFC 7946 наоборот), иначе полигон закрашивает весь мир.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from rosstat import store
+
+GEOJSON = Path(os.environ.get('ROSSTAT_GEOJSON', Path(__file__).resolve().parent / 'geodata' / 'regions.geojson'))
+NAME_PROPERTY = 'name'
+
+# Уровни детализации: (название, допуск в долях размера карты, бит квантования)
+LEVELS = [
+    ("Обзор", 1 / 400, 11),
+    ("Округа", 1 / 1500, 13),
+    ("Регионы", 1 / 6000, 15),
+]
+
+
+def version(path=GEOJSON):
+    """Хэш содержимого файла границ: одинаковый у всех процессов с тем же файлом."""
+    return store.file_hash(path)
+
+
+def read_regions(path=GEOJSON):
+    """Регион -> список полигонов, полигон -- список колец (массивы N × 2)."""
+    with open(path, encoding='utf-8') as handle:
+        collection = json.load(handle)
+    regions = {}
+    for feature in collection['features']:
+        geometry = feature['geometry']
+        polygons = geometry['coordinates'] if geometry['type'] == 'MultiPolygon' else [geometry['coordinates']]
+        regions.setdefault(feature['properties'][NAME_PROPERTY], []).extend(
+            [np.asarray(ring, dtype=float)[:, :2] for ring in polygon] for polygon in polygons)
+    return regions
+
+
+def bounds(regions, names=None):
+    """Охват (xmin, ymin, xmax, ymax) регионов ``names`` (всех, если None)."""
+    points = np.concatenate([polygon[0] for name, polygons in regions.items()
+                             if names is None or name in names for polygon in polygons])
+    return (*points.min(axis=0), *points.max(axis=0))
+
+
+def level_for(regions, names=None):
+    """Номер уровня LEVELS по доле, которую охват ``names`` занимает от всей карты."""
+    full = bounds(regions)
+    part = bounds(regions, names)
+    share = max((part[2] - part[0]) / (full[2] - full[0]), (part[3] - part[1]) / (full[3] - full[1]))
+    if share > 0.5:
+        return 0
+    return 1 if share > 0.15 else 2
+
+
+def _douglas_peucker(points, tolerance):
+    """Маска точек открытой линии, которые остаются после упрощения."""
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, end = points[first], points[last]
+        inner = points[first + 1:last]
+        segment = end - start
+        length = np.hypot(*segment)
+        if length == 0:
+            distance = np.hypot(*(inner - start).T)
+        else:
+            offset = inner - start
+            distance = np.abs(segment[0] * offset[:, 1] - segment[1] * offset[:, 0]) / length
+        farthest = int(distance.argmax())
+        if distance[farthest] > tolerance:
+            middle = first + 1 + farthest
+            keep[middle] = True
+            stack += [(first, middle), (middle, last)]
+    return keep
+
+
+def simplify_ring(ring, tolerance):
+    """Упрощенное замкнутое кольцо или None, если оно выродилось."""
+    if len(ring) <= 4:
+        return ring
+    # Кольцо делится на две линии: от первой точки до самой дальней от нее и обратно
+    far = int(np.hypot(*(ring - ring[0]).T).argmax())
+    if far == 0:
+        return None
+    keep = np.concatenate([_douglas_peucker(ring[:far + 1], tolerance)[:-1],
+                           _douglas_peucker(ring[far:], tolerance)])
+    ring = ring[keep]
+    return ring if len(ring) >= 4 else None
+
+
+def _area(ring):
+    x, y = ring[:, 0], ring[:, 1]
+    return (np.dot(x[:-1], y[1:]) - np.dot(x[1:], y[:-1])) / 2
+
+
+def quantize(ring, origin, step):
+    """Кольцо на сетке с шагом ``step``; подряд совпавшие точки удаляются."""
+    grid = np.round((ring - origin) / step).astype(np.int64)
+    distinct = np.ones(len(grid), dtype=bool)
+    distinct[1:] = (np.diff(grid, axis=0) != 0).any(axis=1)
+    return grid[distinct] * step + origin
+
+
+def simplify(regions, level):
+    """FeatureCollection уровня ``level`` и число точек в ней."""
+    _, share, bits = LEVELS[level]
+    xmin, ymin, xmax, ymax = bounds(regions)
+    size = max(xmax - xmin, ymax - ymin)
+    tolerance = size * share
+    step = size / 2 ** bits
+    origin = np.array([xmin, ymin])
+    digits = max(0, int(np.ceil(-np.log10(step))))
+
+    features, points = [], 0
+    for name, polygons in regions.items():
+        kept = []
+        for polygon in polygons:
+            rings = []
+            for i, ring in enumerate(polygon):
+                ring = simplify_ring(quantize(ring, origin, step), tolerance)
+                if ring is None or abs(_area(ring)) < step * step:
+                    # Выродившееся внешнее кольцо убирает весь полигон (мелкий остров)
+                    if i == 0:
+                        break
+                    continue
+                # Внешнее кольцо -- по часовой стрелке, дыры -- против
+                if (_area(ring) < 0) != (i == 0):
+                    ring = ring[::-1]
+                rings.append(np.round(ring, digits).tolist())
+            if rings:
+                kept.append(rings)
+                points += sum(map(len, rings))
+        if not kept:
+            # Регион не должен пропадать с карты: оставляем самый крупный полигон как есть
+            largest = max(polygons, key=lambda polygon: abs(_area(polygon[0])))
+            ring = largest[0] if _area(largest[0]) < 0 else largest[0][::-1]
+            kept = [[np.round(ring, digits).tolist()]]
+            points += len(ring)
+        features.append({'type': 'Feature', 'id': name, 'properties': {NAME_PROPERTY: name},
+                         'geometry': {'type': 'MultiPolygon', 'coordinates': kept}})
+    return {'type': 'FeatureCollection', 'features': features}, points
+
+
+def subset(collection, names):
+    """Только регионы ``names`` (списки координат общие с ``collection``)."""
+    names = set(names)
+    return {'type': 'FeatureCollection', 'features': [feature for feature in collection['features']
+                                                      if feature['id'] in names]}
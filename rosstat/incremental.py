@@ -0,0 +1,44 @@
+"""Производные агрегаты таблицы, которые догоняют дописанные файлы.
+
+Агрегат помнит, из каких файлов хранилища (и с каким mtime) он построен.
+Если с тех пор в таблицу только добавились файлы (``store.append_table``),
+читаются лишь они и применяются через ``update`` к копии агрегата; если
+какой-то файл изменился или исчез, агрегат строится заново. Готовый объект
+после публикации не меняется, поэтому сессии читают его без блокировок.
+"""
+
+import copy
+import threading
+
+from rosstat import schema, store
+
+
+class IncrementalAggregate:
+    def __init__(self, root, name, build, columns=None):
+        self.root = root
+        self.name = name
+        self.build = build
+        self.columns = list(columns) if columns is not None else None
+        self.value = None
+        self.files = {}
+        self.updates = 0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Агрегат, актуальный для текущих файлов таблицы."""
+        state = store.file_state(self.root, self.name)
+        if self.value is not None and state == self.files:
+            return self.value
+        with self._lock:
+            if self.value is not None and state == self.files:
+                return self.value
+            unchanged = all(state.get(path) == mtime for path, mtime in self.files.items())
+            if self.value is None or not unchanged:
+                value = self.build(store.read_table(self.root, self.name, self.columns))
+            else:
+                added = [path for path in state if path not in self.files]
+                frame = schema.compact(self.name, store.read_files(added, self.columns, dictionary=True))
+                value = copy.deepcopy(self.value).update(frame)
+                self.updates += 1
+            self.value, self.files = value, state
+            return value
@@ -0,0 +1,76 @@
+"""Индексы по региону для быстрых фильтров боковой панели.
+
+Таблица один раз сортируется по (ключ, столбец порядка), например
+(Регион, Дата) или (Регион, Население), и для каждого региона запоминается
+диапазон строк. Фильтр по регионам и диапазону значений сводится к
+двоичному поиску и непрерывным срезам, без булевых масок по всей таблице.
+"""
+
+import numpy as np
+import pandas as pd
+
+from rosstat import instrument
+
+
+class SortedFrameIndex:
+    def __init__(self, frame, key, order):
+        self.key = key
+        self.order = order
+        self.frame = frame.sort_values([key, order], kind='stable').reset_index(drop=True)
+        self._order_values = self.frame[order].to_numpy()
+
+        # Границы блоков одного ключа в отсортированной таблице
+        keys = self.frame[key].to_numpy()
+        if len(keys):
+            starts = np.concatenate([[0], np.flatnonzero(keys[1:] != keys[:-1]) + 1])
+        else:
+            starts = np.array([], dtype=np.int64)
+        stops = np.append(starts[1:], len(keys))
+        self.offsets = {keys[start]: (int(start), int(stop)) for start, stop in zip(starts, stops)}
+
+    @property
+    def keys(self):
+        return list(self.offsets)
+
+    def ranges(self, keys, low=None, high=None):
+        """Диапазоны строк [start, stop) для ``keys`` с ``low <= order <= high``."""
+        low, high = _scalar(low), _scalar(high)
+        result = []
+        for key in keys:
+            if key not in self.offsets:
+                continue
+            start, stop = self.offsets[key]
+            block = self._order_values[start:stop]
+            if low is not None:
+                start += int(np.searchsorted(block, low, side='left'))
+                block = self._order_values[start:stop]
+            if high is not None:
+                stop = start + int(np.searchsorted(block, high, side='right'))
+            if stop > start:
+                result.append((start, stop))
+        return result
+
+    def count(self, keys, low=None, high=None):
+        """Число строк под фильтром без материализации."""
+        return sum(stop - start for start, stop in self.ranges(keys, low, high))
+
+    @instrument.timed('filter')
+    def select(self, keys, low=None, high=None, columns=None):
+        """Строки для ``keys`` в диапазоне [low, high] по столбцу порядка."""
+        ranges = self.ranges(keys, low, high)
+        col_idx = slice(None) if columns is None else [self.frame.columns.get_loc(c) for c in columns]
+        if len(ranges) == 1:
+            start, stop = ranges[0]
+            return self.frame.iloc[start:stop, col_idx]
+        if ranges:
+            rows = np.concatenate([np.arange(start, stop) for start, stop in ranges])
+        else:
+            rows = np.array([], dtype=np.int64)
+        return self.frame.iloc[rows, col_idx]
+
+
+def _scalar(value):
+    # Даты приводим к datetime64 для сравнения с массивом столбца
+    if isinstance(value, (pd.Timestamp, np.datetime64)) or hasattr(value, 'isoformat'):
+        return np.datetime64(pd.Timestamp(value), 'ns')
+    return value
@@ -0,0 +1,99 @@
+"""Дописывание новых периодов СберИндекса в хранилище.
+
+Запуск::
+
+    python -m rosstat.ingest новый_месяц.csv       # или .parquet
+    python -m rosstat.ingest --synthetic           # следующий месяц синтетических данных
+
+Новые строки (Регион, Дата) дописываются отдельными файлами в партиции
+``sber_time_series``; уже имеющиеся пары (Регион, Дата) пропускаются.
+Снимок ``sber_index`` получает средние последнего месяца по затронутым
+регионам. Меняются версии только этих двух таблиц: открытые сессии видят
+новый месяц при следующем перезапуске скрипта, а куб и статистики
+дочитывают только новые файлы.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from rosstat import store
+from rosstat.synthetic import next_month
+
+SERIES = 'sber_time_series'
+SNAPSHOT = 'sber_index'
+
+
+def append_series(root, frame):
+    """Дописывает новые строки временного ряда; возвращает их число."""
+    columns = list(store.read_table(root, SERIES, regions=[]).columns)
+    missing = [column for column in columns if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Нет столбцов: {', '.join(missing)}")
+    frame = frame[columns].copy()
+    frame['Дата'] = pd.to_datetime(frame['Дата'])
+    frame = frame.drop_duplicates(['Регион', 'Дата'], keep='last')
+
+    # Уже загруженные (Регион, Дата) не дублируем
+    existing = store.read_table(root, SERIES, columns=['Регион', 'Дата'], regions=list(pd.unique(frame['Регион'])))
+    known = pd.MultiIndex.from_frame(existing)
+    frame = frame[~pd.MultiIndex.from_frame(frame[['Регион', 'Дата']]).isin(known)]
+    if frame.empty:
+        return 0
+
+    store.append_table(root, SERIES, frame)
+    _update_snapshot(root, frame, existing)
+    return len(frame)
+
+
+def _update_snapshot(root, frame, existing):
+    snapshot = store.read_table(root, SNAPSHOT).set_index('Регион')
+    metrics = [column for column in snapshot.columns if column in frame.columns]
+
+    # Последний месяц новых строк по каждому региону, если он не старше загруженного
+    month = frame['Дата'].dt.to_period('M')
+    latest = frame[month == month.groupby(frame['Регион'], observed=True).transform('max')]
+    latest_month = latest.groupby('Регион', observed=True)['Дата'].max().dt.to_period('M')
+    known_month = existing.groupby('Регион', observed=True)['Дата'].max().dt.to_period('M')
+    newer = latest_month.index[latest_month >= known_month.reindex(latest_month.index).fillna(latest_month)]
+    means = latest[latest['Регион'].isin(newer)].groupby('Регион', observed=True)[metrics].mean()
+    if means.empty:
+        return
+
+    # Целые столбцы снимка остаются целыми (средние округляются)
+    dtypes = snapshot.dtypes.to_dict()
+    snapshot = snapshot.reindex(snapshot.index.append(means.index.difference(snapshot.index)))
+    for metric in metrics:
+        values = means[metric]
+        snapshot.loc[means.index, metric] = values.round() if pd.api.types.is_integer_dtype(dtypes[metric]) else values
+    snapshot = snapshot.astype({metric: dtypes[metric] for metric in metrics})
+    store.replace_table(root, SNAPSHOT, snapshot.rename_axis('Регион').reset_index())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', nargs='?', type=Path, help='CSV или Parquet с новыми строками')
+    parser.add_argument('--synthetic', action='store_true', help='сгенерировать следующий месяц')
+    parser.add_argument('--scale', default=os.environ.get('ROSSTAT_SCALE', 'demo'))
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    root = store.default_root(args.scale)
+    if not store.exists(root):
+        raise SystemExit(f'Хранилище {root} не найдено: сначала откройте приложение')
+    if args.synthetic:
+        frame = next_month(store.read_table(root, SERIES), args.seed)
+    elif args.path is not None:
+        frame = pd.read_parquet(args.path) if args.path.suffix == '.parquet' else pd.read_csv(args.path)
+    else:
+        parser.error('укажите файл или --synthetic')
+
+    added = append_series(root, frame)
+    print(f'Добавлено строк: {added}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
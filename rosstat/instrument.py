@@ -0,0 +1,156 @@
+"""Профилирование перезапусков скрипта (включается по запросу).
+
+Профиль собирается на один rerun: время логических участков (загрузка,
+фильтрация, агрегация, построение фигур, отправка в браузер), попадания и
+промахи кэшей Streamlit и размеры передаваемых данных. Без активного
+профиля все обертки сводятся к прямому вызову.
+
+Включение: переменная окружения ``ROSSTAT_DEBUG=1`` или ``?debug=1`` в адресе.
+Каждый профиль пишется в лог ``rosstat.profile`` одной JSON-строкой.
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+
+logger = logging.getLogger('rosstat.profile')
+
+# Профиль текущего rerun; у каждой сессии свой поток скрипта
+_active = contextvars.ContextVar('rosstat_profile', default=None)
+
+CATEGORIES = ('load', 'filter', 'aggregate', 'figure', 'render')
+
+
+class Profile:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.timestamp = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+        self.page = None
+        self.records = []
+        self.cache = defaultdict(lambda: {'calls': 0, 'misses': 0})
+
+    def add(self, name, category, seconds, nbytes=None):
+        self.records.append({'name': name, 'category': category,
+                             'ms': seconds * 1000, 'bytes': nbytes})
+
+    @property
+    def total_ms(self):
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return (end - self.started) * 1000
+
+    def summary(self):
+        """Сводка по участкам: вызовы, суммарное и максимальное время, байты."""
+        if not self.records:
+            return pd.DataFrame(columns=['category', 'name', 'calls', 'total_ms', 'max_ms', 'bytes'])
+        frame = pd.DataFrame(self.records)
+        summary = frame.groupby(['category', 'name'], sort=False).agg(
+            calls=('ms', 'size'), total_ms=('ms', 'sum'), max_ms=('ms', 'max'), bytes=('bytes', 'sum'))
+        return summary.reset_index().sort_values('total_ms', ascending=False, ignore_index=True)
+
+    def cache_summary(self):
+        rows = [{'cache': name, 'calls': stats['calls'], 'misses': stats['misses'],
+                 'hits': stats['calls'] - stats['misses']} for name, stats in self.cache.items()]
+        return pd.DataFrame(rows, columns=['cache', 'calls', 'hits', 'misses'])
+
+    def to_dict(self):
+        return {
+            'timestamp': self.timestamp,
+            'page': self.page,
+            'total_ms': round(self.total_ms, 3),
+            'sections': self.records,
+            'cache': {name: dict(stats) for name, stats in self.cache.items()},
+        }
+
+
+def _configure_logger():
+    # Структурированные записи -- по одной JSON-строке, без префиксов
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def start():
+    _configure_logger()
+    profile = Profile()
+    _active.set(profile)
+    return profile
+
+
+def finish(profile):
+    """Завершает профиль и пишет его в лог как структурированную запись."""
+    profile.finished = time.perf_counter()
+    _active.set(None)
+    logger.info(json.dumps(profile.to_dict(), ensure_ascii=False, default=str))
+    return profile
+
+
+def active():
+    return _active.get()
+
+
+def payload_size(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, (dict, list)):
+        return len(json.dumps(value, default=str).encode('utf-8'))
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    return None
+
+
+@contextmanager
+def section(name, category, nbytes=None):
+    profile = _active.get()
+    if profile is None:
+        yield
+        return
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(name, category, time.perf_counter() - start_time, nbytes)
+
+
+def timed(category, name=None, cache=None):
+    """Декоратор: время вызова, размер результата и (для ``cache``) счетчик обращений."""
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = _active.get()
+            if profile is None:
+                return func(*args, **kwargs)
+            if cache is not None:
+                profile.cache[cache]['calls'] += 1
+            start_time = time.perf_counter()
+            result = func(*args, **kwargs)
+            profile.add(label, category, time.perf_counter() - start_time, payload_size(result))
+            return result
+        return wrapper
+    return decorator
+
+
+def cache_call(name):
+    """Отмечает обращение к кэшу, который не обернут в ``timed``."""
+    profile = _active.get()
+    if profile is not None:
+        profile.cache[name]['calls'] += 1
+
+
+def cache_miss(name):
+    """Отмечает промах кэша; вызывается из тела кэшируемой функции."""
+    profile = _active.get()
+    if profile is not None:
+        profile.cache[name]['misses'] += 1
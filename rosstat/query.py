@@ -0,0 +1,369 @@
+"""Офлайн-планировщик аналитических запросов для страницы «ИИ-Агент».
+
+Вопрос на русском языке разбирается по словарю основ (показатели, регионы,
+тип операции, число, год, ограничение по населению) в детерминированный
+план: ранжирование, динамика, корреляция или значения по регионам. План
+исполняется по уже подготовленным агрегатам слоя данных: top-k индексу
+муниципалитетов, кубу СберИндекса, достаточным статистикам корреляций и
+общим таблицам. Ни внешних моделей, ни сетевых сервисов.
+
+Ответ кэшируется по плану (нормализованному запросу) и версиям таблиц:
+вопросы, которые отличаются только формулировкой, регистром, порядком слов
+или знаками препинания, получают готовый ответ.
+"""
+
+import re
+
+import pandas as pd
+import streamlit as st
+
+from rosstat import instrument
+from rosstat.data import data_version, load_table, series_cube, shared, table_stats, table_topk
+from rosstat.regions import REGION_NAMES
+
+# Основы слов -> показатель (первое совпадение по порядку)
+METRIC_STEMS = [
+    ('зарплат', 'Средняя_зарплата'),
+    ('заработн', 'Средняя_зарплата'),
+    ('населен', 'Население'),
+    ('жител', 'Население'),
+    ('инвест', 'Инвестиции_млрд'),
+    ('предприят', 'Количество_предприятий'),
+    ('оборот', 'Оборот_розничной_торговли_млн'),
+    ('торговл', 'Оборот_розничной_торговли_млн'),
+    ('розниц', 'Оборот_розничной_торговли_млн'),
+    ('потреблен', 'Индекс_потребления'),
+    ('активност', 'Индекс_потребительской_активности'),
+    ('общепит', 'Индекс_транзакций_общепит'),
+    ('ресторан', 'Индекс_транзакций_общепит'),
+    ('одежд', 'Индекс_транзакций_одежда'),
+    ('услуг', 'Индекс_транзакций_услуги'),
+    ('чек', 'Средний_чек'),
+]
+
+# Показатели таблиц, по которым отвечает агент
+TABLE_METRICS = {
+    'regional_data': ['Население', 'Средняя_зарплата', 'Инвестиции_млрд', 'Индекс_потребления'],
+    'municipal_data': ['Население', 'Средняя_зарплата', 'Количество_предприятий',
+                       'Оборот_розничной_торговли_млн', 'Индекс_потребления'],
+    'sber_index': ['Индекс_потребительской_активности', 'Индекс_транзакций_общепит',
+                   'Индекс_транзакций_одежда', 'Индекс_транзакций_услуги', 'Средний_чек'],
+}
+
+# Показатели, для которых есть top-k индекс муниципалитетов (как в отчетах)
+TOPK_METRICS = ['Средняя_зарплата', 'Количество_предприятий', 'Оборот_розничной_торговли_млн']
+
+# Основы слов -> операция
+OPERATION_STEMS = [
+    ('коррел', 'corr'), ('взаимосвяз', 'corr'), ('связ', 'corr'), ('зависим', 'corr'),
+    ('динамик', 'series'), ('тренд', 'series'), ('помесячн', 'series'), ('месяц', 'series'),
+    ('топ', 'rank'), ('top', 'rank'), ('рейтинг', 'rank'), ('лидер', 'rank'), ('лучш', 'rank'),
+    ('сам', 'rank'), ('наибол', 'rank'), ('максим', 'rank'), ('высок', 'rank'),
+    ('худш', 'rank_low'), ('наимен', 'rank_low'), ('миним', 'rank_low'), ('низк', 'rank_low'),
+]
+
+MUNICIPAL_STEMS = ('муниципал', 'город', 'поселен')
+
+# Слова, рядом с которыми «от»/«до» с числом -- ограничение по населению
+POPULATION_STEMS = ('населен', 'жител')
+
+# Слова названий регионов, которые не отличают один регион от другого
+GENERIC_WORDS = {'область', 'край', 'республика', 'ао'}
+
+DEFAULT_K = 10
+MAX_K = 50
+
+EXAMPLES = [
+    "топ-5 регионов по зарплате",
+    "динамика общепита в Татарстане за 2023",
+    "корреляция населения и инвестиций",
+    "10 городов до 100 тыс. жителей с наибольшим оборотом",
+]
+
+
+def normalize(text):
+    """Нижний регистр, ё -> е, без знаков препинания (дефис в словах и дробная часть чисел сохраняются)."""
+    text = text.lower().replace('ё', 'е')
+    text = re.sub(r'(?!(?<=\d)[.,](?=\d))[^\w\s-]|(?<!\w)-|-(?!\w)', ' ', text)
+    return ' '.join(text.split())
+
+
+def _stem(word):
+    if len(word) >= 7:
+        return word[:-2]
+    if len(word) >= 5:
+        return word[:-1]
+    return word
+
+
+def _region_stems():
+    stems = {}
+    for name in REGION_NAMES:
+        words = [word for word in normalize(name).split() if word not in GENERIC_WORDS]
+        stems[name] = [_stem(word) for word in words]
+    return stems
+
+
+REGION_STEMS = _region_stems()
+
+
+def _find_regions(tokens):
+    # Кандидаты -- регионы, все основы которых начинают какие-то слова запроса;
+    # слово отдается региону с самой длинной совпавшей основой
+    candidates = []
+    for name, stems in REGION_STEMS.items():
+        matched = [[i for i, token in enumerate(tokens) if token.startswith(stem)] for stem in stems]
+        if all(matched):
+            candidates.append((sum(map(len, stems)), name, {i for found in matched for i in found}))
+    regions, taken = [], set()
+    for _, name, positions in sorted(candidates, key=lambda item: -item[0]):
+        if not positions & taken:
+            regions.append(name)
+            taken |= positions
+    # Порядок регионов -- как в справочнике, чтобы план не зависел от формулировки
+    return sorted(regions, key=REGION_NAMES.index), taken
+
+
+def _number(value, unit):
+    return int(float(value.replace(',', '.')) * {'тыс': 1_000, 'млн': 1_000_000}.get(unit, 1))
+
+
+def _population_bounds(text):
+    """(низ, верх) населения из «от ... до ...» рядом со словами о населении.
+
+    «до 100 тыс. жителей», «с населением от 50 тыс.», «от 50 до 100 тыс.
+    жителей» (единица диапазона -- у верхней границы); «зарплата до 100 тыс.»
+    ничего не ограничивает.
+    """
+    number = r'(\d+(?:[.,]\d+)?)(?:\s*(тыс|млн)\w*)?'
+    low = high = None
+    for match in re.finditer(rf'\bот\s+{number}(?:\s+до\s+{number})?|\bдо\s+{number}', text):
+        near = text[:match.start()].split()[-2:] + text[match.end():].split()[:2]
+        if not any(token.startswith(POPULATION_STEMS) for token in near):
+            continue
+        first, first_unit, second, second_unit, single, single_unit = match.groups()
+        if first is not None and low is None:
+            low = _number(first, first_unit or second_unit)
+        if high is None and (second or single) is not None:
+            high = _number(second, second_unit) if second is not None else _number(single, single_unit)
+    return low, high
+
+
+def parse(text):
+    """План запроса: словарь с фиксированным набором ключей (ключ кэша ответов)."""
+    text = normalize(text)
+    tokens = text.split()
+    regions, region_tokens = _find_regions(tokens)
+    words = [token for i, token in enumerate(tokens) if i not in region_tokens]
+
+    metrics = []
+    for token in words:
+        for stem, metric in METRIC_STEMS:
+            if token.startswith(stem) and metric not in metrics:
+                metrics.append(metric)
+                break
+
+    operation = None
+    for token in words:
+        for stem, name in OPERATION_STEMS:
+            if token.startswith(stem):
+                # «самые низкие», «наиболее низкая»: направление важнее усилителя ранжирования
+                if operation is None or (operation == 'rank' and name == 'rank_low'):
+                    operation = name
+                break
+
+    municipal = any(token.startswith(MUNICIPAL_STEMS) for token in words)
+    other_metrics = []
+    if any(metric in TABLE_METRICS['sber_index'] for metric in metrics):
+        table = 'sber_index'
+        # Показатели Росстата в вопросе о СберИндексе сохраняются в плане, чтобы
+        # ответ мог сказать, что их не учел
+        other_metrics = [metric for metric in metrics if metric not in TABLE_METRICS['sber_index']]
+        metrics = [metric for metric in metrics if metric in TABLE_METRICS['sber_index']]
+    elif municipal or any(metric not in TABLE_METRICS['regional_data'] for metric in metrics):
+        table = 'municipal_data'
+    else:
+        table = 'regional_data'
+
+    years = sorted({int(year) for year in re.findall(r'\b((?:19|20)\d{2})\b', text)})
+    # Число после «от»/«до» -- граница, а не количество строк
+    numbers = [int(number) for number in
+               re.findall(r'(?<![\d.,])(?<!\bот )(?<!\bдо )(\d{1,2})(?![\d.,]|\s*(?:тыс|млн))', text)]
+    k = min(numbers[0], MAX_K) if numbers else DEFAULT_K
+
+    low, high = _population_bounds(text) if table == 'municipal_data' else (None, None)
+    if (low is not None or high is not None) and 'Население' in metrics and len(metrics) > 1:
+        # «до 100 тыс. жителей» -- ограничение, а не показатель
+        metrics.remove('Население')
+
+    if operation is None:
+        operation = 'value' if regions and table != 'municipal_data' else 'rank'
+    return {
+        'operation': 'rank' if operation == 'rank_low' else operation,
+        'table': table,
+        'metrics': tuple(metrics),
+        'other_metrics': tuple(other_metrics),
+        'regions': tuple(regions),
+        'years': (years[0], years[-1]) if years else None,
+        'k': k,
+        'ascending': operation == 'rank_low',
+        'low': low,
+        'high': high,
+    }
+
+
+def describe(plan):
+    """План словами -- показывается под ответом."""
+    parts = [{'rank': "ранжирование", 'series': "динамика", 'corr': "корреляция",
+              'value': "значения"}[plan['operation']], plan['table']]
+    if plan['metrics']:
+        parts.append(", ".join(plan['metrics']))
+    if plan['regions']:
+        parts.append(", ".join(plan['regions']))
+    if plan['years']:
+        first, last = plan['years']
+        parts.append(str(first) if first == last else f"{first}–{last}")
+    if plan['operation'] == 'rank':
+        parts.append(f"{'первые' if not plan['ascending'] else 'последние'} {plan['k']}")
+    if plan['low'] is not None or plan['high'] is not None:
+        parts.append(f"население {plan['low'] or 0}–{plan['high'] or '∞'}")
+    return " · ".join(parts)
+
+
+def _period(plan):
+    if plan['years'] is None:
+        return None, None
+    first, last = plan['years']
+    return pd.Timestamp(first, 1, 1), pd.Timestamp(last, 12, 31)
+
+
+def _answer(text, table=None, chart=None):
+    return {'text': text, 'table': table, 'chart': chart}
+
+
+def _rank(plan):
+    metric = plan['metrics'][0]
+    k, ascending, regions = plan['k'], plan['ascending'], list(plan['regions']) or None
+    order = "наименьшим" if ascending else "наибольшим"
+    if plan['table'] == 'municipal_data':
+        columns = ['Муниципалитет', 'Регион', 'Население', metric]
+        columns = list(dict.fromkeys(columns))
+        if metric in TOPK_METRICS and not ascending:
+            # Готовый индекс: двоичный поиск по населению и слияние списков узлов
+            result = table_topk('municipal_data', TOPK_METRICS).top(
+                metric, k, high=plan['high'], low=plan['low'], keys=regions, columns=columns)
+        else:
+            frame = load_table('municipal_data', columns=columns, regions=regions)
+            if plan['low'] is not None:
+                frame = frame[frame['Население'] >= plan['low']]
+            if plan['high'] is not None:
+                frame = frame[frame['Население'] <= plan['high']]
+            result = frame.nsmallest(k, metric) if ascending else frame.nlargest(k, metric)
+        label = 'Муниципалитет'
+        title = f"{len(result)} муниципалитетов с {order} значением «{metric}»"
+    else:
+        start, end = _period(plan)
+        if plan['table'] == 'sber_index' and start is not None:
+            # Среднее за период -- из ячеек куба
+            frame = series_cube().extremes(regions, metric, start, end).rename(columns={'Среднее': metric})
+        else:
+            frame = load_table(plan['table'], columns=['Регион', metric])
+            if regions is not None:
+                frame = frame[frame['Регион'].isin(regions)]
+        result = frame.nsmallest(k, metric) if ascending else frame.nlargest(k, metric)
+        label = 'Регион'
+        title = f"{len(result)} регионов с {order} значением «{metric}»"
+    result = result.reset_index(drop=True)
+    result['Регион'] = result['Регион'].astype(str)
+    chart = {'kind': 'bar', 'x': label, 'y': metric, 'color': 'Регион'}
+    return _answer(title, result, chart)
+
+
+def _series(plan):
+    metric = plan['metrics'][0]
+    if plan['table'] != 'sber_index':
+        return _answer(f"Помесячная динамика есть только для показателей СберИндекса, а «{metric}» -- "
+                       f"годовой показатель. Попробуйте, например: «{EXAMPLES[1]}».")
+    start, end = _period(plan)
+    cube = series_cube()
+    if plan['regions']:
+        frame = cube.monthly(list(plan['regions']), metric, start, end)
+        color = 'Регион'
+    else:
+        frame = cube.rollup(metric, start=start, end=end)
+        color = 'Группа'
+    if not len(frame):
+        return _answer("Нет данных за выбранный период.")
+    summary = frame.groupby(color, sort=False)[metric].agg(['first', 'last', 'min', 'max'])
+    lines = [f"- {name}: {row['first']:.1f} → {row['last']:.1f} (мин. {row['min']:.1f}, макс. {row['max']:.1f})"
+             for name, row in summary.iterrows()]
+    text = f"Динамика «{metric}» по месяцам:\n" + "\n".join(lines)
+    return _answer(text, frame, {'kind': 'line', 'x': 'Дата', 'y': metric, 'color': color})
+
+
+def _corr(plan):
+    if plan['other_metrics']:
+        return _answer("Корреляция между показателями разных таблиц не поддерживается: "
+                       f"«{plan['metrics'][0]}» -- показатель СберИндекса, «{plan['other_metrics'][0]}» -- "
+                       "Росстата. Назовите два показателя одного источника, например: "
+                       f"«{EXAMPLES[2]}».")
+    if len(plan['metrics']) < 2:
+        return _answer("Для корреляции назовите два показателя, например: "
+                       f"«{EXAMPLES[2]}».")
+    x, y = plan['metrics'][:2]
+    table = 'sber_time_series' if plan['table'] == 'sber_index' else plan['table']
+    stats = table_stats(table, TABLE_METRICS[plan['table']])
+    value = stats.pearson(x, y, list(plan['regions']) or None)
+    if pd.isna(value):
+        return _answer("Недостаточно данных для расчета корреляции.")
+    strength = "слабая" if abs(value) < 0.3 else "умеренная" if abs(value) < 0.7 else "сильная"
+    scope = ", ".join(plan['regions']) if plan['regions'] else "все регионы"
+    return _answer(f"Коэффициент корреляции Пирсона между «{x}» и «{y}» ({scope}): "
+                   f"**{value:.3f}** -- {strength} {'прямая' if value >= 0 else 'обратная'} связь.")
+
+
+def _value(plan):
+    metrics = list(plan['metrics']) or TABLE_METRICS[plan['table']]
+    start, end = _period(plan)
+    regions = list(plan['regions'])
+    if plan['table'] == 'sber_index' and start is not None:
+        frames = [series_cube().extremes(regions, metric, start, end)[['Регион', 'Среднее']]
+                  .rename(columns={'Среднее': metric}).set_index('Регион') for metric in metrics]
+        result = pd.concat(frames, axis=1).reset_index()
+    else:
+        frame = load_table(plan['table'], columns=['Регион', *metrics])
+        result = frame[frame['Регион'].isin(regions)].reset_index(drop=True)
+    result['Регион'] = result['Регион'].astype(str)
+    return _answer(f"Значения показателей: {', '.join(regions)}", result)
+
+
+OPERATIONS = {'rank': _rank, 'series': _series, 'corr': _corr, 'value': _value}
+
+
+def execute(plan):
+    """Исполняет план по подготовленным агрегатам: {'text', 'table', 'chart'}."""
+    if not plan['metrics'] and plan['operation'] != 'value':
+        return _answer("Не удалось определить показатель. Примеры вопросов:\n"
+                       + "\n".join(f"- {example}" for example in EXAMPLES))
+    return OPERATIONS[plan['operation']](plan)
+
+
+def plan_tables(plan):
+    """Таблицы, от которых зависит ответ (для версии в ключе кэша)."""
+    if plan['table'] == 'sber_index':
+        return ('sber_index', 'sber_time_series')
+    return (plan['table'],)
+
+
+@st.cache_data(max_entries=256)
+@shared
+def _cached_answer(plan, versions):
+    instrument.cache_miss('agent_answer')
+    return execute(plan)
+
+
+@instrument.timed('aggregate', cache='agent_answer')
+def answer(text):
+    """Ответ на вопрос ``text`` и его план; повторные вопросы берутся из кэша."""
+    plan = parse(text)
+    return plan, _cached_answer(plan, data_version(*plan_tables(plan)))
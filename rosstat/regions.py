@@ -0,0 +1,108 @@
+"""Справочник субъектов РФ с федеральными округами.
+
+Первые 12 регионов совпадают с исходным демонстрационным набором и идут
+в том же порядке, поэтому демо-масштаб генератора берет их префикс.
+"""
+
+# (Регион, Федеральный округ)
+REGIONS = [
+    ('Москва', 'Центральный'),
+    ('Санкт-Петербург', 'Северо-Западный'),
+    ('Владимирская область', 'Центральный'),
+    ('Краснодарский край', 'Южный'),
+    ('Свердловская область', 'Уральский'),
+    ('Новосибирская область', 'Сибирский'),
+    ('Татарстан', 'Приволжский'),
+    ('Калининградская область', 'Северо-Западный'),
+    ('Нижегородская область', 'Приволжский'),
+    ('Приморский край', 'Дальневосточный'),
+    ('Хабаровский край', 'Дальневосточный'),
+    ('Тюменская область', 'Уральский'),
+    # Центральный ФО
+    ('Белгородская область', 'Центральный'),
+    ('Брянская область', 'Центральный'),
+    ('Воронежская область', 'Центральный'),
+    ('Ивановская область', 'Центральный'),
+    ('Калужская область', 'Центральный'),
+    ('Костромская область', 'Центральный'),
+    ('Курская область', 'Центральный'),
+    ('Липецкая область', 'Центральный'),
+    ('Московская область', 'Центральный'),
+    ('Орловская область', 'Центральный'),
+    ('Рязанская область', 'Центральный'),
+    ('Смоленская область', 'Центральный'),
+    ('Тамбовская область', 'Центральный'),
+    ('Тверская область', 'Центральный'),
+    ('Тульская область', 'Центральный'),
+    ('Ярославская область', 'Центральный'),
+    # Северо-Западный ФО
+    ('Карелия', 'Северо-Западный'),
+    ('Коми', 'Северо-Западный'),
+    ('Архангельская область', 'Северо-Западный'),
+    ('Ненецкий АО', 'Северо-Западный'),
+    ('Вологодская область', 'Северо-Западный'),
+    ('Ленинградская область', 'Северо-Западный'),
+    ('Мурманская область', 'Северо-Западный'),
+    ('Новгородская область', 'Северо-Западный'),
+    ('Псковская область', 'Северо-Западный'),
+    # Южный ФО
+    ('Адыгея', 'Южный'),
+    ('Калмыкия', 'Южный'),
+    ('Крым', 'Южный'),
+    ('Астраханская область', 'Южный'),
+    ('Волгоградская область', 'Южный'),
+    ('Ростовская область', 'Южный'),
+    ('Севастополь', 'Южный'),
+    # Северо-Кавказский ФО
+    ('Дагестан', 'Северо-Кавказский'),
+    ('Ингушетия', 'Северо-Кавказский'),
+    ('Кабардино-Балкария', 'Северо-Кавказский'),
+    ('Карачаево-Черкесия', 'Северо-Кавказский'),
+    ('Северная Осетия', 'Северо-Кавказский'),
+    ('Чечня', 'Северо-Кавказский'),
+    ('Ставропольский край', 'Северо-Кавказский'),
+    # Приволжский ФО
+    ('Башкортостан', 'Приволжский'),
+    ('Марий Эл', 'Приволжский'),
+    ('Мордовия', 'Приволжский'),
+    ('Удмуртия', 'Приволжский'),
+    ('Чувашия', 'Приволжский'),
+    ('Пермский край', 'Приволжский'),
+    ('Кировская область', 'Приволжский'),
+    ('Оренбургская область', 'Приволжский'),
+    ('Пензенская область', 'Приволжский'),
+    ('Самарская область', 'Приволжский'),
+    ('Саратовская область', 'Приволжский'),
+    ('Ульяновская область', 'Приволжский'),
+    # Уральский ФО
+    ('Курганская область', 'Уральский'),
+    ('Челябинская область', 'Уральский'),
+    ('Ханты-Мансийский АО', 'Уральский'),
+    ('Ямало-Ненецкий АО', 'Уральский'),
+    # Сибирский ФО
+    ('Республика Алтай', 'Сибирский'),
+    ('Тыва', 'Сибирский'),
+    ('Хакасия', 'Сибирский'),
+    ('Алтайский край', 'Сибирский'),
+    ('Красноярский край', 'Сибирский'),
+    ('Иркутская область', 'Сибирский'),
+    ('Кемеровская область', 'Сибирский'),
+    ('Омская область', 'Сибирский'),
+    ('Томская область', 'Сибирский'),
+    # Дальневосточный ФО
+    ('Бурятия', 'Дальневосточный'),
+    ('Якутия', 'Дальневосточный'),
+    ('Забайкальский край', 'Дальневосточный'),
+    ('Камчатский край', 'Дальневосточный'),
+    ('Амурская область', 'Дальневосточный'),
+    ('Магаданская область', 'Дальневосточный'),
+    ('Сахалинская область', 'Дальневосточный'),
+    ('Еврейская АО', 'Дальневосточный'),
+    ('Чукотский АО', 'Дальневосточный'),
+]
+
+REGION_NAMES = [name for name, _ in REGIONS]
+FEDERAL_DISTRICTS = dict(REGIONS)
+
+# Города федерального значения делятся на районы, а не на города
+FEDERAL_CITIES = ('Москва', 'Санкт-Петербург', 'Севастополь')
@@ -0,0 +1,160 @@
+"""Готовые отчеты как материализованные представления.
+
+Каждый отчет -- набор разделов: таблица, подпись и (необязательно) график.
+Отчет строится по общим агрегатам слоя данных и хранится в
+``st.cache_resource`` и общем дисковом кэше с ключом по версиям исходных
+таблиц, поэтому пересчитывается только после обновления данных. Страница отчетов и
+выгрузка в файлы (``rosstat.export``) используют один и тот же экземпляр.
+"""
+
+import numpy as np
+import streamlit as st
+
+from rosstat import instrument
+from rosstat.comparison import normalized
+from rosstat.data import data_version, load_table, open_store, series_cube, shared, table_index, table_topk
+from rosstat.downsample import downsample
+
+# Показатели, по которым строится топ муниципалитетов
+TOP_METRICS = ['Средняя_зарплата', 'Количество_предприятий', 'Оборот_розничной_торговли_млн']
+TOP_COLUMNS = ['Муниципалитет', 'Регион', 'Население', 'Средняя_зарплата',
+               'Количество_предприятий', 'Оборот_розничной_торговли_млн']
+TOP_SHEETS = {'Средняя_зарплата': 'Зарплата', 'Количество_предприятий': 'Предприятия',
+              'Оборот_розничной_торговли_млн': 'Оборот'}
+
+# Порог «малого» города и веса составных индексов
+SMALL_TOWN_POPULATION = 100_000
+INVESTMENT_WEIGHTS = {
+    'Инвестиции_на_душу_руб': 0.4,
+    'Средняя_зарплата': 0.25,
+    'Индекс_потребительской_активности': 0.2,
+    'Индекс_потребления': 0.15,
+}
+POTENTIAL_FACTORS = ['Предприятий_на_1000_жителей', 'Оборот_на_душу_руб', 'Зарплата_к_региону',
+                     'Индекс_потребления']
+
+
+def section(sheet, title, frame, chart=None, table=True):
+    """Раздел отчета: лист выгрузки ``sheet``, заголовок, таблица и график."""
+    return {'sheet': sheet, 'title': title, 'frame': frame, 'chart': chart, 'table': table}
+
+
+def top_municipalities():
+    topk = table_topk('municipal_data', TOP_METRICS)
+    sections = []
+    for metric in TOP_METRICS:
+        frame = topk.top(metric, 10, high=SMALL_TOWN_POPULATION, columns=TOP_COLUMNS).reset_index(drop=True)
+        sections.append(section(f"Топ-10 {TOP_SHEETS[metric]}",
+                                f"Топ-10 муниципалитетов до 100 тыс. человек по показателю {metric}", frame,
+                                {'kind': 'bar', 'x': 'Муниципалитет', 'y': metric, 'color': 'Регион'}))
+    return sections
+
+
+def consumer_activity():
+    metric = 'Индекс_потребительской_активности'
+    sber_index = load_table('sber_index', columns=['Регион', metric])
+    regions = sber_index.sort_values(metric, ascending=False)['Регион'].head(5).tolist()
+    cube = series_cube()
+    # Годы -- имена столбцов выгрузки, поэтому строки
+    yearly = cube.year_over_year(regions, metric)
+    return [
+        section("Динамика", "Динамика потребительской активности в топ-5 регионах",
+                cube.monthly(regions, metric),
+                {'kind': 'line', 'x': 'Дата', 'y': metric, 'color': 'Регион', 'downsample': True}, table=False),
+        section("Год к году", "Изменение к предыдущему году, %",
+                yearly.pivot(index='Регион', columns='Год', values='Изменение_%').dropna(axis=1, how='all')
+                .round(2).reindex(regions).rename(columns=str).reset_index()),
+        section("Федеральные округа", "Потребительская активность по федеральным округам",
+                cube.rollup(metric, by='Федеральный округ'),
+                {'kind': 'line', 'x': 'Дата', 'y': metric, 'color': 'Федеральный округ'}, table=False),
+    ]
+
+
+def investment_attractiveness():
+    regional = load_table('regional_data')
+    activity = load_table('sber_index', columns=['Регион', 'Индекс_потребительской_активности'])
+    frame = regional.merge(activity, on='Регион', how='left')
+    frame = frame.assign(
+        Инвестиции_на_душу_руб=frame['Инвестиции_млрд'].astype(float) * 1e9 / frame['Население'])
+    # Индекс -- взвешенная сумма показателей в процентах от максимума
+    weights = np.array(list(INVESTMENT_WEIGHTS.values()))
+    scores = np.nan_to_num(normalized(frame, INVESTMENT_WEIGHTS)) @ weights
+    frame = frame.assign(Индекс_привлекательности=scores.round(1))
+    frame = frame.sort_values('Индекс_привлекательности', ascending=False, ignore_index=True)
+    frame['Регион'] = frame['Регион'].astype(str)
+    columns = ['Регион', 'Индекс_привлекательности', *INVESTMENT_WEIGHTS, 'Население', 'Инвестиции_млрд']
+    return [
+        section("Рейтинг", "Индекс инвестиционной привлекательности (0-100)", frame[columns],
+                {'kind': 'bar', 'x': 'Регион', 'y': 'Индекс_привлекательности', 'color': 'Регион'}),
+        section("Инвестиции и зарплата", "Инвестиции на душу населения и средняя зарплата", frame[columns],
+                {'kind': 'scatter', 'x': 'Инвестиции_на_душу_руб', 'y': 'Средняя_зарплата', 'color': 'Регион',
+                 'size': 'Население'}, table=False),
+    ]
+
+
+def small_towns():
+    municipal = table_index('municipal_data').frame
+    # Зарплата сравнивается со средней по всем муниципалитетам своего региона
+    regional_salary = municipal.groupby('Регион', observed=True)['Средняя_зарплата'].transform('mean')
+    population = municipal['Население'].astype(float)
+    frame = municipal.assign(
+        Предприятий_на_1000_жителей=municipal['Количество_предприятий'] / population * 1000,
+        Оборот_на_душу_руб=municipal['Оборот_розничной_торговли_млн'].astype(float) * 1e6 / population,
+        Зарплата_к_региону=municipal['Средняя_зарплата'] / regional_salary,
+    )
+    frame = frame[frame['Население'] < SMALL_TOWN_POPULATION]
+    # Потенциал -- средний процентильный ранг факторов среди малых городов
+    ranks = frame[POTENTIAL_FACTORS].rank(pct=True)
+    frame = frame.assign(Потенциал=(ranks.mean(axis=1) * 100).round(1))
+    top = frame.nlargest(20, 'Потенциал').reset_index(drop=True)
+    top['Регион'] = top['Регион'].astype(str)
+    by_region = frame.groupby('Регион', observed=True).agg(
+        Малых_городов=('Потенциал', 'size'), Средний_потенциал=('Потенциал', 'mean')).round(1)
+    by_region = by_region.sort_values('Средний_потенциал', ascending=False).reset_index()
+    by_region['Регион'] = by_region['Регион'].astype(str)
+    return [
+        section("Потенциал", "Топ-20 малых городов (до 100 тыс. человек) по потенциалу развития",
+                top[['Муниципалитет', 'Регион', 'Потенциал', 'Население', 'Средняя_зарплата',
+                     *POTENTIAL_FACTORS]],
+                {'kind': 'bar', 'x': 'Муниципалитет', 'y': 'Потенциал', 'color': 'Регион'}),
+        section("По регионам", "Средний потенциал малых городов по регионам", by_region,
+                {'kind': 'bar', 'x': 'Регион', 'y': 'Средний_потенциал', 'color': 'Регион'}),
+    ]
+
+
+# Название отчета -> (построение, исходные таблицы)
+REPORTS = {
+    "Топ-10 муниципалитетов по средней зарплате": (top_municipalities, ('municipal_data',)),
+    "Анализ потребительской активности по регионам": (consumer_activity, ('sber_index', 'sber_time_series')),
+    "Инвестиционная привлекательность регионов": (investment_attractiveness, ('regional_data', 'sber_index')),
+    "Малые города с высоким потенциалом развития": (small_towns, ('municipal_data',)),
+}
+
+
+@st.cache_resource(max_entries=16)
+@shared
+def _report_view(root, title, versions):
+    instrument.cache_miss('report_view')
+    build, _ = REPORTS[title]
+    return {'title': title, 'versions': versions, 'sections': build()}
+
+
+@instrument.timed('aggregate', cache='report_view')
+def report_view(title):
+    """Материализованный отчет ``title`` (общий, только для чтения)."""
+    return _report_view(open_store(), title, data_version(*REPORTS[title][1]))
+
+
+def chart_figure(part):
+    """Фигура Plotly для раздела отчета."""
+    import plotly.express as px
+
+    chart, frame = part['chart'], part['frame']
+    if chart.get('downsample'):
+        frame = downsample(frame, chart['x'], chart['y'], by=chart['color'])
+    if chart['kind'] == 'scatter':
+        return px.scatter(frame, x=chart['x'], y=chart['y'], color=chart['color'], size=chart.get('size'),
+                          title=part['title'])
+    build = px.bar if chart['kind'] == 'bar' else px.line
+    return build(frame, x=chart['x'], y=chart['y'], color=chart['color'], title=part['title'])
+
@@ -0,0 +1,140 @@
+"""Компактная схема типов таблиц в памяти.
+
+При чтении из хранилища столбцы приводятся к явной схеме:
+
+- ``Регион`` -- категория с общим для всех таблиц справочником регионов
+  (одинаковые коды во всех фреймах), ``Муниципалитет`` -- категория;
+- целые -- int32/int16, дробные -- float32;
+- ``Дата`` остается datetime64[ns]: месячный Period занимает те же 8 байт.
+
+Производные столбцы (``DERIVED``), например класс населенного пункта по
+численности, вычисляются векторно один раз при построении общих таблиц.
+
+Строки при чтении сразу декодируются словарем Parquet, без промежуточных
+Python-строк на каждую строку таблицы.
+"""
+
+import numpy as np
+import pandas as pd
+
+from rosstat.regions import REGION_NAMES
+
+# Общий справочник регионов; незнакомые значения дописываются в конец
+REGION = pd.CategoricalDtype(REGION_NAMES)
+
+CATEGORICAL = ('Регион', 'Муниципалитет')
+
+SCHEMA = {
+    'regional_data': {
+        'Регион': REGION,
+        'Население': 'int32',
+        'Средняя_зарплата': 'int32',
+        'Инвестиции_млрд': 'int32',
+        'Индекс_потребления': 'int16',
+    },
+    'municipal_data': {
+        'Муниципалитет': 'category',
+        'Регион': REGION,
+        'Население': 'int32',
+        'Средняя_зарплата': 'int32',
+        'Количество_предприятий': 'int32',
+        'Оборот_розничной_торговли_млн': 'int32',
+        'Индекс_потребления': 'int16',
+    },
+    'sber_index': {
+        'Регион': REGION,
+        'Индекс_потребительской_активности': 'int16',
+        'Индекс_транзакций_общепит': 'int16',
+        'Индекс_транзакций_одежда': 'int16',
+        'Индекс_транзакций_услуги': 'int16',
+        'Средний_чек': 'int32',
+    },
+    'sber_time_series': {
+        'Регион': REGION,
+        'Дата': 'datetime64[ns]',
+        'Индекс_потребительской_активности': 'float32',
+        'Индекс_транзакций_общепит': 'float32',
+        'Индекс_транзакций_одежда': 'float32',
+        'Индекс_транзакций_услуги': 'float32',
+        'Средний_чек': 'float32',
+    },
+}
+
+
+# Классы населенных пунктов по численности: [нижняя граница, следующая граница)
+POPULATION_BINS = [50_000, 100_000, 250_000, 1_000_000]
+POPULATION_CATEGORY = pd.CategoricalDtype([
+    "Малый город (до 50 тыс.)",
+    "Средний город (50-100 тыс.)",
+    "Большой город (100-250 тыс.)",
+    "Крупный город (250 тыс.-1 млн.)",
+    "Мегаполис (более 1 млн.)",
+], ordered=True)
+
+
+def population_category(population):
+    """Класс населенного пункта для каждого значения ``population``."""
+    codes = np.searchsorted(POPULATION_BINS, np.asarray(population), side='right')
+    return pd.Categorical.from_codes(codes, dtype=POPULATION_CATEGORY)
+
+
+# Производные столбцы: таблица -> {столбец: (исходный столбец, функция)}
+DERIVED = {
+    'municipal_data': {'Категория': ('Население', population_category)},
+}
+
+
+def with_derived(name, frame):
+    """``frame`` с производными столбцами таблицы ``name`` (без копирования данных)."""
+    columns = {column: func(frame[source]) for column, (source, func) in DERIVED.get(name, {}).items()
+               if source in frame.columns and column not in frame.columns}
+    return frame.assign(**columns) if columns else frame
+
+
+def compact(name, frame):
+    """Приводит столбцы ``frame`` к схеме таблицы ``name`` (лишние не трогает)."""
+    schema = SCHEMA.get(name, {})
+    result = {}
+    for column in frame.columns:
+        values = frame[column]
+        dtype = schema.get(column)
+        if dtype is REGION:
+            values = _recode(values, _region_dtype(values))
+        elif dtype is not None:
+            values = _cast(values, dtype)
+        result[column] = values
+    return pd.DataFrame(result, index=frame.index)
+
+
+def _region_dtype(values):
+    extra = pd.Index(pd.unique(values.dropna())).difference(REGION.categories)
+    if not len(extra):
+        return REGION
+    return pd.CategoricalDtype(REGION.categories.append(extra))
+
+
+def _recode(values, dtype):
+    # astype между неупорядоченными категориями с тем же набором ничего не делает:
+    # порядок справочника задаем явно
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.set_categories(dtype.categories)
+    return values.astype(dtype)
+
+
+def _cast(values, dtype):
+    dtype = pd.api.types.pandas_dtype(dtype)
+    if dtype.kind == 'i' and values.dtype.kind in 'iuf':
+        # Целое сужаем, только если значения помещаются и нет пропусков
+        info = np.iinfo(dtype)
+        if values.isna().any() or (len(values) and (values.min() < info.min or values.max() > info.max)):
+            return values
+        if values.dtype.kind == 'f' and not np.array_equal(values, np.round(values)):
+            return values
+    if values.dtype == dtype:
+        return values
+    return values.astype(dtype)
+
+
+def footprint(frame):
+    """Память фрейма в байтах, включая Python-объекты строк."""
+    return int(frame.memory_usage(index=True, deep=True).sum())
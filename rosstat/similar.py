@@ -0,0 +1,73 @@
+"""Поиск похожих муниципалитетов (k ближайших соседей).
+
+Признаки муниципалитетов один раз приводятся к стандартизованной матрице
+float32 (размерные показатели -- через логарифм, затем z-оценка), вместе с
+квадратами норм строк. Запрос -- одно умножение матрицы на вектор
+(||x||² - 2·x·q + ||q||²) и ``argpartition``: при шести признаках такой
+перебор быстрее дерева и на десятках тысяч строк укладывается в
+миллисекунды. Строки идут в порядке ``SortedFrameIndex``, поэтому
+исключение своего региона -- маска по его непрерывному диапазону.
+"""
+
+import numpy as np
+
+from rosstat import instrument
+
+# Признаки сходства; размерные берутся в логарифме, чтобы крупные города не доминировали
+FEATURES = ['Население', 'Средняя_зарплата', 'Количество_предприятий', 'Оборот_розничной_торговли_млн',
+            'Индекс_потребления', 'Оборот_на_душу_руб']
+LOG_FEATURES = ('Население', 'Количество_предприятий', 'Оборот_розничной_торговли_млн', 'Оборот_на_душу_руб')
+
+
+def features(frame):
+    """Столбцы FEATURES, включая производный оборот на душу населения."""
+    return frame.assign(Оборот_на_душу_руб=frame['Оборот_розничной_торговли_млн'].astype(float) * 1e6
+                        / frame['Население'])[FEATURES]
+
+
+class SimilarityIndex:
+    def __init__(self, index):
+        self.index = index
+        values = features(index.frame).to_numpy(dtype=float)
+        for j, column in enumerate(FEATURES):
+            if column in LOG_FEATURES:
+                values[:, j] = np.log1p(np.clip(values[:, j], 0, None))
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0)
+        std[std == 0] = 1
+        # Пропуски -- среднее, то есть нулевой вклад признака в расстояние
+        self.matrix = np.ascontiguousarray(np.nan_to_num((values - mean) / std), dtype=np.float32)
+        self.norms = np.einsum('ij,ij->i', self.matrix, self.matrix)
+
+    def __len__(self):
+        return len(self.matrix)
+
+    def position(self, region, municipality):
+        """Номер строки муниципалитета ``municipality`` региона ``region`` или None."""
+        for start, stop in self.index.ranges([region]):
+            names = self.index.frame['Муниципалитет'].iloc[start:stop].to_numpy()
+            found = np.flatnonzero(names == municipality)
+            if len(found):
+                return start + int(found[0])
+        return None
+
+    @instrument.timed('filter')
+    def nearest(self, position, k=10, other_regions=False):
+        """Номера k ближайших строк к ``position`` и расстояния до них (по возрастанию)."""
+        query = self.matrix[position]
+        distance = self.norms - 2 * (self.matrix @ query) + self.norms[position]
+        distance[position] = np.inf
+        if other_regions:
+            region = self.index.frame[self.index.key].iloc[position]
+            for start, stop in self.index.ranges([region]):
+                distance[start:stop] = np.inf
+        k = min(k, int(np.isfinite(distance).sum()))
+        if k <= 0:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+        nearest = np.argpartition(distance, k - 1)[:k]
+        nearest = nearest[np.argsort(distance[nearest], kind='stable')]
+        return nearest, np.sqrt(np.clip(distance[nearest], 0, None))
+
+    def standardized(self, positions):
+        """Стандартизованные признаки строк ``positions`` (для пояснения сходства)."""
+        return self.matrix[positions]
@@ -0,0 +1,98 @@
+"""Достаточные статистики для корреляций по произвольному набору регионов.
+
+Для каждой группы (обычно региона) хранятся число строк, суммы и матрица
+перекрестных произведений числовых столбцов. Корреляционная матрица для
+любого подмножества групп получается сложением этих частичных агрегатов,
+без прохода по строкам. Новые строки добавляются через ``update``.
+"""
+
+import numpy as np
+import pandas as pd
+
+from rosstat import instrument
+
+
+class MomentStats:
+    def __init__(self, columns, group_col, shift):
+        self.columns = list(columns)
+        self.group_col = group_col
+        # Сдвиг на глобальное среднее уменьшает потерю точности в суммах квадратов
+        self.shift = np.asarray(shift, dtype=float)
+        k = len(self.columns)
+        self.groups = []
+        self._pos = {}
+        self.n = np.zeros(0)
+        self.sums = np.zeros((0, k))
+        self.cross = np.zeros((0, k, k))
+
+    @classmethod
+    def from_frame(cls, frame, group_col, columns):
+        values = frame[list(columns)].to_numpy(dtype=float)
+        shift = np.nanmean(values, axis=0) if len(values) else np.zeros(len(columns))
+        stats = cls(columns, group_col, np.nan_to_num(shift))
+        stats.update(frame)
+        return stats
+
+    def update(self, frame):
+        """Добавляет строки ``frame``; строки с пропусками не учитываются."""
+        values = frame[self.columns].to_numpy(dtype=float) - self.shift
+        complete = ~np.isnan(values).any(axis=1)
+        values = values[complete]
+        codes, uniques = pd.factorize(frame[self.group_col].to_numpy()[complete])
+
+        new_groups = [group for group in uniques if group not in self._pos]
+        if new_groups:
+            for group in new_groups:
+                self._pos[group] = len(self.groups)
+                self.groups.append(group)
+            extra = len(new_groups)
+            k = len(self.columns)
+            self.n = np.concatenate([self.n, np.zeros(extra)])
+            self.sums = np.concatenate([self.sums, np.zeros((extra, k))])
+            self.cross = np.concatenate([self.cross, np.zeros((extra, k, k))])
+
+        if not len(values):
+            return self
+        target = np.array([self._pos[group] for group in uniques])[codes]
+        size = len(self.groups)
+        self.n += np.bincount(target, minlength=size)
+        for i in range(len(self.columns)):
+            self.sums[:, i] += np.bincount(target, weights=values[:, i], minlength=size)
+            for j in range(i, len(self.columns)):
+                products = np.bincount(target, weights=values[:, i] * values[:, j], minlength=size)
+                self.cross[:, i, j] += products
+                if i != j:
+                    self.cross[:, j, i] += products
+        return self
+
+    def _totals(self, groups=None):
+        if groups is None:
+            rows = slice(None)
+        else:
+            rows = [self._pos[group] for group in groups if group in self._pos]
+        return self.n[rows].sum(), self.sums[rows].sum(axis=0), self.cross[rows].sum(axis=0)
+
+    @instrument.timed('aggregate')
+    def corr(self, groups=None, columns=None):
+        """Матрица корреляций Пирсона по группам ``groups`` (все -- если None)."""
+        n, sums, cross = self._totals(groups)
+        k = len(self.columns)
+        result = np.full((k, k), np.nan)
+        if n >= 2:
+            mean = sums / n
+            cov = cross / n - np.outer(mean, mean)
+            var = np.diag(cov).copy()
+            # Постоянный столбец (с учетом погрешности округления) -- NaN, как в pandas
+            var[var <= 1e-12 * np.maximum(np.diag(cross) / n, 1e-300)] = np.nan
+            std = np.sqrt(var)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result = np.clip(cov / np.outer(std, std), -1, 1)
+            np.fill_diagonal(result, np.where(np.isnan(std), np.nan, 1.0))
+        matrix = pd.DataFrame(result, index=self.columns, columns=self.columns)
+        if columns is not None:
+            matrix = matrix.loc[list(columns), list(columns)]
+        return matrix
+
+    def pearson(self, x, y, groups=None):
+        """Коэффициент корреляции пары столбцов по группам ``groups``."""
+        return float(self.corr(groups, columns=[x, y]).iloc[0, 1])
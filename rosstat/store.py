@@ -0,0 +1,315 @@
+"""Колоночное хранилище таблиц на диске (Parquet).
+
+Структура каталога::
+
+    <root>/regional_data/part-0.parquet
+    <root>/sber_index/part-0.parquet
+    <root>/municipal_data/Регион=<регион>/part-0.parquet
+    <root>/sber_time_series/Регион=<регион>/part-0.parquet
+
+Крупные таблицы разбиты на партиции по региону, поэтому страница читает
+только нужные регионы и столбцы. Версия таблицы -- хэш содержимого её
+файлов: подмена выгрузки на диске сама сбрасывает кэши, а одинаковые
+данные в разных процессах дают одинаковую версию. Хэши файлов хранятся в
+манифесте ``.hashes.json`` и пересчитываются только при смене mtime или
+размера.
+
+Новые строки дописываются отдельными файлами ``part-<n>.parquet`` в
+затронутые партиции (``append_table``); прежние файлы не переписываются,
+поэтому производные агрегаты могут дочитать только новые файлы.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from rosstat import schema
+
+TABLES = ('regional_data', 'municipal_data', 'sber_index', 'sber_time_series')
+
+# Манифест хэшей файлов в корне хранилища и размер блока чтения при хэшировании
+HASH_MANIFEST = '.hashes.json'
+HASH_BLOCK = 1 << 20
+
+# Таблицы, разбитые на партиции, и столбец партиционирования
+PARTITION_BY = {
+    'municipal_data': 'Регион',
+    'sber_time_series': 'Регион',
+}
+
+PART_FILE = 'part-0.parquet'
+PART_PREFIX, PART_SUFFIX = 'part-', '.parquet'
+
+
+def default_root(scale):
+    """Каталог хранилища: ``ROSSTAT_STORE`` или ``store/<scale>`` рядом с приложением."""
+    if os.environ.get('ROSSTAT_STORE'):
+        return Path(os.environ['ROSSTAT_STORE'])
+    return Path(__file__).resolve().parent.parent / 'store' / scale
+
+
+def exists(root):
+    root = Path(root)
+    return all((root / name).is_dir() for name in TABLES)
+
+
+def ensure(root, build):
+    """Создает хранилище из ``build()`` -> кортеж таблиц, если его еще нет."""
+    root = Path(root)
+    if exists(root):
+        return root
+
+    # Пишем во временный каталог и переименовываем: параллельные процессы
+    # не увидят недописанное хранилище
+    tmp = root.with_name(f'{root.name}.tmp-{os.getpid()}')
+    shutil.rmtree(tmp, ignore_errors=True)
+    for name, frame in zip(TABLES, build()):
+        write_table(tmp, name, frame)
+    try:
+        tmp.rename(root)
+    except OSError:
+        # Другой процесс успел первым
+        shutil.rmtree(tmp, ignore_errors=True)
+    return root
+
+
+def write_table(root, name, frame):
+    table_dir = Path(root) / name
+    table_dir.mkdir(parents=True, exist_ok=True)
+    key = PARTITION_BY.get(name)
+    if key is None:
+        _write_file(table_dir / PART_FILE, frame)
+        return
+    for value, part in frame.groupby(key, sort=False, observed=True):
+        _write_file(_partition_dir(table_dir, key, value) / PART_FILE, part)
+
+
+def append_table(root, name, frame):
+    """Дописывает строки ``frame`` новыми файлами в затронутые партиции."""
+    table_dir = Path(root) / name
+    schema = pq.read_schema(files(root, name)[0])
+    key = PARTITION_BY.get(name)
+    groups = [(table_dir, frame)] if key is None else \
+        [(_partition_dir(table_dir, key, value), part) for value, part in frame.groupby(key, sort=False, observed=True)]
+    for directory, part in groups:
+        existing = _part_files(directory) if directory.is_dir() else []
+        number = _part_number(existing[-1]) + 1 if existing else 0
+        _write_file(directory / f'{PART_PREFIX}{number}{PART_SUFFIX}', part, schema)
+
+
+def replace_table(root, name, frame):
+    """Атомарно заменяет непартиционированную таблицу целиком."""
+    table_dir = Path(root) / name
+    for path in _part_files(table_dir)[1:]:
+        path.unlink()
+    _write_file(table_dir / PART_FILE, frame, pq.read_schema(table_dir / PART_FILE))
+
+
+def _write_file(path, frame, schema=None):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Пишем рядом и переименовываем: читатели не увидят недописанный файл
+    tmp = path.with_name(f'.{path.name}.tmp-{os.getpid()}')
+    pq.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False), tmp)
+    os.replace(tmp, path)
+
+
+def _part_number(path):
+    return int(path.name[len(PART_PREFIX):-len(PART_SUFFIX)])
+
+
+def _part_files(directory):
+    paths = [Path(entry.path) for entry in os.scandir(directory)
+             if entry.name.startswith(PART_PREFIX) and entry.name.endswith(PART_SUFFIX)]
+    return sorted(paths, key=_part_number)
+
+
+def _partition_dir(table_dir, key, value):
+    return table_dir / f"{key}={quote(str(value), safe='')}"
+
+
+def partitions(root, name):
+    """Значения партиций таблицы (без чтения данных)."""
+    table_dir = Path(root) / name
+    key = PARTITION_BY[name]
+    prefix = f'{key}='
+    return sorted(unquote(entry.name[len(prefix):]) for entry in os.scandir(table_dir)
+                  if entry.is_dir() and entry.name.startswith(prefix))
+
+
+def files(root, name, regions=None):
+    """Файлы данных таблицы (партиций ``regions``) в порядке записи."""
+    table_dir = Path(root) / name
+    key = PARTITION_BY.get(name)
+    if key is None:
+        return _part_files(table_dir)
+    if regions is None:
+        regions = partitions(root, name)
+    directories = (_partition_dir(table_dir, key, value) for value in regions)
+    return [path for directory in directories if directory.is_dir() for path in _part_files(directory)]
+
+
+def file_state(root, name):
+    """{путь: mtime_ns} файлов таблицы -- по нему видно, какие файлы добавились."""
+    return {str(path): os.stat(path).st_mtime_ns for path in files(root, name)}
+
+
+def file_hash(path):
+    """Хэш содержимого файла; пересчитывается только при смене mtime или размера."""
+    stat = os.stat(path)
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    digest = _hashes.get(key)
+    if digest is None:
+        digest = _manifest(Path(path)).get(key)
+    if digest is None:
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as handle:
+            for block in iter(lambda: handle.read(HASH_BLOCK), b''):
+                hasher.update(block)
+        digest = hasher.hexdigest()
+        _remember(Path(path), key, digest)
+    _hashes[key] = digest
+    return digest
+
+
+def version(root, name, regions=None):
+    """Версия таблицы (или партиций ``regions``) -- хэш содержимого её файлов.
+
+    Одинаковые данные дают одну и ту же версию в любом процессе и после
+    пересоздания хранилища, поэтому по ней ключуются и общие дисковые кэши.
+    """
+    root = Path(root)
+    paths = files(root, name, regions if name in PARTITION_BY else None)
+    hasher = hashlib.blake2b(digest_size=8)
+    for path in paths:
+        hasher.update(f'{path.relative_to(root).as_posix()}:{file_hash(path)};'.encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def snapshot(root):
+    """Идентификатор снимка всех таблиц хранилища."""
+    hasher = hashlib.blake2b(digest_size=8)
+    for name in TABLES:
+        hasher.update(f'{name}:{version(root, name)};'.encode('utf-8'))
+    return hasher.hexdigest()
+
+
+# Хэши файлов: в памяти процесса и в манифесте хранилища, общем для процессов
+_hashes = {}
+_manifests = {}
+_manifest_lock = threading.Lock()
+
+
+def _manifest_path(path):
+    # Манифест лежит в корне хранилища: <root>/<таблица>/.../part-N.parquet;
+    # у файлов вне хранилища (геоданные) хэши живут только в памяти процесса
+    for parent in path.parents:
+        if parent.name in TABLES:
+            return parent.parent / HASH_MANIFEST
+    return None
+
+
+def _manifest(path):
+    manifest = _manifest_path(path)
+    if manifest is None:
+        return {}
+    with _manifest_lock:
+        entries = _manifests.get(manifest)
+        if entries is None:
+            try:
+                with open(manifest, encoding='utf-8') as handle:
+                    entries = {(item['path'], item['mtime'], item['size']): item['hash'] for item in json.load(handle)}
+            except (OSError, ValueError, KeyError):
+                entries = {}
+            _manifests[manifest] = entries
+        return entries
+
+
+def _current(path, mtime, size):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return stat.st_mtime_ns == mtime and stat.st_size == size
+
+
+def _remember(path, key, digest):
+    manifest = _manifest_path(path)
+    if manifest is None:
+        return
+    entries = _manifest(path)
+    with _manifest_lock:
+        entries[key] = digest
+        # Записи о прежних версиях файлов не переносятся
+        items = [{'path': p, 'mtime': m, 'size': n, 'hash': h} for (p, m, n), h in entries.items()
+                 if _current(p, m, n)]
+        tmp = manifest.with_name(f'{manifest.name}.tmp-{os.getpid()}-{threading.get_ident()}')
+        try:
+            with open(tmp, 'w', encoding='utf-8') as handle:
+                json.dump(items, handle)
+            os.replace(tmp, manifest)
+        except OSError:
+            # Манифест -- только ускорение; без прав на запись хэши живут в памяти
+            pass
+
+
+def read_table(root, name, columns=None, regions=None, compact=True):
+    """Читает таблицу, загружая только нужные партиции ``regions`` и столбцы ``columns``.
+
+    При ``compact`` столбцы приводятся к схеме ``rosstat.schema``.
+    """
+    columns = list(columns) if columns is not None else None
+    paths = files(root, name, regions)
+    if not paths:
+        # Ни одна из запрошенных партиций не найдена -- пустая таблица той же схемы
+        file_schema = pq.read_schema(files(root, name)[0])
+        frame = file_schema.empty_table().select(columns or file_schema.names).to_pandas()
+    else:
+        frame = read_files(paths, columns, dictionary=compact)
+    return schema.compact(name, frame) if compact else frame
+
+
+def read_files(paths, columns=None, dictionary=False):
+    """Склеивает файлы; при ``dictionary`` строковые ключи читаются сразу категориями."""
+    columns = list(columns) if columns is not None else None
+    read_dictionary = list(schema.CATEGORICAL) if dictionary else None
+    tables = [pq.read_table(path, columns=columns, read_dictionary=read_dictionary) for path in paths]
+    return pa.concat_tables(tables).to_pandas()
+
+
+def memory_report(root):
+    """Память каждой таблицы в pandas: без схемы и по схеме ``rosstat.schema``."""
+    rows = []
+    for name in TABLES:
+        raw, compact = read_table(root, name, compact=False), read_table(root, name)
+        raw_bytes, compact_bytes = schema.footprint(raw), schema.footprint(compact)
+        rows.append({'table': name, 'rows': len(compact), 'raw_mb': raw_bytes / 2**20,
+                     'compact_mb': compact_bytes / 2**20, 'ratio': compact_bytes / max(raw_bytes, 1)})
+    return pd.DataFrame(rows)
+
+
+def count_rows(root, name):
+    """Число строк по метаданным Parquet, без чтения данных."""
+    return sum(pq.ParquetFile(path).metadata.num_rows for path in files(root, name))
+
+
+def column_bounds(root, name, column):
+    """(min, max) столбца по статистикам групп строк Parquet."""
+    low = high = None
+    for path in files(root, name):
+        metadata = pq.ParquetFile(path).metadata
+        index = metadata.schema.names.index(column)
+        for i in range(metadata.num_row_groups):
+            stats = metadata.row_group(i).column(index).statistics
+            if stats is None or not stats.has_min_max:
+                continue
+            low = stats.min if low is None else min(low, stats.min)
+            high = stats.max if high is None else max(high, stats.max)
+    return low, high
@@ -0,0 +1,218 @@
+"""Векторизованный генератор синтетических данных РосСтата и СберИндекса.
+
+Все таблицы строятся целиком массивами NumPy: муниципалитеты -- через
+``np.repeat`` по регионам, зарплаты -- через ``map`` региональной зарплаты,
+временной ряд СберИндекса -- как матрица регион × дата.
+"""
+
+import numpy as np
+import pandas as pd
+
+from rosstat.regions import FEDERAL_CITIES, REGION_NAMES
+
+# Предустановленные масштабы данных
+SCALES = {
+    # Исходный демонстрационный набор: 12 регионов, 84 муниципалитета, 2 года
+    'demo': dict(n_regions=12, municipalities_per_region=7, years=2, freq='M'),
+    # Все субъекты РФ, ~2 500 муниципалитетов, 10 лет помесячно
+    'national': dict(n_regions=85, municipalities_per_region=30, years=10, freq='M'),
+    # То же, но ежедневный СберИндекс
+    'national_daily': dict(n_regions=85, municipalities_per_region=30, years=10, freq='D'),
+}
+
+# Известные показатели исходных 12 регионов:
+# население, средняя зарплата, инвестиции (млрд), индекс потребления
+BASE_REGIONAL = {
+    'Москва': (12600000, 100000, 3500, 120),
+    'Санкт-Петербург': (5400000, 75000, 1200, 110),
+    'Владимирская область': (1350000, 35000, 90, 95),
+    'Краснодарский край': (5600000, 42000, 420, 105),
+    'Свердловская область': (4300000, 47000, 450, 100),
+    'Новосибирская область': (2800000, 45000, 230, 98),
+    'Татарстан': (3900000, 43000, 380, 103),
+    'Калининградская область': (1000000, 39000, 110, 97),
+    'Нижегородская область': (3200000, 41000, 350, 102),
+    'Приморский край': (1900000, 48000, 280, 104),
+    'Хабаровский край': (1300000, 46000, 240, 99),
+    'Тюменская область': (1500000, 52000, 390, 107),
+}
+
+SBER_SERIES_METRICS = ['Индекс_потребительской_активности', 'Индекс_транзакций_общепит',
+                       'Индекс_транзакций_одежда', 'Индекс_транзакций_услуги']
+
+
+def generate(n_regions=12, municipalities_per_region=7, years=2, freq='M',
+             start='2022-01-01', seed=42):
+    """Возвращает (regional_data, municipal_data, sber_index, sber_time_series).
+
+    ``freq`` -- 'M' (конец месяца) или 'D' (ежедневно).
+    """
+    if not 1 <= n_regions <= len(REGION_NAMES):
+        raise ValueError(f"n_regions должен быть от 1 до {len(REGION_NAMES)}")
+    if municipalities_per_region < 3:
+        raise ValueError("municipalities_per_region должен быть не меньше 3")
+
+    rng = np.random.default_rng(seed)
+    regions = np.array(REGION_NAMES[:n_regions], dtype=object)
+
+    regional_data = _regional(regions, rng)
+    municipal_data = _municipal(regions, regional_data, municipalities_per_region, rng)
+
+    # СберИндекс данные (имитация)
+    n = len(regions)
+    sber_index = pd.DataFrame({
+        'Регион': regions,
+        'Индекс_потребительской_активности': rng.integers(90, 120, n),
+        'Индекс_транзакций_общепит': rng.integers(85, 125, n),
+        'Индекс_транзакций_одежда': rng.integers(80, 130, n),
+        'Индекс_транзакций_услуги': rng.integers(85, 115, n),
+        'Средний_чек': rng.integers(500, 3000, n)
+    })
+
+    sber_time_series = _time_series(regions, sber_index['Средний_чек'].to_numpy(),
+                                    years, freq, start, rng)
+
+    return regional_data, municipal_data, sber_index, sber_time_series
+
+
+def _regional(regions, rng):
+    n = len(regions)
+    known = np.array([r in BASE_REGIONAL for r in regions])
+    n_new = int((~known).sum())
+
+    # Для регионов вне исходного набора показатели генерируются
+    population = rng.integers(400000, 4000000, n_new)
+    synthetic = np.column_stack([
+        population,
+        rng.integers(33000, 70000, n_new),
+        (population / 10000 * rng.uniform(0.5, 1.5, n_new)).astype(np.int64),
+        rng.integers(90, 110, n_new),
+    ])
+
+    values = np.empty((n, 4), dtype=np.int64)
+    values[~known] = synthetic
+    if known.any():
+        values[known] = np.array([BASE_REGIONAL[r] for r in regions[known]])
+
+    return pd.DataFrame({
+        'Регион': regions,
+        'Население': values[:, 0],
+        'Средняя_зарплата': values[:, 1],
+        'Инвестиции_млрд': values[:, 2],
+        'Индекс_потребления': values[:, 3]
+    })
+
+
+def _municipal(regions, regional_data, per_region, rng):
+    # Города федерального значения состоят из районов, остальные регионы --
+    # административный центр, средние и малые города
+    is_federal = np.isin(regions, FEDERAL_CITIES)
+    counts = np.where(is_federal, per_region - 2, per_region)
+    total = int(counts.sum())
+
+    region_idx = np.repeat(np.arange(len(regions)), counts)
+    starts = np.cumsum(counts) - counts
+    pos = np.arange(total) - np.repeat(starts, counts)
+    federal = is_federal[region_idx]
+
+    n_mid = (per_region - 1) // 2
+    center = ~federal & (pos == 0)
+    mid = ~federal & (pos >= 1) & (pos <= n_mid)
+    small = ~federal & (pos > n_mid)
+
+    low = np.select([federal, center, mid], [200000, 300000, 50000], 10000)
+    high = np.select([federal, center, mid], [500000, 1000000, 300000], 50000)
+    populations = rng.integers(low, high)
+
+    # Номер внутри своей группы совпадает с исходной схемой именования
+    number = np.select([federal, mid, small], [pos + 1, pos + 1, pos - n_mid], 0).astype(str)
+    label = np.select(
+        [federal, center, mid],
+        [np.char.add('Район ', number), 'Административный центр', np.char.add('Город ', number)],
+        np.char.add('Малый город ', number),
+    )
+    region_col = regions[region_idx]
+    names = pd.Series(region_col).str.cat(pd.Series(label), sep=' - ')
+
+    # Зарплата муниципалитета привязана к средней зарплате региона
+    region_salary = pd.Series(region_col).map(
+        regional_data.set_index('Регион')['Средняя_зарплата']).to_numpy()
+
+    return pd.DataFrame({
+        'Муниципалитет': names.to_numpy(dtype=object),
+        'Регион': region_col,
+        'Население': populations,
+        'Средняя_зарплата': (region_salary * rng.uniform(0.7, 1.2, total)).astype(np.int64),
+        'Количество_предприятий': (populations / 100 * rng.uniform(0.8, 1.2, total)).astype(np.int64),
+        'Оборот_розничной_торговли_млн': (populations / 10 * rng.uniform(0.7, 1.5, total)).astype(np.int64),
+        'Индекс_потребления': rng.integers(80, 130, total)
+    })
+
+
+def _dates(start, years, freq):
+    start = pd.Timestamp(start)
+    if freq == 'M':
+        # Концы месяцев; работает в любой версии pandas (без 'M'/'ME')
+        return pd.date_range(start, periods=years * 12, freq='MS') + pd.offsets.MonthEnd(0)
+    if freq == 'D':
+        return pd.date_range(start, start + pd.DateOffset(years=years) - pd.Timedelta(days=1), freq='D')
+    raise ValueError(f"Неизвестная частота: {freq}")
+
+
+def _time_series(regions, average_check, years, freq, start, rng):
+    dates = _dates(start, years, freq)
+    n_regions, n_dates = len(regions), len(dates)
+
+    # Номер месяца от начала ряда; для дневных данных -- дробный
+    start_ts = dates[0]
+    elapsed = ((dates.year - start_ts.year) * 12 + (dates.month - start_ts.month)).to_numpy(float)
+    if freq == 'D':
+        elapsed += (dates.day.to_numpy() - 1) / dates.days_in_month.to_numpy()
+
+    trend = elapsed * 0.2  # Небольшой восходящий тренд
+    seasonal = np.sin(2 * np.pi * (dates.month.to_numpy() - 1) / 11) * 10 + 5
+    base = rng.integers(90, 110, n_regions)[:, None]
+
+    value = base + trend + seasonal + rng.normal(0, 3, (n_regions, n_dates))
+
+    columns = {
+        'Регион': np.repeat(regions, n_dates),
+        'Дата': np.tile(dates.to_numpy(), n_regions),
+        'Индекс_потребительской_активности': np.clip(value, 80, 130).ravel(),
+    }
+    for metric, sigma in zip(SBER_SERIES_METRICS[1:], (5, 7, 4)):
+        columns[metric] = np.clip(value + rng.normal(0, sigma, value.shape), 80, 130).ravel()
+    # Средний чек колеблется вместе с активностью вокруг значения из снимка
+    columns['Средний_чек'] = np.round(average_check[:, None] * value / 100).ravel()
+
+    return pd.DataFrame(columns)
+
+
+def next_month(series, seed=None):
+    """Строки следующего месяца для ``sber_time_series`` (после последней даты ряда).
+
+    Частота (конец месяца или ежедневно) определяется по самому ряду,
+    значения -- случайное блуждание от последней строки каждого региона.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.DatetimeIndex(series['Дата'])
+    month_start = dates.max().normalize() + pd.offsets.MonthBegin(1)
+    daily = dates.to_period('D').nunique() > dates.to_period('M').nunique()
+    if daily:
+        new_dates = pd.date_range(month_start, month_start + pd.offsets.MonthEnd(0), freq='D')
+    else:
+        new_dates = pd.DatetimeIndex([month_start + pd.offsets.MonthEnd(0)])
+
+    last = series.sort_values('Дата', kind='stable').groupby('Регион', sort=False, observed=True).tail(1)
+    n_regions, n_dates = len(last), len(new_dates)
+    step = rng.normal(0, 3, (n_regions, n_dates))
+    columns = {
+        'Регион': np.repeat(last['Регион'].to_numpy(), n_dates),
+        'Дата': np.tile(new_dates.to_numpy(), n_regions),
+    }
+    for metric in SBER_SERIES_METRICS:
+        columns[metric] = np.clip(last[metric].to_numpy()[:, None] + step, 80, 130).ravel()
+    activity = last['Индекс_потребительской_активности'].to_numpy()[:, None]
+    columns['Средний_чек'] = np.round(last['Средний_чек'].to_numpy()[:, None]
+                                      * np.clip(activity + step, 80, 130) / activity).ravel()
+    return pd.DataFrame(columns)
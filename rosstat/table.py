@@ -0,0 +1,91 @@
+"""Постраничное представление таблицы на стороне сервера.
+
+В браузер уходит только видимая страница. Порядок строк для сортировки по
+столбцу вычисляется один раз (argsort) и переиспользуется, результаты
+текстового поиска запоминаются, а число строк считается по маске без
+материализации строк.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from rosstat import instrument
+
+SEARCH_CACHE_SIZE = 32
+
+
+class TableView:
+    def __init__(self, frame, text_columns=None):
+        self.frame = frame
+        if text_columns is None:
+            text_columns = [column for column in frame.columns
+                            if frame[column].dtype == object or isinstance(frame[column].dtype, pd.CategoricalDtype)
+                            or pd.api.types.is_string_dtype(frame[column].dtype)]
+        self.text_columns = list(text_columns)
+        self._orders = {}
+        self._haystack = None
+        self._searches = OrderedDict()
+
+    def __len__(self):
+        return len(self.frame)
+
+    def _order(self, column, ascending=True):
+        order = self._orders.get((column, ascending))
+        if order is None:
+            order = np.argsort(self.frame[column].to_numpy(), kind='stable')
+            if not ascending:
+                order = self._descending(column, order)
+            self._orders[(column, ascending)] = order
+        return order
+
+    def _descending(self, column, order):
+        # Группы равных значений в обратном порядке, внутри группы -- исходный порядок
+        # (как sort_values(ascending=False, kind='stable')); пропуски остаются в конце
+        values = self.frame[column].to_numpy()[order]
+        missing = pd.isna(values)
+        changed = np.ones(len(values), dtype=bool)
+        changed[1:] = (values[1:] != values[:-1]) & ~(missing[1:] & missing[:-1])
+        rank = np.where(missing, 1, -np.cumsum(changed))
+        return order[np.lexsort((np.arange(len(order)), rank))]
+
+    def _mask(self, search):
+        search = search.strip().lower()
+        mask = self._searches.get(search)
+        if mask is not None:
+            self._searches.move_to_end(search)
+            return mask
+        if self._haystack is None:
+            # Текстовые столбцы строки склеиваются один раз
+            haystack = pd.Series('', index=self.frame.index)
+            for column in self.text_columns:
+                haystack = haystack + '\n' + self.frame[column].astype(str).str.lower()
+            self._haystack = haystack
+        mask = self._haystack.str.contains(search, regex=False).to_numpy()
+        self._searches[search] = mask
+        while len(self._searches) > SEARCH_CACHE_SIZE:
+            self._searches.popitem(last=False)
+        return mask
+
+    def count(self, search=None):
+        """Число строк, подходящих под поиск."""
+        if not search or not search.strip():
+            return len(self.frame)
+        return int(self._mask(search).sum())
+
+    @instrument.timed('filter')
+    def page(self, page, page_size, search=None, sort_by=None, ascending=True):
+        """Строки страницы ``page`` (с нуля) после поиска и сортировки."""
+        start, stop = page * page_size, (page + 1) * page_size
+        has_search = bool(search and search.strip())
+        if sort_by is None and not has_search:
+            return self.frame.iloc[start:stop]
+
+        if sort_by is None:
+            rows = np.flatnonzero(self._mask(search))
+        else:
+            rows = self._order(sort_by, ascending)
+            if has_search:
+                rows = rows[self._mask(search)[rows]]
+        return self.frame.iloc[rows[start:stop]]
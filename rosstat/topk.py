@@ -0,0 +1,94 @@
+"""Индекс «top-k по показателю среди строк с ограничением по населению».
+
+Строки упорядочены по столбцу порядка (население), над ними строится
+дерево отрезков: в каждом узле хранятся номера до ``k_max`` строк узла с
+наибольшим значением показателя, уже отсортированные. Запрос «первые k
+при населении <= cap» -- двоичный поиск границы и слияние O(log n)
+готовых списков узлов, без фильтрации и сортировки всей таблицы.
+
+Для фильтра по регионам используется второе дерево в порядке
+(Регион, население) из ``SortedFrameIndex``: у каждого региона свой
+непрерывный диапазон строк.
+"""
+
+import numpy as np
+
+from rosstat import instrument
+
+
+class RangeTopK:
+    def __init__(self, values, k_max=50):
+        values = np.asarray(values, dtype=float)
+        self.k_max = k_max
+        self.size = 1 << max(0, int(np.ceil(np.log2(max(len(values), 1)))))
+        # Пропуски и пустые листья -- последний элемент, равный -inf
+        self.values = np.append(np.where(np.isnan(values), -np.inf, values), -np.inf)
+        leaves = np.full((self.size, 1), -1, dtype=np.int32)
+        leaves[:len(values), 0] = np.where(np.isnan(values), -1, np.arange(len(values)))
+        self.levels = [leaves]
+        while len(self.levels[-1]) > 1:
+            children = self.levels[-1]
+            candidates = children.reshape(len(children) // 2, -1)
+            width = min(candidates.shape[1], k_max)
+            # Стабильная сортировка: при равенстве выше строка с меньшим номером
+            order = np.argsort(-self.values[candidates], axis=1, kind='stable')[:, :width]
+            self.levels.append(np.take_along_axis(candidates, order, axis=1))
+
+    def _nodes(self, start, stop):
+        # Разбиение [start, stop) на узлы дерева снизу вверх
+        level = 0
+        while start < stop:
+            if start & 1:
+                yield self.levels[level][start]
+                start += 1
+            if stop & 1:
+                stop -= 1
+                yield self.levels[level][stop]
+            start >>= 1
+            stop >>= 1
+            level += 1
+
+    def query(self, start, stop, k):
+        """Номера до ``k`` строк из [start, stop) с наибольшими значениями."""
+        if k > self.k_max:
+            rows = np.arange(start, stop)
+            rows = rows[self.values[rows] > -np.inf]
+        else:
+            rows = np.concatenate([np.zeros(0, dtype=np.int32), *self._nodes(start, stop)])
+            rows = rows[rows >= 0]
+        return _top(rows, self.values, k)
+
+
+def _top(rows, values, k):
+    order = np.lexsort((rows, -values[rows]))[:k]
+    return rows[order]
+
+
+class TopKIndex:
+    def __init__(self, index, metrics, k_max=50):
+        self.index = index
+        self.metrics = list(metrics)
+        frame = index.frame
+        order_values = frame[index.order].to_numpy()
+        # Порядок по населению без учета региона
+        self._rows = np.argsort(order_values, kind='stable')
+        self._sorted = order_values[self._rows]
+        self._global = {metric: RangeTopK(frame[metric].to_numpy()[self._rows], k_max)
+                        for metric in self.metrics}
+        self._regional = {metric: RangeTopK(frame[metric].to_numpy(), k_max) for metric in self.metrics}
+
+    @instrument.timed('filter')
+    def top(self, metric, k=10, high=None, low=None, keys=None, columns=None):
+        """Первые ``k`` строк по убыванию ``metric`` при ``low <= order <= high``."""
+        if keys is None:
+            start = 0 if low is None else int(np.searchsorted(self._sorted, low, side='left'))
+            stop = len(self._sorted) if high is None else int(np.searchsorted(self._sorted, high, side='right'))
+            rows = self._rows[self._global[metric].query(start, stop, k)] if stop > start else []
+        else:
+            tree = self._regional[metric]
+            candidates = [tree.query(start, stop, k) for start, stop in self.index.ranges(keys, low, high)]
+            rows = np.concatenate([np.zeros(0, dtype=np.int32), *candidates])
+            rows = _top(rows, tree.values, k)
+        frame = self.index.frame
+        col_idx = slice(None) if columns is None else [frame.columns.get_loc(c) for c in columns]
+        return frame.iloc[np.asarray(rows, dtype=np.int64), col_idx]
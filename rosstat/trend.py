@@ -0,0 +1,135 @@
+"""Линии тренда и диаграммы рассеяния без statsmodels.
+
+Прямая МНК считается через ``np.linalg.lstsq``, робастная прямая --
+итеративным МНК с весами Тьюки, кривая LOWESS -- локальной линейной
+регрессией с трикубическими весами в фиксированном числе узлов. В фигуру
+уходят только узлы линии, а не повторный расчет на стороне Plotly.
+
+Большие облака точек рисуются через WebGL (``scattergl``).
+"""
+
+import numpy as np
+
+# Выше этого числа точек диаграмма рисуется через WebGL
+WEBGL_THRESHOLD = 2000
+
+# Число узлов кривой LOWESS
+CURVE_POINTS = 100
+
+METHODS = {
+    'ols': "МНК",
+    'robust': "Робастная (веса Тьюки)",
+    'lowess': "LOWESS",
+}
+
+
+def _design(x):
+    return np.column_stack([x, np.ones_like(x)])
+
+
+def ols(x, y):
+    """Наклон и сдвиг прямой наименьших квадратов."""
+    (slope, intercept), *_ = np.linalg.lstsq(_design(x), y, rcond=None)
+    return float(slope), float(intercept)
+
+
+def robust(x, y, iterations=20, tuning=4.685):
+    """Прямая итеративного МНК с весами Тьюки: выбросы почти не влияют на наклон."""
+    design = _design(x)
+    weights = np.ones_like(y)
+    coef = np.zeros(2)
+    for _ in range(iterations):
+        root = np.sqrt(weights)
+        coef, *_ = np.linalg.lstsq(design * root[:, None], y * root, rcond=None)
+        residuals = y - design @ coef
+        # Масштаб остатков -- медианное абсолютное отклонение
+        scale = np.median(np.abs(residuals)) / 0.6745
+        if scale <= 0:
+            break
+        u = residuals / (tuning * scale)
+        updated = np.where(np.abs(u) < 1, (1 - u ** 2) ** 2, 0.0)
+        if np.allclose(updated, weights, atol=1e-6):
+            break
+        weights = updated
+    return float(coef[0]), float(coef[1])
+
+
+def lowess(x, y, frac=0.3, points=CURVE_POINTS):
+    """Узлы и значения кривой LOWESS по доле ``frac`` ближайших точек."""
+    order = np.argsort(x, kind='stable')
+    x, y = x[order], y[order]
+    n = len(x)
+    k = min(n, max(2, int(np.ceil(frac * n))))
+    grid = np.linspace(x[0], x[-1], min(points, n))
+
+    # Окно k ближайших по x непрерывно в отсортированном массиве: ищем его
+    # начало двоичным поиском сразу для всех узлов
+    padded = np.append(x, np.inf)
+    position = np.searchsorted(x, grid)
+    low = np.clip(position - k, 0, n - k)
+    high = np.clip(position, 0, n - k)
+    while np.any(low < high):
+        active = low < high
+        middle = (low + high) // 2
+        # Левый край окна дальше от узла, чем следующая точка справа -- сдвигаем вправо
+        shift = grid - padded[middle] > padded[middle + k] - grid
+        low = np.where(active & shift, middle + 1, low)
+        high = np.where(active & ~shift, middle, high)
+    width = np.maximum(grid - x[low], x[low + k - 1] - grid)
+
+    values = np.empty(len(grid))
+    for i, (node, h) in enumerate(zip(grid, width)):
+        band = slice(np.searchsorted(x, node - h, side='left'), np.searchsorted(x, node + h, side='right'))
+        xs, ys = x[band], y[band]
+        if h > 0:
+            weights = (1 - np.clip(np.abs(xs - node) / h, 0, 1) ** 3) ** 3
+        else:
+            weights = np.ones_like(xs)
+        if weights.sum() <= 0:
+            weights = np.ones_like(xs)
+        mean_x = np.average(xs, weights=weights)
+        mean_y = np.average(ys, weights=weights)
+        spread = np.sum(weights * (xs - mean_x) ** 2)
+        slope = np.sum(weights * (xs - mean_x) * (ys - mean_y)) / spread if spread > 0 else 0.0
+        values[i] = mean_y + slope * (node - mean_x)
+    return grid, values
+
+
+def fit_trend(x, y, method='ols'):
+    """Линия тренда ``method`` по точкам (x, y): узлы линии и параметры подгонки."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    fit = {'method': method, 'n': len(x), 'x': np.zeros(0), 'y': np.zeros(0),
+           'slope': np.nan, 'intercept': np.nan, 'r2': np.nan}
+    if len(x) < 2 or np.ptp(x) == 0:
+        return fit
+    if method == 'lowess':
+        fit['x'], fit['y'] = lowess(x, y)
+        predicted = np.interp(x, fit['x'], fit['y'])
+    else:
+        slope, intercept = (robust if method == 'robust' else ols)(x, y)
+        fit['slope'], fit['intercept'] = slope, intercept
+        fit['x'] = np.array([x.min(), x.max()])
+        fit['y'] = slope * fit['x'] + intercept
+        predicted = slope * x + intercept
+    total = np.sum((y - y.mean()) ** 2)
+    if total > 0:
+        fit['r2'] = float(1 - np.sum((y - predicted) ** 2) / total)
+    return fit
+
+
+def scatter_figure(frame, x, y, color=None, hover_name=None, title=None, trend=None):
+    """Диаграмма рассеяния с готовой линией тренда; WebGL для больших облаков."""
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    webgl = len(frame) > WEBGL_THRESHOLD
+    fig = px.scatter(frame, x=x, y=y, color=color, hover_name=hover_name, title=title,
+                     render_mode='webgl' if webgl else 'svg')
+    if trend is not None and len(trend['x']):
+        line = go.Scattergl if webgl else go.Scatter
+        fig.add_trace(line(x=trend['x'], y=trend['y'], mode='lines', name=METHODS[trend['method']],
+                           line={'color': 'black', 'width': 2}))
+    return fig
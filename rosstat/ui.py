@@ -0,0 +1,185 @@
+"""Общие элементы страниц: стили, графики через кэш фигур, таблицы.
+
+Модуль не импортирует Plotly: фигуры строят страницы, а сюда передается
+только функция построения, которая вызывается при промахе кэша. Несколько
+независимых фигур страницы можно построить заранее в пуле потоков
+(``prefetch_charts``) и затем вывести обычным ``show_chart``.
+
+Блоки страниц с собственными виджетами оформлены фрагментами
+(``fragment``): изменение такого виджета перезапускает только блок, а не
+весь скрипт со стилями, боковой панелью и остальными графиками.
+"""
+
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import streamlit as st
+
+from rosstat import instrument
+from rosstat.artifacts import ArtifactCache
+from rosstat.data import artifact_cache, data_version, open_store
+from rosstat.export import ExportQueue
+from rosstat.figcache import FigureCache, figure_key
+from rosstat.table import TableView
+
+# Потоки для параллельного построения фигур, промахнувшихся мимо кэша
+FIGURE_WORKERS = 4
+
+# Потоки фоновой выгрузки отчетов в файлы
+EXPORT_WORKERS = 2
+
+STYLE = """
+<style>
+    .main-header {
+        font-size: 2.5rem;
+        color: #1E3A8A;
+        text-align: center;
+        margin-bottom: 1rem;
+        font-weight: bold;
+    }
+    .sub-header {
+        font-size: 1.5rem;
+        color: #2563EB;
+        margin-bottom: 1rem;
+    }
+    .info-box {
+        background-color: #EFF6FF;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        border-left: 5px solid #3B82F6;
+        margin-bottom: 1rem;
+    }
+    .stat-card {
+        background-color: white;
+        padding: 1.5rem;
+        border-radius: 0.5rem;
+        box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
+        text-align: center;
+        transition: transform 0.3s;
+    }
+    .stat-card:hover {
+        transform: translateY(-5px);
+    }
+    .stat-value {
+        font-size: 2rem;
+        font-weight: bold;
+        color: #1E40AF;
+    }
+    .stat-label {
+        font-size: 1rem;
+        color: #6B7280;
+    }
+    .footer {
+        text-align: center;
+        color: #6B7280;
+        font-size: 0.8rem;
+        margin-top: 2rem;
+    }
+</style>
+"""
+
+
+def apply_style():
+    st.markdown(STYLE, unsafe_allow_html=True)
+
+
+def fragment(func=None, *, run_every=None):
+    """``st.fragment``: виджеты внутри перезапускают только ``func``.
+
+    При полном перезапуске фрагмент учитывается в общем профиле, а его
+    собственный перезапуск при включенной отладке пишется отдельным профилем.
+    ``run_every`` -- периодический перезапуск (например, опрос прогресса).
+    """
+    if func is None:
+        return functools.partial(fragment, run_every=run_every)
+
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        if instrument.active() is not None or not st.session_state.get('debug'):
+            return func(*args, **kwargs)
+        profile = instrument.start()
+        profile.page = f"{st.session_state.get('page')} / {func.__name__}"
+        try:
+            return func(*args, **kwargs)
+        finally:
+            instrument.finish(profile)
+    return st.fragment(run, run_every=run_every)
+
+
+# Общий для всех сессий кэш фигур
+@st.cache_resource
+def figure_cache():
+    # JSON фигур общий для процессов: ключ содержит хэши содержимого данных
+    return FigureCache(disk=ArtifactCache(artifact_cache().directory / 'figures'))
+
+
+@st.cache_resource
+def export_queue():
+    # Файлы выгрузок лежат рядом с хранилищем: store/exports/<масштаб>
+    root = Path(open_store())
+    return ExportQueue(root.parent / 'exports' / root.name, workers=EXPORT_WORKERS)
+
+
+@st.cache_resource
+def figure_pool():
+    return ThreadPoolExecutor(max_workers=FIGURE_WORKERS, thread_name_prefix='figure')
+
+
+def _figure_builder(chart, build):
+    def build_figure():
+        instrument.cache_miss('figure_cache')
+        with instrument.section(chart, 'figure'):
+            return build()
+    return build_figure
+
+
+def prefetch_charts(*charts):
+    """Параллельно строит недостающие фигуры ``(chart, tables, params, build)``.
+
+    ``build`` не должен вызывать элементы Streamlit: он выполняется в
+    рабочем потоке. После возврата ``show_chart`` с теми же аргументами
+    берет фигуры из кэша.
+    """
+    cache = figure_cache()
+    jobs = []
+    for chart, tables, params, build in charts:
+        key = figure_key(chart, data_version(*tables), params)
+        if key not in cache:
+            # Каждому потоку -- своя копия контекста, чтобы профиль видел построение
+            context = contextvars.copy_context()
+            jobs.append((key, figure_pool().submit(context.run, _figure_builder(chart, build))))
+    for key, job in jobs:
+        cache.put(key, job.result())
+
+
+def show_chart(chart, tables, params, build, key=None):
+    # Фигура строится только при промахе кэша; ключ -- тип графика, версии таблиц и фильтры
+    cache_key = figure_key(chart, data_version(*tables), params)
+    instrument.cache_call('figure_cache')
+    figure = figure_cache().get_or_build(cache_key, _figure_builder(chart, build))
+    with instrument.section(chart, 'render', instrument.payload_size(figure) if instrument.active() else None):
+        st.plotly_chart(figure, width='stretch', key=key)
+
+
+def show_dataframe(frame, name="dataframe"):
+    with instrument.section(name, 'render', instrument.payload_size(frame) if instrument.active() else None):
+        st.dataframe(frame, width='stretch')
+
+
+@fragment
+def paged_table(view, key, page_size=50):
+    # В браузер отправляется только текущая страница; поиск и сортировка -- на сервере
+    if not isinstance(view, TableView):
+        view = TableView(view)
+    col1, col2, col3, col4 = st.columns([3, 3, 1, 1])
+    search = col1.text_input("Поиск", key=f"{key}_search")
+    sort_by = col2.selectbox("Сортировка", ["—"] + list(view.frame.columns), key=f"{key}_sort")
+    ascending = col3.checkbox("По возрастанию", value=True, key=f"{key}_asc")
+    total = view.count(search)
+    pages = max(1, -(-total // page_size))
+    page = min(int(col4.number_input("Страница", min_value=1, step=1, key=f"{key}_page")), pages)
+    show_dataframe(view.page(page - 1, page_size, search, None if sort_by == "—" else sort_by, ascending),
+                   name=key)
+    st.caption(f"Строк: {total} · страница {page} из {pages}")
@@ -0,0 +1,27 @@
+"""Страницы приложения: по модулю на раздел навигации.
+
+Модуль страницы импортируется при первом открытии раздела, поэтому
+Plotly и прочие тяжелые зависимости не загружаются, пока не понадобятся.
+
+Страница выводится фрагментом: ее фильтры (в том числе в боковой панели)
+перезапускают только страницу, без стилей, заголовка и навигации.
+"""
+
+import importlib
+
+from rosstat.ui import fragment
+
+PAGES = {
+    "Обзор данных": 'overview',
+    "Региональная статистика": 'regional',
+    "Муниципальная статистика": 'municipal',
+    "СберИндекс": 'sber',
+    "Сравнительный анализ": 'compare',
+    "Готовые отчеты": 'reports',
+    "ИИ-Агент": 'agent',
+}
+
+
+@fragment
+def render(page):
+    importlib.import_module(f'{__name__}.{PAGES[page]}').render()
@@ -0,0 +1,49 @@
+"""Страница «ИИ-Агент»: ответы на аналитические вопросы по данным."""
+
+import streamlit as st
+
+from rosstat.query import EXAMPLES, answer, describe, plan_tables
+from rosstat.ui import fragment, show_chart, show_dataframe
+
+
+def render():
+    if "chat_history" not in st.session_state:
+        st.session_state.chat_history = []
+    st.title("ИИ-Агент")
+    st.caption("Примеры вопросов: " + " · ".join(f"«{example}»" for example in EXAMPLES))
+
+    _chat()
+
+
+def _send():
+    # Колбэк выполняется до перезапуска фрагмента: история уже с новым сообщением
+    user_input = st.session_state.chat_input
+    if user_input.strip():
+        st.session_state.chat_history.append(user_input)
+
+
+def _show_answer(question, key):
+    # Ответы берутся из кэша по плану запроса, поэтому история не пересчитывается
+    plan, result = answer(question)
+    st.markdown(f"🤖 {result['text']}")
+    if result['chart'] is not None:
+        import plotly.express as px
+
+        chart, table = result['chart'], result['table']
+        build = px.bar if chart['kind'] == 'bar' else px.line
+        show_chart('agent_answer', plan_tables(plan), (plan,),
+                   lambda: build(table, x=chart['x'], y=chart['y'], color=chart['color']), key=key)
+    if result['table'] is not None:
+        show_dataframe(result['table'], name='agent_answer')
+    st.caption(f"План: {describe(plan)}")
+
+
+@fragment
+def _chat():
+    # Сообщение перезапускает только чат, а не страницу и приложение
+    for i, msg in enumerate(st.session_state.chat_history):
+        st.write(f"👤 {msg}")
+        _show_answer(msg, key=f"agent_answer_{i}")
+
+    st.text_input("Введите сообщение", key="chat_input", placeholder="Напишите что-нибудь...")
+    st.button("Отправить", on_click=_send)
@@ -0,0 +1,230 @@
+"""Страница «Сравнительный анализ»: регионы, муниципалитеты, корреляции."""
+
+import numpy as np
+import plotly.express as px
+import streamlit as st
+
+from rosstat.comparison import metric_bars, radar_figure
+from rosstat.data import load_table, similarity_index, table_regions, table_stats, trend_fit
+from rosstat.similar import FEATURES, features
+from rosstat.trend import METHODS, scatter_figure
+from rosstat.ui import fragment, prefetch_charts, show_chart, show_dataframe
+
+
+def render():
+    st.markdown('<h2 class="sub-header">Сравнительный анализ</h2>', unsafe_allow_html=True)
+
+    # Выбор типа анализа
+    analysis_type = st.radio("Выберите тип анализа:", 
+                            ["Сравнение регионов", "Сравнение муниципалитетов", 
+                             "Корреляционный анализ"])
+
+    if analysis_type == "Сравнение регионов":
+        regional_data = load_table('regional_data')
+        
+        # Фильтры
+        st.sidebar.markdown("### Фильтры")
+        selected_regions = st.sidebar.multiselect("Выберите регионы для сравнения:", 
+                                                options=regional_data['Регион'].unique(),
+                                                default=regional_data['Регион'].unique()[:5])
+        
+        # Показатели и графики по ним -- отдельный фрагмент
+        _compare_regions(regional_data, selected_regions)
+
+    elif analysis_type == "Сравнение муниципалитетов":
+        # Фильтры
+        st.sidebar.markdown("### Фильтры")
+        selected_region = st.sidebar.selectbox("Выберите регион:", 
+                                             options=table_regions('municipal_data'))
+        
+        municipal_data = load_table('municipal_data', regions=[selected_region])
+        municipalities_in_region = municipal_data['Муниципалитет'].unique()
+        selected_municipalities = st.sidebar.multiselect("Выберите муниципалитеты для сравнения:", 
+                                                      options=municipalities_in_region,
+                                                      default=municipalities_in_region[:min(5, len(municipalities_in_region))])
+        
+        # Показатели и графики по ним -- отдельный фрагмент
+        _compare_municipalities(municipal_data, selected_municipalities)
+
+        # Похожие муниципалитеты по всей стране
+        _similar_municipalities(selected_region, municipalities_in_region)
+
+    elif analysis_type == "Корреляционный анализ":
+        # Выбор данных для анализа
+        data_source = st.selectbox("Выберите источник данных:", 
+                                 ["Региональные данные", "Муниципальные данные", "СберИндекс"])
+        
+        if data_source == "Региональные данные":
+            table_name = 'regional_data'
+            numeric_cols = ['Население', 'Средняя_зарплата', 'Инвестиции_млрд', 'Индекс_потребления']
+        elif data_source == "Муниципальные данные":
+            table_name = 'municipal_data'
+            numeric_cols = ['Население', 'Средняя_зарплата', 'Количество_предприятий', 
+                           'Оборот_розничной_торговли_млн', 'Индекс_потребления']
+        else:  # СберИндекс
+            table_name = 'sber_index'
+            numeric_cols = ['Индекс_потребительской_активности', 'Индекс_транзакций_общепит', 
+                           'Индекс_транзакций_одежда', 'Индекс_транзакций_услуги', 'Средний_чек']
+        
+        # Фильтры
+        st.sidebar.markdown("### Фильтры")
+        all_regions = load_table('regional_data', columns=['Регион'])['Регион'].tolist()
+        selected_regions = st.sidebar.multiselect("Выберите регионы:", options=all_regions, default=all_regions)
+        
+        stats = table_stats(table_name, numeric_cols)
+        # Партиционированные таблицы читаются только по выбранным регионам,
+        # остальные небольшие и фильтруются после чтения
+        data = load_table(table_name, regions=selected_regions)
+        data = data[data['Регион'].isin(selected_regions)]
+        
+        # Корреляционная матрица по частичным агрегатам выбранных регионов
+        st.markdown("### Корреляционная матрица")
+        
+        corr_matrix = stats.corr(selected_regions)
+        
+        show_chart('correlation_matrix', [table_name], (selected_regions,),
+                   lambda: px.imshow(corr_matrix, text_auto=True, color_continuous_scale='RdBu_r',
+                                     title=f"Корреляция между показателями ({data_source})"))
+        
+        # Диаграмма рассеяния со своими настройками -- отдельный фрагмент
+        _scatter(table_name, numeric_cols, data, selected_regions, stats)
+
+
+@fragment
+def _similar_municipalities(region, municipalities):
+    st.markdown("### Похожие муниципалитеты")
+    col1, col2, col3 = st.columns([2, 1, 1])
+    municipality = col1.selectbox("Муниципалитет:", municipalities, key='similar_base')
+    k = col2.slider("Сколько найти:", min_value=3, max_value=30, value=10, key='similar_k')
+    other_regions = col3.checkbox("Только другие регионы", key='similar_other')
+
+    # Ближайшие соседи по стандартизованным признакам всех муниципалитетов
+    index = similarity_index()
+    position = index.position(region, municipality)
+    if position is None:
+        st.info("Муниципалитет не найден в данных.")
+        return
+    nearest, distance = index.nearest(position, k, other_regions)
+
+    rows = index.index.frame.iloc[np.append(position, nearest)]
+    table = rows[['Муниципалитет', 'Регион']].assign(**features(rows), Расстояние=np.append(0, distance).round(3))
+    table = table.round({'Оборот_на_душу_руб': 0}).reset_index(drop=True)
+    show_dataframe(table, name='similar_municipalities')
+
+    labels = [f"{name} ({region})" for name, region in zip(table['Муниципалитет'], table['Регион'])]
+    show_chart('similar_features', ['municipal_data'], (region, municipality, k, other_regions),
+               lambda: px.imshow(index.standardized(np.append(position, nearest)), x=FEATURES, y=labels,
+                                 color_continuous_scale='RdBu_r', zmin=-3, zmax=3, aspect='auto',
+                                 title="Стандартизованные признаки (первая строка -- выбранный)")
+               .update_layout(height=max(300, 28 * len(labels) + 120)))
+    st.caption(f"Поиск по {len(index):,} муниципалитетам: признаки нормированы (размерные -- в логарифме), "
+               "расстояние евклидово.")
+
+
+@fragment
+def _compare_regions(regional_data, selected_regions):
+    metrics = st.multiselect("Выберите показатели для сравнения:", 
+                           ["Население", "Средняя_зарплата", "Инвестиции_млрд", "Индекс_потребления"],
+                           default=["Средняя_зарплата", "Индекс_потребления"])
+
+    if selected_regions and metrics:
+        # Фильтрация данных
+        filtered_data = regional_data[regional_data['Регион'].isin(selected_regions)]
+
+        # Радар и панели по показателям независимы: при промахе кэша строятся параллельно
+        radar_chart = ('compare_regions_radar', ['regional_data'], (selected_regions, metrics),
+                       lambda: radar_figure(filtered_data, 'Регион', metrics,
+                                            "Сравнение регионов (нормализованные значения)"))
+        bars_chart = ('compare_regions_bars', ['regional_data'], (selected_regions, metrics),
+                      lambda: metric_bars(filtered_data, 'Регион', metrics, "Сравнение регионов по показателям"))
+        prefetch_charts(radar_chart, bars_chart)
+
+        # Радарная диаграмма для сравнения регионов
+        st.markdown("### Сравнение регионов по выбранным показателям")
+        show_chart(*radar_chart)
+
+        # Таблица сравнения
+        st.markdown("### Таблица сравнения")
+        show_dataframe(filtered_data[['Регион'] + metrics])
+
+        # Визуализация отдельных показателей: одна фигура с панелью на показатель
+        st.markdown("### Детальное сравнение по показателям")
+        show_chart(*bars_chart)
+    else:
+        st.warning("Пожалуйста, выберите регионы и показатели для сравнения.")
+
+
+@fragment
+def _compare_municipalities(municipal_data, selected_municipalities):
+    metrics = st.multiselect("Выберите показатели для сравнения:", 
+                           ["Население", "Средняя_зарплата", "Количество_предприятий", 
+                            "Оборот_розничной_торговли_млн", "Индекс_потребления"],
+                           default=["Средняя_зарплата", "Индекс_потребления"])
+
+    if selected_municipalities and metrics:
+        # Фильтрация данных
+        filtered_data = municipal_data[municipal_data['Муниципалитет'].isin(selected_municipalities)]
+
+        bars_chart = ('compare_municipal_bars', ['municipal_data'], (selected_municipalities, metrics),
+                      lambda: metric_bars(filtered_data, 'Муниципалитет', metrics,
+                                          "Сравнение муниципалитетов по показателям"))
+        per_capita_chart = ('compare_municipal_per_capita', ['municipal_data'], (selected_municipalities,),
+                            lambda: px.bar(filtered_data.assign(Оборот_на_душу_населения=(
+                                               filtered_data['Оборот_розничной_торговли_млн'].astype(float)
+                                               * 1000000 / filtered_data['Население'])),
+                                           x='Муниципалитет', y='Оборот_на_душу_населения',
+                                           color='Муниципалитет',
+                                           title="Оборот розничной торговли на душу населения (руб.)"))
+        prefetch_charts(bars_chart, per_capita_chart)
+
+        # Визуализация сравнения: одна фигура с панелью на показатель
+        st.markdown("### Сравнение муниципалитетов по выбранным показателям")
+        show_chart(*bars_chart)
+
+        # Таблица сравнения
+        st.markdown("### Таблица сравнения")
+        show_dataframe(filtered_data[['Муниципалитет'] + metrics])
+
+        # Расчет относительных показателей
+        st.markdown("### Относительные показатели")
+        show_chart(*per_capita_chart)
+    else:
+        st.warning("Пожалуйста, выберите муниципалитеты и показатели для сравнения.")
+
+
+@fragment
+def _scatter(table_name, numeric_cols, data, selected_regions, stats):
+    # Выбор показателей для диаграммы рассеяния
+    st.markdown("### Диаграмма рассеяния")
+
+    x_metric = st.selectbox("Выберите показатель для оси X:", numeric_cols)
+    y_metric = st.selectbox("Выберите показатель для оси Y:", 
+                          [col for col in numeric_cols if col != x_metric], 
+                          index=min(1, len(numeric_cols)-1))
+
+    # Цвет точек -- регион для всех источников
+    color_by = 'Регион'
+
+    method = st.selectbox("Линия тренда:", list(METHODS), format_func=METHODS.get)
+    trend = trend_fit(table_name, x_metric, y_metric, selected_regions, method)
+
+    show_chart('correlation_scatter', [table_name], (selected_regions, x_metric, y_metric, method),
+               lambda: scatter_figure(data, x_metric, y_metric, color=color_by,
+                                      hover_name=data.columns[0],  # Первый столбец (Регион или Муниципалитет)
+                                      title=f"Зависимость {y_metric} от {x_metric}", trend=trend))
+    if method != 'lowess' and not np.isnan(trend['slope']):
+        st.caption(f"Тренд: {y_metric} = {trend['slope']:.4g} × {x_metric} + {trend['intercept']:.4g}, "
+                   f"R² = {trend['r2']:.3f}")
+
+    # Расчет коэффициента корреляции
+    correlation = stats.pearson(x_metric, y_metric, selected_regions)
+    st.markdown(f"**Коэффициент корреляции Пирсона:** {correlation:.3f}")
+
+    if np.isnan(correlation):
+        st.markdown("Недостаточно данных для расчета корреляции.")
+    elif abs(correlation) < 0.3:
+        st.markdown("Слабая корреляция между показателями.")
+    elif abs(correlation) < 0.7:
+        st.markdown("Умеренная корреляция между показателями.")
+    else:
+        st.markdown("Сильная корреляция между показателями.")
@@ -0,0 +1,75 @@
+"""Страница «Муниципальная статистика»."""
+
+import math
+
+import plotly.express as px
+import streamlit as st
+
+from rosstat.boxplot import box_figure, box_summary
+from rosstat.data import box_stats, column_bounds, table_index, table_regions
+from rosstat.ui import fragment, paged_table, show_chart
+
+
+def render():
+    st.markdown('<h2 class="sub-header">Муниципальная статистика</h2>', unsafe_allow_html=True)
+
+    # Фильтры
+    st.sidebar.markdown("### Фильтры")
+    selected_region = st.sidebar.selectbox("Выберите регион:", 
+                                         options=table_regions('municipal_data'))
+
+    # Верх шкалы округляется вверх, чтобы полный диапазон включал и крупнейший муниципалитет
+    max_population = math.ceil(column_bounds('municipal_data', 'Население')[1] / 1000)
+    population_filter = st.sidebar.slider("Население (тыс. человек):", 
+                                        min_value=0, 
+                                        max_value=max_population, 
+                                        value=(0, max_population))
+
+    # Фильтрация данных: срез индекса (Регион, Население)
+    municipal_index = table_index('municipal_data')
+    filtered_municipal_data = municipal_index.select(
+        [selected_region], population_filter[0]*1000, population_filter[1]*1000)
+
+    # Показатель и график по нему -- отдельный фрагмент
+    _metric_chart(filtered_municipal_data, selected_region, population_filter)
+
+    if len(filtered_municipal_data) > 0:
+        # Таблица с данными
+        st.markdown("### Детальные данные")
+        paged_table(filtered_municipal_data, key="municipal_details")
+        
+        # Анализ по размеру населенного пункта
+        st.markdown("### Анализ по размеру населенного пункта")
+        
+        # Класс по численности хранится в таблице; если фильтр оставил все строки
+        # региона, сводка ящиков берется готовой, иначе считается по выборке --
+        # график всегда по тем же строкам, что и таблица выше
+        whole_region = len(filtered_municipal_data) == municipal_index.count([selected_region])
+
+        def build_box():
+            if whole_region:
+                summary = box_stats('municipal_data', 'Средняя_зарплата', ['Регион', 'Категория'])
+                summary = summary[summary['Регион'] == selected_region]
+            else:
+                summary = box_summary(filtered_municipal_data, 'Средняя_зарплата', 'Категория')
+            return box_figure(summary, 'Категория', "Распределение средней зарплаты по размеру населенного пункта")
+        
+        show_chart('municipal_box', ['municipal_data'], (selected_region, population_filter), build_box)
+    else:
+        st.warning("Нет данных, соответствующих выбранным фильтрам.")
+
+
+@fragment
+def _metric_chart(filtered_municipal_data, selected_region, population_filter):
+    metric = st.selectbox("Выберите показатель для анализа:", 
+                         ["Население", "Средняя_зарплата", "Количество_предприятий", 
+                          "Оборот_розничной_торговли_млн", "Индекс_потребления"])
+
+    # Визуализация
+    st.markdown("### Муниципалитеты региона")
+
+    if len(filtered_municipal_data) > 0:
+        show_chart('municipal_bar', ['municipal_data'], (selected_region, population_filter, metric),
+                   lambda: px.bar(filtered_municipal_data, x='Муниципалитет', y=metric, 
+                                  color='Муниципалитет', text_auto='.2s',
+                                  title=f"{metric} по муниципалитетам {selected_region}").update_layout(height=500))
@@ -0,0 +1,75 @@
+"""Страница «Обзор данных»: сводка и примеры таблиц."""
+
+import streamlit as st
+
+from rosstat.data import count_rows, load_table, table_regions, table_view
+from rosstat.ui import paged_table, show_dataframe
+
+
+def render():
+    st.markdown('<h2 class="sub-header">Обзор доступных данных</h2>', unsafe_allow_html=True)
+
+    regional_data = load_table('regional_data')
+    sber_index = load_table('sber_index')
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown('<div class="stat-card">', unsafe_allow_html=True)
+        st.markdown(f'<p class="stat-value">{len(regional_data)}</p>', unsafe_allow_html=True)
+        st.markdown('<p class="stat-label">Регионов в базе</p>', unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    with col2:
+        st.markdown('<div class="stat-card">', unsafe_allow_html=True)
+        st.markdown(f'<p class="stat-value">{count_rows("municipal_data")}</p>', unsafe_allow_html=True)
+        st.markdown('<p class="stat-label">Муниципалитетов в базе</p>', unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    with col3:
+        st.markdown('<div class="stat-card">', unsafe_allow_html=True)
+        st.markdown(f'<p class="stat-value">{len(table_regions("sber_time_series"))}</p>', unsafe_allow_html=True)
+        st.markdown('<p class="stat-label">Регионов с данными СберИндекс</p>', unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    st.markdown("### Примеры доступных данных")
+
+    tab1, tab2, tab3, tab4 = st.tabs(["Региональные данные", "Муниципальные данные", "СберИндекс",
+                                      "Временные ряды СберИндекс"])
+
+    with tab1:
+        show_dataframe(regional_data)
+
+    with tab2:
+        paged_table(table_view('municipal_data'), key="overview_municipal")
+
+    with tab3:
+        show_dataframe(sber_index)
+
+    with tab4:
+        paged_table(table_view('sber_time_series'), key="overview_series")
+
+    st.markdown("### Описание данных")
+    st.markdown("""
+    В нашей базе содержатся следующие типы данных:
+
+    1. **Региональные данные**:
+       - Население регионов
+       - Средняя заработная плата
+       - Объем инвестиций
+       - Индекс потребления
+
+    2. **Муниципальные данные**:
+       - Население муниципалитетов
+       - Средняя заработная плата
+       - Количество предприятий
+       - Оборот розничной торговли
+       - Индекс потребления
+
+    3. **Данные СберИндекс**:
+       - Индекс потребительской активности
+       - Индекс транзакций в сфере общепита
+       - Индекс транзакций в сфере одежды
+       - Индекс транзакций в сфере услуг
+       - Средний чек
+    """)
@@ -0,0 +1,97 @@
+"""Страница «Региональная статистика»."""
+
+import plotly.express as px
+import streamlit as st
+
+from rosstat import geo
+from rosstat.data import load_table, region_geometry, table_stats
+from rosstat.ui import fragment, show_chart, show_dataframe
+
+
+# Показатели для карты: таблица -> столбцы
+MAP_METRICS = {
+    'regional_data': ['Население', 'Средняя_зарплата', 'Инвестиции_млрд', 'Индекс_потребления'],
+    'sber_index': ['Индекс_потребительской_активности', 'Индекс_транзакций_общепит',
+                   'Индекс_транзакций_одежда', 'Индекс_транзакций_услуги', 'Средний_чек'],
+}
+
+
+def render():
+    st.markdown('<h2 class="sub-header">Региональная статистика</h2>', unsafe_allow_html=True)
+
+    regional_data = load_table('regional_data')
+
+    # Фильтры
+    st.sidebar.markdown("### Фильтры")
+    selected_regions = st.sidebar.multiselect("Выберите регионы:", 
+                                             options=regional_data['Регион'].unique(),
+                                             default=regional_data['Регион'].unique()[:5])
+
+    # Фильтрация данных
+    filtered_regional_data = regional_data[regional_data['Регион'].isin(selected_regions)]
+
+    # Показатель и график по нему -- отдельный фрагмент
+    _metric_chart(filtered_regional_data, selected_regions)
+
+    # Карта регионов -- отдельный фрагмент со своим выбором показателя
+    _region_map(selected_regions)
+
+    # Таблица с данными
+    st.markdown("### Детальные данные")
+    show_dataframe(filtered_regional_data)
+
+    # Корреляция показателей
+      # Корреляция показателей
+    st.markdown("### Корреляция показателей")
+
+    numeric_cols = ['Население', 'Средняя_зарплата', 'Инвестиции_млрд', 'Индекс_потребления']
+    corr_matrix = table_stats('regional_data', numeric_cols).corr(selected_regions)
+
+    show_chart('regional_corr', ['regional_data'], (selected_regions,),
+               lambda: px.imshow(corr_matrix, text_auto=True, color_continuous_scale='RdBu_r',
+                                 title="Корреляция между показателями"))
+
+
+@fragment
+def _metric_chart(filtered_regional_data, selected_regions):
+    metric = st.selectbox("Выберите показатель для анализа:", 
+                         ["Население", "Средняя_зарплата", "Инвестиции_млрд", "Индекс_потребления"])
+
+    # Визуализация
+    st.markdown("### Сравнение регионов")
+
+    show_chart('regional_bar', ['regional_data'], (selected_regions, metric),
+               lambda: px.bar(filtered_regional_data, x='Регион', y=metric, 
+                              color='Регион', text_auto='.2s',
+                              title=f"{metric} по регионам").update_layout(height=500))
+
+
+@fragment
+def _region_map(selected_regions):
+    st.markdown("### Карта регионов")
+    options = {metric: name for name, metrics in MAP_METRICS.items() for metric in metrics}
+    metric = st.selectbox("Показатель на карте:", list(options), key='map_metric')
+    values = load_table(options[metric], columns=['Регион', metric])
+    values = values[values['Регион'].isin(selected_regions)]
+
+    # Геометрия уже упрощена под охват выбранных регионов; с каждой отрисовкой меняются только значения
+    regions = values['Регион'].astype(str)
+    collection, level, points = region_geometry(regions)
+    if not collection['features']:
+        st.info("Для выбранных регионов нет геоданных.")
+        return
+
+    def build():
+        import plotly.graph_objects as go
+
+        figure = go.Figure(go.Choropleth(
+            geojson=collection, locations=regions, z=values[metric], colorscale='Blues',
+            marker_line_color='white', colorbar_title=metric,
+            hovertemplate="%{location}<br>%{z:,}<extra></extra>"))
+        return figure.update_geos(fitbounds='locations', visible=False, projection_type='equirectangular') \
+            .update_layout(height=550, margin=dict(l=0, r=0, t=30, b=0), title=f"{metric} по регионам")
+
+    show_chart('regional_map', [options[metric]], (selected_regions, metric, geo.version()), build)
+    missing = sorted(set(regions) - {feature['id'] for feature in collection['features']})
+    st.caption(f"Детализация границ: {geo.LEVELS[level][0].lower()} ({points:,} точек на уровне)"
+               + (f". Нет геоданных: {', '.join(missing)}" if missing else ""))
@@ -0,0 +1,117 @@
+"""Страница «Готовые отчеты»."""
+
+import plotly.express as px
+import streamlit as st
+
+from rosstat.data import table_regions, table_topk
+from rosstat.export import EXCEL_ENGINE, available_formats
+from rosstat.reports import REPORTS, TOP_COLUMNS, TOP_METRICS, chart_figure, report_view
+from rosstat.ui import export_queue, fragment, show_chart, show_dataframe
+
+
+def render():
+    st.markdown('<h2 class="sub-header">Готовые отчеты</h2>', unsafe_allow_html=True)
+
+    report_type = st.selectbox("Выберите тип отчета:", list(REPORTS))
+
+    if report_type == "Топ-10 муниципалитетов по средней зарплате":
+        # Фильтры отчета перезапускают только его фрагмент
+        _top_report()
+    else:
+        _materialized_report(report_type)
+
+    _export(report_type)
+
+
+def _materialized_report(title):
+    # Разделы берутся из общего материализованного отчета, пересчет -- только после обновления данных
+    report = report_view(title)
+    st.markdown(f"### {title}")
+    for part in report['sections']:
+        if part['chart'] is None:
+            st.markdown(f"#### {part['title']}")
+        else:
+            show_chart('report_section', REPORTS[title][1], (title, part['sheet']),
+                       lambda part=part: chart_figure(part).update_layout(height=500))
+        if part['table']:
+            show_dataframe(part['frame'], name='report_section')
+
+
+@fragment
+def _top_report():
+    st.markdown("### Топ-10 муниципалитетов по средней зарплате")
+
+    # Фильтры
+    population_threshold = st.slider("Максимальное население (тыс. человек):", 
+                                   min_value=10, max_value=1000, value=100, step=10)
+    col1, col2 = st.columns(2)
+    metric = col1.selectbox("Показатель:", TOP_METRICS)
+    selected_regions = col2.multiselect("Регионы (все, если не выбраны):",
+                                        options=table_regions('municipal_data'))
+
+    # Первые 10 по индексу: двоичный поиск по населению и слияние готовых списков
+    top_municipalities = table_topk('municipal_data', TOP_METRICS).top(
+        metric, 10, high=population_threshold * 1000, keys=selected_regions or None,
+        columns=TOP_COLUMNS)
+
+    # Визуализация
+    show_chart('report_top_salary', ['municipal_data'], (population_threshold, metric, selected_regions),
+               lambda: px.bar(top_municipalities, x='Муниципалитет', y=metric, 
+                              color='Регион', text_auto='.2s',
+                              title=f"Топ-10 муниципалитетов с населением до {population_threshold} тыс. человек по показателю {metric}")
+               .update_layout(height=500))
+
+    # Таблица с данными
+    st.markdown("### Детальные данные")
+    show_dataframe(top_municipalities)
+
+    # Анализ
+    st.markdown("### Анализ")
+    st.markdown("""
+    Анализ показывает, что среди малых и средних городов с населением до 100 тысяч человек 
+    наиболее высокие зарплаты наблюдаются в муниципалитетах, расположенных в регионах с развитой 
+    промышленностью или добычей полезных ископаемых. Также высокие зарплаты характерны для 
+    городов-спутников крупных мегаполисов.
+
+    Факторы, влияющие на высокий уровень зарплат в малых городах:
+    - Наличие крупных промышленных предприятий
+    - Близость к региональным центрам
+    - Развитие специализированных отраслей
+    - Инвестиционная активность в регионе
+    """)
+
+
+@fragment
+def _export(title):
+    st.markdown("### Выгрузка отчета")
+    formats = available_formats()
+    col1, col2 = st.columns([2, 1])
+    fmt = col1.selectbox("Формат:", list(formats), format_func=lambda name: formats[name][0],
+                         key='export_format')
+    notes = ["Отчет выгружается целиком, для топа муниципалитетов -- с параметрами по умолчанию."]
+    if EXCEL_ENGINE is None:
+        notes.append("Excel недоступен: не установлен openpyxl.")
+    st.caption(" ".join(notes))
+    if col2.button("Подготовить файл", key='export_start'):
+        # Файл пишется в пуле выгрузки; сессия хранит только ссылку на задание
+        st.session_state.export_job = export_queue().submit(report_view(title), fmt)
+
+    job = st.session_state.get('export_job')
+    if job is None or job.title != title:
+        return
+    if not job.done:
+        _export_progress(job)
+    elif job.error is not None:
+        st.error(f"Не удалось выгрузить отчет: {job.error}")
+    else:
+        # Файл читается с диска только при нажатии
+        st.download_button(f"Скачать {formats.get(job.format, ('',))[0]}", data=job.open,
+                           file_name=job.file_name, mime=job.mime, key='export_download')
+
+
+@fragment(run_every=0.5)
+def _export_progress(job):
+    # Опрос перезапускает только полосу прогресса; готовый файл показывает кнопку скачивания
+    st.progress(job.progress, text=job.message)
+    if job.done:
+        st.rerun()
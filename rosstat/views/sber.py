@@ -0,0 +1,102 @@
+"""Страница «СберИндекс»: динамика, текущие значения, сезонность, декомпозиция и прогноз."""
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from rosstat.data import column_bounds, load_table, select_partitions, series_cube, series_forecast
+from rosstat.downsample import downsample
+from rosstat.forecast import COMPONENTS, FIT_WINDOW, HORIZON, forecast_figure
+from rosstat.ui import fragment, paged_table, show_chart, show_dataframe
+
+
+def render():
+    st.markdown('<h2 class="sub-header">Данные СберИндекс</h2>', unsafe_allow_html=True)
+
+    sber_index = load_table('sber_index')
+    first_date, last_date = column_bounds('sber_time_series', 'Дата')
+
+    # Фильтры
+    st.sidebar.markdown("### Фильтры")
+    selected_regions = st.sidebar.multiselect("Выберите регионы:", 
+                                             options=sber_index['Регион'].unique(),
+                                             default=sber_index['Регион'].unique()[:3])
+
+    date_range = st.sidebar.date_input(
+        "Выберите период:",
+        value=(first_date.date(), last_date.date()),
+        min_value=first_date.date(),
+        max_value=last_date.date()
+    )
+
+    # Фильтрация данных
+    filtered_sber_index = sber_index[sber_index['Регион'].isin(selected_regions)]
+
+    # Показатель и все графики по нему -- отдельный фрагмент: смена показателя
+    # не перезапускает фильтры
+    _metric_section(filtered_sber_index, selected_regions, date_range)
+
+
+@fragment
+def _metric_section(filtered_sber_index, selected_regions, date_range):
+    metric = st.selectbox("Выберите показатель для анализа:", 
+                         ["Индекс_потребительской_активности", "Индекс_транзакций_общепит", 
+                          "Индекс_транзакций_одежда", "Индекс_транзакций_услуги", "Средний_чек"])
+
+    # Только выбранные регионы и нужные столбцы
+    series_columns = list(dict.fromkeys(['Регион', 'Дата', metric, 'Индекс_потребительской_активности']))
+    filtered_time_series = select_partitions(
+        'sber_time_series', selected_regions, pd.Timestamp(date_range[0]), pd.Timestamp(date_range[1]), columns=series_columns)
+
+    # Визуализация
+    st.markdown("### Динамика показателей СберИндекс")
+
+    if len(filtered_time_series) > 0:
+        # Ряды прорежены до ширины графика; при сужении периода точек становится больше
+        show_chart('sber_dynamics', ['sber_time_series'], (selected_regions, date_range, metric),
+                   lambda: px.line(downsample(filtered_time_series, 'Дата', metric, by='Регион'),
+                                   x='Дата', y=metric, color='Регион',
+                                   title=f"Динамика {metric} по регионам").update_layout(height=500))
+        
+        # Сравнение текущих значений
+        st.markdown("### Текущие значения показателей")
+        
+        show_chart('sber_latest', ['sber_index'], (selected_regions, metric),
+                   lambda: px.bar(filtered_sber_index, x='Регион', y=metric, color='Регион',
+                                  title=f"Текущие значения {metric} по регионам"))
+        
+        # Сезонность за выбранный период: средние по календарным месяцам из куба
+        st.markdown("### Сезонность потребительской активности")
+        cube = series_cube()
+        show_chart('sber_seasonality', ['sber_time_series'], (selected_regions, date_range),
+                   lambda: px.line(cube.seasonality(selected_regions, 'Индекс_потребительской_активности',
+                                                    date_range[0], date_range[1]),
+                                   x='Месяц', y='Индекс_потребительской_активности', color='Регион',
+                                   title="Сезонность потребительской активности", markers=True))
+
+        # Декомпозиция и прогноз: все ряды посчитаны заранее, здесь только выборка
+        forecast = series_forecast()
+        components = forecast.components(selected_regions, metric)
+        prediction = forecast.prediction(selected_regions, metric)
+
+        st.markdown("### Сезонная декомпозиция")
+        show_chart('sber_decomposition', ['sber_time_series'], (selected_regions, metric),
+                   lambda: px.line(components, x='Дата', y='Значение', color='Регион', facet_row='Компонента',
+                                   title=f"Тренд, сезонность и остаток {metric}")
+                   .update_yaxes(matches=None, title_text='')
+                   .for_each_annotation(lambda note: note.update(text=note.text.split('=')[-1]))
+                   .update_layout(height=800))
+
+        st.markdown(f"### Прогноз на {HORIZON} мес.")
+        observed = components[components['Компонента'] == COMPONENTS['observed']]
+        history = observed[observed['Дата'] > observed['Дата'].max() - pd.DateOffset(months=FIT_WINDOW)]
+        show_chart('sber_forecast', ['sber_time_series'], (selected_regions, metric),
+                   lambda: forecast_figure(history, prediction, metric,
+                                           f"Прогноз {metric}: тренд последних {FIT_WINDOW} мес. и сезонность"))
+        show_dataframe(prediction.round(2), name='sber_forecast')
+
+        # Таблица с данными
+        st.markdown("### Детальные данные")
+        paged_table(filtered_time_series, key="sber_details")
+    else:
+        st.warning("Нет данных, соответствующих выбранным фильтрам.")
@@ -0,0 +1,32 @@
+"""Общие данные тестов: небольшой синтетический набор (rosstat.synthetic)."""
+
+import os
+
+import pytest
+
+from rosstat import store, synthetic
+
+
+@pytest.fixture(scope='session')
+def tables():
+    """(regional_data, municipal_data, sber_index, sber_time_series) на 6 регионов и 3 года."""
+    return synthetic.generate(n_regions=6, municipalities_per_region=12, years=3)
+
+
+@pytest.fixture(scope='session')
+def municipal(tables):
+    return tables[1]
+
+
+@pytest.fixture(scope='session')
+def series(tables):
+    return tables[3]
+
+
+@pytest.fixture(scope='session')
+def app_store(tmp_path_factory, tables):
+    """Хранилище и дисковый кэш слоя данных во временном каталоге (как ROSSTAT_STORE)."""
+    directory = tmp_path_factory.mktemp('app')
+    os.environ['ROSSTAT_STORE'] = str(directory / 'store')
+    os.environ['ROSSTAT_CACHE'] = str(directory / 'cache')
+    return store.ensure(directory / 'store', lambda: tables)
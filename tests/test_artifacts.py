@@ -0,0 +1,116 @@
+"""Общий дисковый кэш артефактов и версии таблиц по хэшу содержимого."""
+
+import os
+import pickle
+import threading
+
+import pandas.testing as tm
+import pytest
+
+from rosstat import artifacts, store
+from rosstat.artifacts import ArtifactCache, artifact_key
+
+
+def test_round_trip_between_instances(tmp_path, municipal):
+    key = artifact_key('frame', ('version', 'abc'))
+    first, second = ArtifactCache(tmp_path), ArtifactCache(tmp_path)
+    builds = []
+    built = first.get_or_build(key, lambda: builds.append(1) or municipal.groupby('Регион')['Население'].sum())
+    # Второй экземпляр (как другой процесс) читает готовый файл, не строя заново
+    cached = second.get_or_build(key, lambda: builds.append(2))
+    tm.assert_series_equal(cached, municipal.groupby('Регион')['Население'].sum())
+    tm.assert_series_equal(cached, built)
+    assert builds == [1]
+    assert (first.misses, second.hits) == (1, 1)
+    assert second.stats()['entries'] == 1
+
+
+def test_unreadable_entries_are_misses(tmp_path):
+    cache = ArtifactCache(tmp_path)
+    path = cache._path('broken')
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b'\x80\x05 not a pickle')
+    assert cache.get('broken', 'miss') == 'miss'
+    # Класс, которого больше нет в коде: AttributeError/ImportError при чтении
+    path.write_bytes(pickle.dumps(pickle.PickleBuffer, protocol=5).replace(b'pickle', b'nosuch'))
+    assert cache.get('broken', 'miss') == 'miss'
+    assert cache.get_or_build('broken', lambda: 42) == 42
+    assert cache.get('broken') == 42
+
+
+def test_code_version_changes_keys(tmp_path, monkeypatch):
+    cache = ArtifactCache(tmp_path)
+    key = artifact_key('report', 1)
+    cache.put(key, 'old')
+    cache.put('figure', 'old')
+    monkeypatch.setattr(artifacts, 'code_version', lambda: 'other')
+    assert artifact_key('report', 1) != key
+    # Ключи, посчитанные вне artifact_key, тоже не находят файлов старого кода
+    assert cache.get('figure') is None
+
+
+def test_size_cap_evicts_least_recently_read(tmp_path):
+    cache = ArtifactCache(tmp_path, max_bytes=60_000)
+    payload = b'x' * 10_000
+    for i in range(5):
+        cache.put(f'k{i}', payload)
+        stamp = 1_000_000 + i
+        os.utime(cache._path(f'k{i}'), (stamp, stamp))
+    assert cache.get('k0') == payload
+    for i in range(5, 8):
+        cache.put(f'k{i}', payload)
+    stats = cache.stats()
+    assert stats['bytes'] <= 60_000
+    kept = {key for key in (f'k{i}' for i in range(8)) if cache._path(key).exists()}
+    assert 'k0' in kept and 'k1' not in kept and 'k7' in kept
+
+
+def test_concurrent_builds_run_once(tmp_path):
+    cache = ArtifactCache(tmp_path)
+    started = threading.Event()
+    builds = []
+
+    def build():
+        builds.append(1)
+        started.wait(1)
+        return 'value'
+
+    threads = [threading.Thread(target=cache.get_or_build, args=('key', build)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    started.set()
+    for thread in threads:
+        thread.join(5)
+    assert builds == [1]
+    assert cache.get('key') == 'value'
+
+
+def test_nested_builds_on_one_stripe(tmp_path):
+    cache = ArtifactCache(tmp_path)
+    stripe = cache._lock('outer').stripe
+    inner = next(f'inner{i}' for i in range(10_000) if cache._lock(f'inner{i}').stripe == stripe)
+    assert cache.get_or_build('outer', lambda: cache.get_or_build(inner, lambda: 1) + 1) == 2
+
+
+@pytest.fixture
+def twins(tmp_path, tables):
+    return [store.ensure(tmp_path / name, lambda: tables) for name in ('a', 'b')]
+
+
+def test_version_is_content_hash(twins, tables):
+    first, second = twins
+    for name in store.TABLES:
+        assert store.version(first, name) == store.version(second, name)
+    assert store.snapshot(first) == store.snapshot(second)
+
+    regions = list(tables[3]['Регион'].unique()[:2])
+    before = store.version(second, 'sber_time_series', regions)
+    # Перезапись теми же данными меняет mtime, но не версию
+    store.replace_table(second, 'sber_index', store.read_table(second, 'sber_index', compact=False))
+    assert store.version(second, 'sber_index') == store.version(first, 'sber_index')
+
+    changed = tables[3][tables[3]['Регион'] == regions[0]].assign(Средний_чек=0.0)
+    store.append_table(second, 'sber_time_series', changed)
+    assert store.version(second, 'sber_time_series', regions) != before
+    assert store.version(second, 'sber_time_series', regions[1:]) == store.version(first, 'sber_time_series', regions[1:])
+    assert store.snapshot(second) != store.snapshot(first)
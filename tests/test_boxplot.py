@@ -0,0 +1,60 @@
+"""Сводка ящиков с усами против квантилей pandas по каждой группе."""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+
+from rosstat import data
+from rosstat.boxplot import box_summary
+
+
+def _expected(values):
+    q1, median, q3 = values.quantile([0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside = values[values.between(q1 - 1.5 * iqr, q3 + 1.5 * iqr)]
+    outliers = values[~values.isin(inside)]
+    return {'n': len(values), 'q1': q1, 'median': median, 'q3': q3, 'mean': values.mean(),
+            'lowerfence': inside.min(), 'upperfence': inside.max(), 'outliers': outliers.tolist()}
+
+
+def test_summary_matches_pandas(municipal):
+    frame = municipal.copy()
+    # Выбросы и пропуски в нескольких группах
+    frame.loc[frame.index[::10], 'Средняя_зарплата'] *= 5
+    frame['Средняя_зарплата'] = frame['Средняя_зарплата'].astype(float)
+    frame.loc[frame.index[3::17], 'Средняя_зарплата'] = np.nan
+
+    summary = box_summary(frame, 'Средняя_зарплата', 'Регион')
+    rows = []
+    for region, group in frame.groupby('Регион', sort=True):
+        rows.append({'Регион': region, **_expected(group['Средняя_зарплата'].dropna())})
+    expected = pd.DataFrame(rows)
+    tm.assert_frame_equal(summary.drop(columns='outliers'), expected.drop(columns='outliers'),
+                          check_dtype=False)
+    for result, reference in zip(summary['outliers'], expected['outliers']):
+        assert result == reference
+    assert any(summary['outliers'].map(len))
+
+
+def test_summary_by_two_columns(municipal):
+    frame = municipal.assign(Крупный=municipal['Население'] > municipal['Население'].median())
+    summary = box_summary(frame, 'Индекс_потребления', ['Регион', 'Крупный'])
+    grouped = frame.groupby(['Регион', 'Крупный'])['Индекс_потребления']
+    assert list(summary['n']) == list(grouped.size())
+    np.testing.assert_allclose(summary['median'], grouped.median())
+    np.testing.assert_allclose(summary['q3'], grouped.quantile(0.75))
+
+
+def test_precomputed_summary_matches_full_slider(app_store):
+    # Полный диапазон ползунка страницы «Муниципальная статистика» оставляет все
+    # строки региона, и готовая сводка совпадает со сводкой по самой выборке
+    index = data.table_index('municipal_data')
+    top = math.ceil(data.column_bounds('municipal_data', 'Население')[1] / 1000) * 1000
+    for region in index.keys:
+        selected = index.select([region], 0, top)
+        assert len(selected) == index.count([region])
+        stored = data.box_stats('municipal_data', 'Средняя_зарплата', ['Регион', 'Категория'])
+        stored = stored[stored['Регион'] == region].drop(columns='Регион').reset_index(drop=True)
+        tm.assert_frame_equal(stored, box_summary(selected, 'Средняя_зарплата', 'Категория'), check_dtype=False)
@@ -0,0 +1,30 @@
+"""Холодный старт страницы по умолчанию укладывается в бюджет бенчмарка."""
+
+import importlib.util
+import os
+from pathlib import Path
+
+from rosstat import store
+from rosstat.synthetic import SCALES, generate
+
+RUN = Path(__file__).resolve().parent.parent / 'benchmarks' / 'run.py'
+
+
+def _bench():
+    spec = importlib.util.spec_from_file_location('benchmarks_run', RUN)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_cold_start_within_budget(tmp_path):
+    bench = _bench()
+    # Как в бенчмарке: хранилище масштаба demo уже записано, кэши пустые
+    root = store.ensure(tmp_path / 'store', lambda: generate(**SCALES['demo']))
+    env = dict(os.environ, ROSSTAT_SCALE='demo', ROSSTAT_STORE=str(root))
+    env.pop('ROSSTAT_DEBUG', None)
+    result = bench.bench_cold_start(env, repeat=3)
+    assert not result['errors']
+    assert not result['heavy_modules']
+    assert result['within_budget'], (f"холодный старт {result['total']['median']:.2f} с "
+                                     f"при бюджете {bench.COLD_START_BUDGET} с")
@@ -0,0 +1,72 @@
+"""MonthlyCube против groupby по исходным строкам."""
+
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+
+from rosstat.cube import MONTH_NAMES, MonthlyCube
+
+METRIC = 'Индекс_транзакций_общепит'
+
+
+def _with_gaps(series):
+    # Пропуски и повторные строки за месяц: среднее ячейки -- по всем строкам
+    frame = series.copy()
+    frame.loc[frame.index[::7], METRIC] = np.nan
+    return pd.concat([frame, frame.iloc[::5].assign(**{METRIC: frame[METRIC].iloc[::5] + 10})],
+                     ignore_index=True)
+
+
+def test_monthly_matches_groupby(series):
+    frame = _with_gaps(series)
+    regions = list(pd.unique(frame['Регион']))[:3]
+    cube = MonthlyCube(frame)
+    result = cube.monthly(regions, METRIC, start='2022-03-01', end='2023-10-31')
+
+    rows = frame[frame['Регион'].isin(regions) & frame['Дата'].between('2022-03-01', '2023-10-31')]
+    expected = rows.groupby(['Регион', 'Дата'], sort=False)[METRIC].mean().dropna().reset_index()
+    key = ['Регион', 'Дата']
+    tm.assert_frame_equal(result.sort_values(key, ignore_index=True),
+                          expected.sort_values(key, ignore_index=True), check_dtype=False)
+
+
+def test_seasonality_matches_groupby(series):
+    frame = _with_gaps(series)
+    cube = MonthlyCube(frame)
+    result = cube.seasonality(None, METRIC)
+    expected = (frame.assign(Месяц=frame['Дата'].dt.month)
+                .groupby(['Месяц', 'Регион'])[METRIC].mean().reset_index())
+    assert list(result['Месяц'].cat.codes + 1) == list(expected['Месяц'])
+    assert list(result['Регион']) == list(expected['Регион'])
+    np.testing.assert_allclose(result[METRIC], expected[METRIC])
+    assert list(result['Месяц'].cat.categories) == MONTH_NAMES
+
+
+def test_year_over_year_and_extremes(series):
+    cube = MonthlyCube(series)
+    yearly = series.assign(Год=series['Дата'].dt.year).groupby(['Регион', 'Год'])[METRIC].mean()
+    expected = yearly.to_frame().assign(**{'Изменение_%': yearly.groupby(level=0).pct_change() * 100})
+    result = cube.year_over_year(None, METRIC).set_index(['Регион', 'Год']).sort_index()
+    tm.assert_frame_equal(result, expected, check_dtype=False, check_index_type=False)
+
+    extremes = cube.extremes(None, METRIC, start='2023-01-01').set_index('Регион').sort_index()
+    rows = series[series['Дата'] >= '2023-01-01'].groupby('Регион')[METRIC]
+    np.testing.assert_allclose(extremes['Минимум'], rows.min())
+    np.testing.assert_allclose(extremes['Максимум'], rows.max())
+    np.testing.assert_allclose(extremes['Среднее'], rows.mean())
+
+
+def test_update_equals_full_build(series):
+    last = series['Дата'].max()
+    cube = MonthlyCube(series[series['Дата'] < last])
+    cube.update(series[series['Дата'] == last])
+    full = MonthlyCube(series)
+    for name in ('count', 'sum', 'min', 'max'):
+        np.testing.assert_allclose(getattr(cube, name), getattr(full, name))
+    tm.assert_frame_equal(cube.rollup(METRIC, by='district'), full.rollup(METRIC, by='district'))
+
+
+def test_rollup_over_all_regions(series):
+    result = MonthlyCube(series).rollup(METRIC)
+    expected = series.groupby('Дата')[METRIC].mean()
+    np.testing.assert_allclose(result.set_index('Дата')[METRIC].sort_index(), expected)
@@ -0,0 +1,26 @@
+"""Выборки слоя данных по индексам отдельных партиций."""
+
+import pandas as pd
+import pandas.testing as tm
+
+from rosstat import data, store
+
+
+def test_select_partitions_matches_pandas(app_store):
+    columns = ['Регион', 'Дата', 'Средний_чек']
+    frame = store.read_table(app_store, 'sber_time_series')
+    regions = list(frame['Регион'].unique()[[2, 0]])
+    low, high = frame['Дата'].quantile(0.25), frame['Дата'].quantile(0.75)
+    result = data.select_partitions('sber_time_series', regions, low, high, columns=columns)
+    # Регионы в порядке выборки, внутри региона -- по дате
+    expected = pd.concat([
+        frame[(frame['Регион'] == region) & frame['Дата'].between(low, high)].sort_values('Дата', kind='stable')
+        for region in regions])[columns].reset_index(drop=True)
+    tm.assert_frame_equal(result, expected)
+    assert list(result.columns) == columns
+
+
+def test_select_partitions_without_regions_keeps_schema(app_store):
+    result = data.select_partitions('sber_time_series', [], columns=['Средний_чек'])
+    assert result.empty
+    assert list(result.columns) == ['Регион', 'Дата', 'Средний_чек']
@@ -0,0 +1,71 @@
+"""Прореживание рядов против построчных эталонов LTTB и min/max."""
+
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+
+from rosstat.downsample import downsample, lttb_indices, minmax_indices
+
+
+def _lttb_reference(x, y, n_out):
+    # Классический LTTB одним циклом по корзинам
+    n = len(y)
+    every = (n - 2) / (n_out - 2)
+    selected, a = [0], 0
+    for i in range(n_out - 2):
+        avg_start = int(np.floor((i + 1) * every)) + 1
+        avg_stop = min(int(np.floor((i + 2) * every)) + 1, n)
+        avg_x, avg_y = x[avg_start:avg_stop].mean(), y[avg_start:avg_stop].mean()
+        start, stop = int(np.floor(i * every)) + 1, int(np.floor((i + 1) * every)) + 1
+        best, best_area = start, -1.0
+        for j in range(start, stop):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    return selected + [n - 1]
+
+
+def test_lttb_matches_reference():
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(0, 1000, size=(3, 997)), axis=1)
+    y = rng.normal(size=(3, 997)).cumsum(axis=1)
+    result = lttb_indices(x, y, 100)
+    for row in range(3):
+        assert list(result[row]) == _lttb_reference(x[row], y[row], 100)
+
+
+def test_minmax_keeps_bucket_extremes():
+    rng = np.random.default_rng(1)
+    y = rng.normal(size=1003)
+    chosen = minmax_indices(y, 50)[0]
+    size = -(-len(y) // 24)
+    buckets = pd.Series(y).groupby(np.arange(len(y)) // size)
+    expected = np.unique(np.r_[0, len(y) - 1, buckets.idxmin(), buckets.idxmax()])
+    assert set(chosen) == set(expected)
+    assert y[chosen].min() == y.min() and y[chosen].max() == y.max()
+
+
+def test_downsample_frame(series):
+    daily = pd.DataFrame({
+        'Регион': np.repeat(['А', 'Б', 'В'], [3000, 3000, 40]),
+        'Дата': np.concatenate([pd.date_range('2015-01-01', periods=3000).to_numpy()] * 2
+                               + [pd.date_range('2015-01-01', periods=40).to_numpy()]),
+        'y': np.random.default_rng(2).normal(size=6040).cumsum(),
+    })
+    for method in ('lttb', 'minmax'):
+        result = downsample(daily, 'Дата', 'y', by='Регион', n_out=200, method=method)
+        # Подмножество исходных строк в исходном порядке
+        tm.assert_frame_equal(result, daily.loc[result.index])
+        assert result.index.is_monotonic_increasing
+        sizes = result.groupby('Регион').size()
+        assert sizes['А'] <= 200 and sizes['Б'] <= 200
+        # Короткий ряд не прореживается, концы длинных сохраняются
+        assert sizes['В'] == 40
+        ends = daily.groupby('Регион').agg(first=('Дата', 'min'), last=('Дата', 'max'))
+        kept = result.groupby('Регион')['Дата'].agg(['min', 'max'])
+        assert (kept['min'] == ends['first']).all() and (kept['max'] == ends['last']).all()
+
+    # Ряды короче бюджета возвращаются как есть
+    assert downsample(series, 'Дата', 'Средний_чек', by='Регион', n_out=1200) is series
@@ -0,0 +1,123 @@
+"""Выгрузка отчетов: каждый формат читается обратно в те же таблицы; очередь заданий."""
+
+import io
+import zipfile
+from html.parser import HTMLParser
+
+import pandas as pd
+import pandas.testing as tm
+import pyarrow.parquet as pq
+import pytest
+
+from rosstat import export
+from rosstat.export import ExportQueue, write_excel, write_html, write_parquet
+from rosstat.reports import section
+
+
+@pytest.fixture
+def report(tables, monkeypatch):
+    # Мелкие порции: каждый раздел пишется в несколько приемов
+    monkeypatch.setattr(export, 'CHUNK_ROWS', 100)
+    regional, _, _, series = tables
+    return {'title': "Проверочный отчет", 'versions': ('v1',), 'sections': [
+        section('Регионы', "Регионы", regional,
+                {'kind': 'bar', 'x': 'Регион', 'y': 'Средняя_зарплата', 'color': 'Регион'}),
+        section('Ряды', "Ряды СберИндекса", series,
+                {'kind': 'line', 'x': 'Дата', 'y': 'Средний_чек', 'color': 'Регион'}),
+    ]}
+
+
+def _write(writer, report, path):
+    calls = []
+    writer(report, path, lambda fraction, message: calls.append(fraction))
+    assert calls == sorted(calls) and calls[-1] == pytest.approx(1.0)
+    return path
+
+
+def test_parquet_round_trip(report, tmp_path):
+    path = _write(write_parquet, report, tmp_path / 'report.zip')
+    with zipfile.ZipFile(path) as archive:
+        assert archive.namelist() == ['Регионы.parquet', 'Ряды.parquet']
+        for part in report['sections']:
+            frame = pq.read_table(io.BytesIO(archive.read(f"{part['sheet']}.parquet"))).to_pandas()
+            tm.assert_frame_equal(frame, part['frame'].reset_index(drop=True))
+
+
+def test_excel_round_trip(report, tmp_path):
+    path = _write(write_excel, report, tmp_path / 'report.xlsx')
+    sheets = pd.read_excel(path, sheet_name=None)
+    assert list(sheets) == ['Регионы', 'Ряды']
+    for part in report['sections']:
+        tm.assert_frame_equal(sheets[part['sheet']], part['frame'].reset_index(drop=True), check_dtype=False)
+
+
+class _Tables(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.tables, self._cell = [], None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table':
+            self.tables.append([])
+        elif tag == 'tr':
+            self.tables[-1].append([])
+        elif tag in ('td', 'th'):
+            self._cell = ''
+
+    def handle_endtag(self, tag):
+        if tag in ('td', 'th'):
+            self.tables[-1][-1].append(self._cell)
+            self._cell = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell += data
+
+
+def test_html_round_trip(report, tmp_path):
+    path = _write(write_html, report, tmp_path / 'report.html')
+    text = path.read_text(encoding='utf-8')
+    parser = _Tables()
+    parser.feed(text)
+    for table, part in zip(parser.tables, report['sections'], strict=True):
+        frame = part['frame']
+        assert table[0] == list(frame.columns)
+        assert table[1:] == frame.astype(str).to_numpy().tolist()
+    # plotly.js встроен один раз, графиков -- по одному на раздел
+    assert text.count('Plotly.newPlot') == 2
+    assert text.count('window.PlotlyConfig') == 1
+
+
+def _wait(job):
+    job.future.result(timeout=60)
+    return job
+
+
+def test_identical_jobs_are_deduplicated(report, tmp_path):
+    queue = ExportQueue(tmp_path)
+    first = queue.submit(report, 'parquet')
+    assert queue.submit(report, 'parquet') is first
+    _wait(first)
+    assert first.done and first.error is None and first.path.exists()
+    assert queue.submit(report, 'parquet') is first
+
+    # Другие версии данных или формат -- отдельное задание
+    assert queue.submit(dict(report, versions=('v2',)), 'parquet') is not first
+    assert queue.submit(report, 'html').path != first.path
+
+    # Новый процесс (очередь) берет готовый файл с диска без повторной выгрузки
+    reused = ExportQueue(tmp_path).submit(report, 'parquet')
+    assert reused.path == first.path and reused.future is None and reused.done
+
+
+def test_failed_job_reports_error_and_is_retried(report, tmp_path):
+    broken = dict(report, sections=[section('Сломанный', "Сломанный", pd.DataFrame({'a': [1, 'x']}))])
+    queue = ExportQueue(tmp_path)
+    job = _wait(queue.submit(broken, 'parquet'))
+    assert job.done and job.error is not None
+    assert job.message.startswith("Ошибка")
+    assert not job.path.exists() and not list(tmp_path.glob('*.tmp'))
+    # Задание с ошибкой не переиспользуется: повторный запрос запускает выгрузку заново
+    retry = queue.submit(broken, 'parquet')
+    assert retry is not job
+    _wait(retry)
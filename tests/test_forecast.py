@@ -0,0 +1,67 @@
+"""Сезонная декомпозиция и прогноз против rolling pandas и точных рядов."""
+
+import numpy as np
+import pandas as pd
+
+from rosstat.cube import MonthlyCube
+from rosstat.forecast import FIT_WINDOW, PERIOD, SeasonalForecast, moving_trend, seasonal_profile
+
+
+def _months(n):
+    return pd.date_range('2020-01-01', periods=n, freq='MS') + pd.offsets.MonthEnd(0)
+
+
+def test_moving_trend_matches_rolling():
+    rng = np.random.default_rng(6)
+    values = rng.normal(size=(2, 3, 40)).cumsum(axis=-1)
+    # 2×12: среднее двух соседних 12-месячных средних, центрированное
+    rolling = pd.DataFrame(values.reshape(-1, 40).T).rolling(PERIOD).mean()
+    expected = ((rolling + rolling.shift(-1)) / 2).shift(-(PERIOD // 2) + 1).to_numpy().T.reshape(values.shape)
+    np.testing.assert_allclose(moving_trend(values), expected)
+    assert np.isnan(moving_trend(values[..., :PERIOD])).all()
+
+
+def test_seasonal_profile_matches_groupby():
+    rng = np.random.default_rng(7)
+    detrended = rng.normal(size=30)
+    detrended[[3, 20]] = np.nan
+    month = pd.Series(detrended).groupby(np.arange(30) % PERIOD).mean()
+    np.testing.assert_allclose(seasonal_profile(detrended), month - month.mean())
+
+
+def test_linear_trend_with_seasonality_is_forecast_exactly():
+    length, horizon = 48, 6
+    t = np.arange(length + horizon)
+    season = 5 * np.sin(2 * np.pi * t / PERIOD)
+    truth = np.stack([0.5 * t + 100 + season, -0.2 * t + 80 + 2 * season])
+    model = SeasonalForecast(truth[:, None, :length], _months(length), ['А', 'Б'], ['y'], horizon=horizon)
+
+    np.testing.assert_allclose(model.forecast[:, 0], truth[:, length:], atol=1e-9)
+    np.testing.assert_allclose(model.upper - model.lower, 0, atol=1e-6)
+    inner = slice(PERIOD // 2, length - PERIOD // 2)
+    np.testing.assert_allclose(model.trend[:, 0, inner], (truth - season * [[1], [2]])[:, inner], atol=1e-9)
+    np.testing.assert_allclose(model.resid[:, 0, inner], 0, atol=1e-9)
+    assert list(model.future_dates) == list(_months(length + horizon)[length:])
+
+    prediction = model.prediction(['Б'], 'y')
+    assert list(prediction['Регион'].unique()) == ['Б']
+    np.testing.assert_allclose(prediction['Прогноз'], truth[1, length:], atol=1e-9)
+
+
+def test_forecast_from_cube_matches_polyfit(series):
+    values, dates = MonthlyCube(series).series()
+    regions = list(pd.unique(series['Регион']))
+    model = SeasonalForecast(values, dates, regions, MonthlyCube(series).metrics)
+    metric = 'Средний_чек'
+    k = model.metrics.index(metric)
+    for i, region in enumerate(regions):
+        observed = series[series['Регион'] == region].set_index('Дата')[metric]
+        assert np.allclose(model.observed[i, k], observed.to_numpy())
+        # Прямая МНК по последним FIT_WINDOW месяцам ряда без сезонности
+        adjusted = (observed.to_numpy() - model.seasonal[i, k])[-FIT_WINDOW:]
+        times = np.arange(len(observed))[-FIT_WINDOW:]
+        slope, intercept = np.polyfit(times, adjusted, 1)
+        future = np.arange(len(observed), len(observed) + len(model.future_dates))
+        profile = model.seasonal[i, k][:PERIOD]
+        expected = slope * future + intercept + profile[future % PERIOD]
+        np.testing.assert_allclose(model.forecast[i, k], expected, rtol=1e-9)
@@ -0,0 +1,93 @@
+"""Упрощение границ по уровням детализации и выбор уровня по охвату."""
+
+import numpy as np
+import pytest
+
+from rosstat import geo
+
+
+def _circle(center, radius, n, clockwise=False, wiggle=0.0):
+    angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    if clockwise:
+        angles = -angles
+    r = radius + wiggle * np.sin(40 * angles)
+    ring = np.column_stack([center[0] + r * np.cos(angles), center[1] + r * np.sin(angles)])
+    return np.vstack([ring, ring[:1]])
+
+
+def _square(corner, side):
+    x, y = corner
+    return np.array([[x, y], [x + side, y], [x + side, y + side], [x, y + side], [x, y]], dtype=float)
+
+
+@pytest.fixture(scope='module')
+def regions():
+    # Плотное кольцо в 200 тыс. точек против часовой стрелки с дырой по часовой --
+    # оба направления упрощение должно развернуть
+    return {
+        'Крупный': [[_circle((0, 0), 10, 200_000, wiggle=0.3), _circle((0, 0), 3, 20_000, clockwise=True)]],
+        'Дальний': [[_square((80, 80), 10)]],
+        'Остров': [[_square((50, 50), 0.02)]],
+    }
+
+
+@pytest.fixture(scope='module')
+def levels(regions):
+    return [geo.simplify(regions, level) for level in range(len(geo.LEVELS))]
+
+
+def _rings(collection, name):
+    feature = next(feature for feature in collection['features'] if feature['id'] == name)
+    return [[np.asarray(ring) for ring in polygon] for polygon in feature['geometry']['coordinates']]
+
+
+def test_points_shrink_with_coarser_level(levels):
+    points = [count for _, count in levels]
+    assert points[0] < points[1] < points[2] < 220_000
+    # Квантование убирает совпавшие точки, упрощение -- мелкие изгибы
+    assert points[0] < 2_000
+
+
+def test_outer_rings_clockwise_holes_counterclockwise(levels):
+    for collection, _ in levels:
+        for name in ('Крупный', 'Дальний', 'Остров'):
+            for polygon in _rings(collection, name):
+                assert geo._area(polygon[0]) < 0
+                assert all(geo._area(hole) > 0 for hole in polygon[1:])
+        # Дыра переживает все уровни
+        assert len(_rings(collection, 'Крупный')[0]) == 2
+
+
+def test_tiny_ring_survives_via_fallback(regions, levels):
+    # На обзорном уровне остров меньше клетки сетки и выродился бы
+    _, _, bits = geo.LEVELS[0]
+    step = 100 / 2 ** bits
+    assert abs(geo._area(regions['Остров'][0][0])) < step * step
+    (polygon,) = _rings(levels[0][0], 'Остров')
+    assert len(polygon) == 1 and len(polygon[0]) == 5
+    np.testing.assert_allclose(np.sort(polygon[0], axis=0), np.sort(regions['Остров'][0][0], axis=0))
+
+
+def test_simplify_ring_and_quantize():
+    ring = _circle((0, 0), 1, 10_000)
+    simplified = geo.simplify_ring(ring, 0.01)
+    assert 4 <= len(simplified) < 100
+    np.testing.assert_array_equal(simplified[0], simplified[-1])
+    assert geo.simplify_ring(np.zeros((10, 2)), 0.01) is None
+    # Треугольник (4 точки с замыканием) не упрощается при любом допуске
+    triangle = _square((0, 0), 1)[[0, 1, 2, 4]]
+    assert geo.simplify_ring(triangle, 10) is triangle
+    # Квадрат при допуске больше стороны вырождается -- его спасает запасной путь simplify
+    assert geo.simplify_ring(_square((0, 0), 1), 10) is None
+
+    quantized = geo.quantize(ring, np.array([-1.0, -1.0]), 0.25)
+    np.testing.assert_allclose(quantized / 0.25, np.round(quantized / 0.25), atol=1e-9)
+    assert (np.diff(quantized, axis=0) != 0).any(axis=1).all()
+    assert len(quantized) < 50
+
+
+def test_level_for_finer_on_smaller_selection(regions):
+    assert geo.level_for(regions) == 0
+    assert geo.level_for(regions, {'Крупный', 'Дальний'}) == 0
+    assert geo.level_for(regions, {'Крупный'}) == 1
+    assert geo.level_for(regions, {'Остров'}) == 2
@@ -0,0 +1,73 @@
+"""Догрузка нового месяца против полного пересчета по всему хранилищу."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from rosstat import ingest, store
+from rosstat.cube import MonthlyCube
+from rosstat.incremental import IncrementalAggregate
+from rosstat.stats import MomentStats
+from rosstat.synthetic import next_month
+
+METRICS = ['Индекс_потребительской_активности', 'Средний_чек']
+
+
+@pytest.fixture
+def root(tmp_path, tables):
+    return store.ensure(tmp_path / 'store', lambda: tables)
+
+
+def test_appended_month_matches_full_rebuild(root):
+    cube = IncrementalAggregate(root, ingest.SERIES, MonthlyCube)
+    stats = IncrementalAggregate(root, ingest.SERIES, lambda frame: MomentStats.from_frame(frame, 'Регион', METRICS),
+                                 columns=['Регион', *METRICS])
+    cube.get(), stats.get()
+
+    series = store.read_table(root, ingest.SERIES)
+    added = next_month(series, seed=1)
+    assert ingest.append_series(root, added) == len(added)
+    # Повторная загрузка тех же строк ничего не добавляет
+    assert ingest.append_series(root, added) == 0
+
+    full = store.read_table(root, ingest.SERIES)
+    assert len(full) == len(series) + len(added)
+    rebuilt = MonthlyCube(full)
+    updated = cube.get()
+    assert cube.updates == 1 and stats.get() is stats.get() and stats.updates == 1
+    regions = list(pd.unique(full['Регион']))
+    for metric in METRICS:
+        key = ['Регион', 'Дата']
+        tm.assert_frame_equal(updated.monthly(regions, metric).sort_values(key, ignore_index=True),
+                              rebuilt.monthly(regions, metric).sort_values(key, ignore_index=True))
+        expected = full.groupby('Регион', observed=True)[metric].mean()
+        np.testing.assert_allclose(updated.extremes(None, metric).set_index('Регион')['Среднее']
+                                   .reindex(expected.index), expected)
+    tm.assert_frame_equal(stats.get().corr(), full[METRICS].corr(), rtol=1e-9)
+
+    # Снимок получает средние нового месяца
+    snapshot = store.read_table(root, ingest.SNAPSHOT).set_index('Регион')
+    latest = added.groupby('Регион')['Индекс_потребительской_активности'].mean().round()
+    assert (snapshot.loc[latest.index, 'Индекс_потребительской_активности'] == latest).all()
+
+
+def test_changed_file_triggers_rebuild(root):
+    cube = IncrementalAggregate(root, ingest.SERIES, MonthlyCube)
+    cube.get()
+    series = store.read_table(root, ingest.SERIES)
+    region = series['Регион'].iloc[0]
+    path = store.files(root, ingest.SERIES, regions=[region])[0]
+    part = store.read_files([path])
+    store.write_table(root, ingest.SERIES, part.assign(Средний_чек=part['Средний_чек'] * 2))
+    stamp = path.stat().st_mtime + 1
+    # Явно сдвигаем mtime: на грубых файловых системах запись может его не изменить
+    os.utime(path, (stamp, stamp))
+
+    result = cube.get()
+    assert cube.updates == 0
+    expected = store.read_table(root, ingest.SERIES)
+    np.testing.assert_allclose(result.extremes([region], 'Средний_чек')['Среднее'],
+                               expected.loc[expected['Регион'] == region, 'Средний_чек'].mean())
@@ -0,0 +1,86 @@
+"""Планы запросов «ИИ-Агента» и их исполнение против pandas по тем же таблицам."""
+
+import pandas.testing as tm
+import pytest
+
+from rosstat import store
+from rosstat.query import EXAMPLES, describe, execute, parse
+
+
+def test_lowest_overrides_superlative():
+    # «самые» -- усилитель, направление задает «низкие»
+    plan = parse("самые низкие зарплаты в муниципалитетах Москвы")
+    assert plan['operation'] == 'rank' and plan['ascending']
+    assert plan['table'] == 'municipal_data'
+    assert plan['metrics'] == ('Средняя_зарплата',)
+    assert plan['regions'] == ('Москва',)
+    assert "последние 10" in describe(plan)
+    assert parse("наиболее низкая зарплата по регионам")['ascending']
+    assert not parse("самые высокие зарплаты в муниципалитетах Москвы")['ascending']
+
+
+@pytest.mark.parametrize('first, second', [
+    ("Топ-5 регионов по зарплате!", "регионы по зарплате, топ 5"),
+    ("Динамика общепита в Татарстане за 2023", "общепит татарстан 2023 динамика"),
+])
+def test_wording_does_not_change_plan(first, second):
+    assert parse(first) == parse(second)
+
+
+def test_examples_plans():
+    plans = [parse(example) for example in EXAMPLES]
+    assert [plan['operation'] for plan in plans] == ['rank', 'series', 'corr', 'rank']
+    assert plans[0]['k'] == 5 and plans[0]['table'] == 'regional_data'
+    assert plans[1]['years'] == (2023, 2023) and plans[1]['regions'] == ('Татарстан',)
+    assert plans[3]['high'] == 100_000 and plans[3]['metrics'] == ('Оборот_розничной_торговли_млн',)
+
+
+
+def test_cross_table_correlation_is_reported():
+    # Сбер и Росстат в одной корреляции: показатель Росстата не теряется молча
+    plan = parse("корреляция зарплаты и общепита")
+    assert plan['table'] == 'sber_index'
+    assert plan['metrics'] == ('Индекс_транзакций_общепит',)
+    assert plan['other_metrics'] == ('Средняя_зарплата',)
+    text = execute(plan)['text']
+    assert "разных таблиц не поддерживается" in text and "Средняя_зарплата" in text
+    assert parse("корреляция общепита и среднего чека")['other_metrics'] == ()
+
+
+@pytest.mark.parametrize('text, low, high', [
+    ("10 городов до 100 тыс. жителей с наибольшим оборотом", None, 100_000),
+    ("муниципалитеты с населением от 20 тысяч по обороту", 20_000, None),
+    ("города с населением от 50 до 100 тыс. с наибольшей зарплатой", 50_000, 100_000),
+    ("города от 20 тыс. жителей и до 1,5 млн жителей по зарплате", 20_000, 1_500_000),
+    # Граница у зарплаты -- не ограничение по населению
+    ("города с зарплатой до 100 тыс.", None, None),
+    ("города с населением до 200 тыс. и зарплатой до 100 тыс.", None, 200_000),
+])
+def test_population_bounds_only_near_population_words(text, low, high):
+    plan = parse(text)
+    assert plan['table'] == 'municipal_data'
+    assert (plan['low'], plan['high']) == (low, high)
+    assert plan['k'] == 10
+
+def test_lowest_query_matches_pandas(app_store):
+    plan = parse("самые низкие зарплаты в муниципалитетах Москвы")
+    result = execute(plan)['table']
+    frame = store.read_table(app_store, 'municipal_data', compact=False)
+    expected = frame[frame['Регион'] == 'Москва'].nsmallest(10, 'Средняя_зарплата')
+    assert list(result['Муниципалитет']) == list(expected['Муниципалитет'])
+    assert list(result['Средняя_зарплата']) == list(expected['Средняя_зарплата'])
+
+
+def test_capped_top_matches_pandas(app_store):
+    result = execute(parse(EXAMPLES[3]))['table']
+    frame = store.read_table(app_store, 'municipal_data', compact=False)
+    expected = frame[frame['Население'] <= 100_000].nlargest(10, 'Оборот_розничной_торговли_млн')
+    assert list(result['Оборот_розничной_торговли_млн']) == list(expected['Оборот_розничной_торговли_млн'])
+
+
+def test_regional_values_match_pandas(app_store):
+    result = execute(parse("зарплата и население в Москве и Татарстане"))['table']
+    frame = store.read_table(app_store, 'regional_data', compact=False)
+    expected = frame[frame['Регион'].isin(['Москва', 'Татарстан'])][['Регион', 'Средняя_зарплата', 'Население']]
+    tm.assert_frame_equal(result.set_index('Регион').sort_index(), expected.set_index('Регион').sort_index(),
+                          check_dtype=False, check_like=True)
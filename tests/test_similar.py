@@ -0,0 +1,46 @@
+"""SimilarityIndex против полного перебора расстояний по стандартизованным признакам."""
+
+import numpy as np
+import pytest
+
+from rosstat.index import SortedFrameIndex
+from rosstat.similar import FEATURES, LOG_FEATURES, SimilarityIndex, features
+
+
+@pytest.fixture(scope='module')
+def similarity(municipal):
+    return SimilarityIndex(SortedFrameIndex(municipal, 'Регион', 'Население'))
+
+
+def _standardized(frame):
+    values = features(frame).astype(float)
+    for column in LOG_FEATURES:
+        values[column] = np.log1p(values[column].clip(lower=0))
+    # z-оценка со смещенным стандартным отклонением, как np.nanstd
+    return ((values - values.mean()) / values.std(ddof=0)).fillna(0)[FEATURES].to_numpy()
+
+
+@pytest.mark.parametrize('other_regions', [False, True])
+def test_nearest_matches_brute_force(similarity, other_regions):
+    frame = similarity.index.frame
+    matrix = _standardized(frame)
+    for position in (0, 17, len(frame) - 1):
+        distance = np.sqrt(((matrix - matrix[position]) ** 2).sum(axis=1))
+        distance[position] = np.inf
+        if other_regions:
+            distance[(frame['Регион'] == frame['Регион'].iloc[position]).to_numpy()] = np.inf
+        expected = np.argsort(distance, kind='stable')[:10]
+        rows, result = similarity.nearest(position, k=10, other_regions=other_regions)
+        np.testing.assert_allclose(result, distance[expected], rtol=1e-4, atol=1e-4)
+        assert set(rows) == set(expected)
+        assert position not in rows
+
+
+def test_position_and_small_k(similarity):
+    frame = similarity.index.frame
+    row = frame.iloc[25]
+    assert similarity.position(row['Регион'], row['Муниципалитет']) == 25
+    assert similarity.position(row['Регион'], "Нет такого") is None
+    # k больше числа кандидатов -- все, кроме самой строки
+    rows, _ = similarity.nearest(25, k=10 ** 6)
+    assert len(rows) == len(frame) - 1
@@ -0,0 +1,38 @@
+"""MomentStats против DataFrame.corr по тем же строкам."""
+
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+
+from rosstat.stats import MomentStats
+
+COLUMNS = ['Население', 'Средняя_зарплата', 'Количество_предприятий', 'Индекс_потребления']
+
+
+def test_corr_matches_pandas_for_region_subsets(municipal):
+    stats = MomentStats.from_frame(municipal, 'Регион', COLUMNS)
+    regions = list(pd.unique(municipal['Регион']))
+    for subset in (None, regions[:1], regions[1:4], regions[::2]):
+        rows = municipal if subset is None else municipal[municipal['Регион'].isin(subset)]
+        expected = rows[COLUMNS].astype(float).corr()
+        tm.assert_frame_equal(stats.corr(subset), expected, rtol=1e-9)
+
+
+def test_update_equals_full_build(municipal):
+    half = len(municipal) // 2
+    stats = MomentStats.from_frame(municipal.iloc[:half], 'Регион', COLUMNS)
+    stats.update(municipal.iloc[half:])
+    full = MomentStats.from_frame(municipal, 'Регион', COLUMNS)
+    tm.assert_frame_equal(stats.corr(), full.corr(), rtol=1e-9)
+
+
+def test_missing_values_and_constant_column():
+    frame = pd.DataFrame({'Регион': ['А'] * 5 + ['Б'] * 5,
+                          'x': [1, 2, np.nan, 4, 5, 6, 7, 8, 9, 10],
+                          'y': [2, 1, 3, np.nan, 6, 5, 8, 7, 10, 9],
+                          'z': [3.0] * 10})
+    stats = MomentStats.from_frame(frame, 'Регион', ['x', 'y', 'z'])
+    # Строки с пропусками отбрасываются целиком, постоянный столбец дает NaN
+    expected = frame.dropna()[['x', 'y', 'z']].corr()
+    tm.assert_frame_equal(stats.corr(), expected, rtol=1e-9)
+    assert np.isclose(stats.pearson('x', 'y', ['Б']), frame[frame['Регион'] == 'Б'][['x', 'y']].corr().iloc[0, 1])
@@ -0,0 +1,45 @@
+"""TableView против sort_values и str.contains по всей таблице."""
+
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+from rosstat.table import TableView
+
+
+@pytest.fixture
+def frame(municipal):
+    frame = municipal.copy()
+    # Повторы для проверки устойчивости сортировки, пропуски и категориальный столбец
+    frame['Индекс_потребления'] = frame['Индекс_потребления'] // 5
+    frame['Доля'] = np.where(np.arange(len(frame)) % 9 == 0, np.nan, frame['Средняя_зарплата'] % 7)
+    frame['Регион'] = frame['Регион'].astype('category')
+    return frame
+
+
+@pytest.mark.parametrize('column', ['Индекс_потребления', 'Доля', 'Регион', 'Муниципалитет'])
+@pytest.mark.parametrize('ascending', [True, False])
+def test_sorted_pages_match_pandas(frame, column, ascending):
+    view = TableView(frame)
+    expected = frame.sort_values(column, ascending=ascending, kind='stable')
+    pages = [view.page(i, 10, sort_by=column, ascending=ascending) for i in range(-(-len(frame) // 10))]
+    tm.assert_frame_equal(pd.concat(pages), expected)
+
+
+def test_search_with_sort_matches_pandas(frame):
+    view = TableView(frame)
+    search = ' Район 1 '
+    text = frame[view.text_columns].astype(str).apply(lambda column: column.str.lower())
+    matched = frame[text.apply(lambda column: column.str.contains('район 1', regex=False)).any(axis=1)]
+    assert view.count(search) == len(matched)
+    tm.assert_frame_equal(view.page(0, 1000, search=search), matched)
+    expected = matched.sort_values('Население', ascending=False, kind='stable')
+    tm.assert_frame_equal(view.page(1, 5, search=search, sort_by='Население', ascending=False),
+                          expected.iloc[5:10])
+
+
+def test_unsorted_page_is_a_slice(frame):
+    view = TableView(frame)
+    assert len(view) == view.count() == view.count('  ') == len(frame)
+    tm.assert_frame_equal(view.page(2, 7), frame.iloc[14:21])
@@ -0,0 +1,59 @@
+"""TopKIndex и RangeTopK против фильтра и nlargest по всей таблице."""
+
+import numpy as np
+import pandas.testing as tm
+import pytest
+
+from rosstat.index import SortedFrameIndex
+from rosstat.topk import RangeTopK, TopKIndex
+
+
+@pytest.fixture(scope='module')
+def index(municipal):
+    rng = np.random.default_rng(3)
+    # Различные значения показателя: порядок строк однозначен и совпадает с nlargest
+    frame = municipal.assign(Балл=rng.normal(size=len(municipal)))
+    frame.loc[frame.index[::11], 'Балл'] = np.nan
+    return SortedFrameIndex(frame, 'Регион', 'Население')
+
+
+def _expected(frame, metric, k, high=None, low=None, keys=None):
+    mask = np.ones(len(frame), dtype=bool)
+    if high is not None:
+        mask &= frame['Население'] <= high
+    if low is not None:
+        mask &= frame['Население'] >= low
+    if keys is not None:
+        mask &= frame['Регион'].isin(keys)
+    # Строки без значения показателя в индекс не попадают
+    return frame[mask].dropna(subset=[metric]).nlargest(k, metric)
+
+
+@pytest.mark.parametrize('k_max', [50, 4])
+@pytest.mark.parametrize('k', [1, 10, 30])
+def test_top_matches_nlargest(index, k_max, k):
+    # При k > k_max запрос идет полным перебором диапазона и обязан дать тот же ответ
+    topk = TopKIndex(index, ['Балл', 'Средняя_зарплата'], k_max=k_max)
+    regions = index.keys
+    for bounds in [{}, {'high': 100_000}, {'low': 30_000, 'high': 300_000}, {'low': 10 ** 9}]:
+        for keys in (None, regions[:1], regions[2:5]):
+            result = topk.top('Балл', k, keys=keys, **bounds)
+            tm.assert_frame_equal(result, _expected(index.frame, 'Балл', k, keys=keys, **bounds))
+            # Целый показатель с повторами: совпадают значения по порядку
+            values = topk.top('Средняя_зарплата', k, keys=keys, columns=['Средняя_зарплата'], **bounds)
+            expected = _expected(index.frame, 'Средняя_зарплата', k, keys=keys, **bounds)
+            assert list(values['Средняя_зарплата']) == list(expected['Средняя_зарплата'])
+
+
+def test_range_query_matches_sorting():
+    rng = np.random.default_rng(4)
+    values = rng.integers(0, 20, size=203).astype(float)
+    values[::13] = np.nan
+    tree = RangeTopK(values, k_max=8)
+    for start, stop in [(0, 203), (5, 6), (17, 150), (100, 100), (190, 203)]:
+        for k in (1, 8, 25):
+            rows = np.arange(start, stop)
+            rows = rows[~np.isnan(values[rows])]
+            # По убыванию значения, при равенстве -- меньший номер строки
+            expected = rows[np.lexsort((rows, -values[rows]))][:k]
+            assert list(tree.query(start, stop, k)) == list(expected)
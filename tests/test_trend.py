@@ -0,0 +1,53 @@
+"""Линии тренда против формул pandas и прямого перебора окон LOWESS."""
+
+import numpy as np
+import pandas as pd
+
+from rosstat.trend import fit_trend
+
+
+def _points(n=500, seed=5):
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(0, 100, n)
+    return x, 3 * x + 20 + rng.normal(0, 10, n)
+
+
+def test_ols_matches_pandas():
+    x, y = _points()
+    x[::50] = np.nan
+    fit = fit_trend(x, y, 'ols')
+    frame = pd.DataFrame({'x': x, 'y': y}).dropna()
+    slope = frame['x'].cov(frame['y']) / frame['x'].var()
+    assert fit['n'] == len(frame)
+    assert np.isclose(fit['slope'], slope)
+    assert np.isclose(fit['intercept'], frame['y'].mean() - slope * frame['x'].mean())
+    assert np.isclose(fit['r2'], frame['x'].corr(frame['y']) ** 2)
+    assert list(fit['x']) == [frame['x'].min(), frame['x'].max()]
+
+
+def test_robust_ignores_outliers():
+    x, y = _points()
+    y[:25] += 2000
+    ols, robust = fit_trend(x, y, 'ols'), fit_trend(x, y, 'robust')
+    clean = fit_trend(x[25:], y[25:], 'ols')
+    assert abs(robust['slope'] - clean['slope']) < 0.05
+    assert abs(ols['slope'] - clean['slope']) > abs(robust['slope'] - clean['slope'])
+
+
+def test_lowess_matches_brute_force():
+    x, y = _points(n=300)
+    y += 200 * np.sin(x / 15)
+    fit = fit_trend(x, y, 'lowess')
+    k = int(np.ceil(0.3 * len(x)))
+    for node, value in zip(fit['x'], fit['y']):
+        # Окно -- k ближайших к узлу точек, веса трикубические
+        distance = np.abs(x - node)
+        h = np.sort(distance)[k - 1]
+        weights = (1 - np.clip(distance / h, 0, 1) ** 3) ** 3
+        slope, intercept = np.polyfit(x, y, 1, w=np.sqrt(weights))
+        assert np.isclose(value, slope * node + intercept, rtol=1e-6)
+
+
+def test_degenerate_input():
+    assert np.isnan(fit_trend([1, 1, 1], [1, 2, 3])['slope'])
+    assert fit_trend([1], [1], 'lowess')['x'].size == 0